@@ -1,23 +1,164 @@
 # .github/scripts/ai_pr_analyzer.py
 import os
 import json
-import openai
-from github import Github
 import re
 from datetime import datetime
+from analysis_cache import get_analysis_cache
+from source_provider import SourceProvider
+from file_filter import FileFilter
+from concurrent_runner import ConcurrentRunner
+from token_budget import estimate_tokens, truncate_to_tokens
+from functools import partial
+from pr_index import PRIndex
+from comment_markers import content_hash, parse_marker, with_marker
+from rate_limit import call_github, call_openai, fetch_all, post_github, scan_github, print_rate_limit_summary
+from run_report import RUN_REPORT
+from runtime import get_github_client, get_openai_client
+from prompt_templates import PromptTemplate, PROMPT_USAGE
+
+# map 단계: 파일 그룹 요약 프롬프트
+WALKTHROUGH_MAP_PROMPT = PromptTemplate(
+    name='walkthrough_map',
+    static_prefix="""
+당신은 코드 변경사항을 정확하고 간결하게 요약하는 시니어 개발자입니다.
+
+사용자는 PR의 일부 파일 변경사항을 보냅니다. 이후 전체 PR Walkthrough 작성에 사용할 요약을 만들어주세요.
+
+**요청사항:**
+- 파일마다 "- 파일경로: 주요 변경 요약 (1~2문장)" 형식으로 작성
+- 버그 위험, 로직 오류, 리팩터링이 필요한 부분이 보이면 파일명과 함께 "  - ⚠️ ..." 형식으로 덧붙이기
+- 코드 스타일은 제외하고, 간결하게 작성
+""",
+    variable_suffix="""
+**프로젝트 기술 스택:** {project_context}
+**PR 제목:** {pr_title}
+
+{group_text}
+"""
+)
+
+# 중간 reduce 단계: 요약이 reduce 예산을 넘을 때 요약 묶음을 다시 요약하는 프롬프트
+WALKTHROUGH_COMBINE_PROMPT = PromptTemplate(
+    name='walkthrough_combine',
+    static_prefix="""
+당신은 코드 변경사항을 정확하고 간결하게 요약하는 시니어 개발자입니다.
+
+사용자는 큰 PR의 파일별 변경 요약 여러 개를 보냅니다. 이후 전체 PR Walkthrough 작성에 사용할 더 짧은 요약으로 합쳐주세요.
+
+**요청사항:**
+- 같은 디렉터리나 같은 기능의 파일은 "- 경로 또는 기능: 주요 변경 요약 (1~2문장)" 한 줄로 묶기
+- "⚠️"로 표시된 위험 항목은 파일명과 함께 빠짐없이 유지
+- 원래 요약에 없는 내용은 추가하지 말고, 간결하게 작성
+""",
+    variable_suffix="""
+**프로젝트 기술 스택:** {project_context}
+**PR 제목:** {pr_title}
+
+{summaries_text}
+"""
+)
+
+# reduce 단계(또는 작은 PR의 단일 호출): Walkthrough 생성 프롬프트
+WALKTHROUGH_PROMPT = PromptTemplate(
+    name='walkthrough',
+    static_prefix="""
+당신은 시니어 개발자로서 전문적인 코드 리뷰 전문가입니다. 정적 분석 도구가 놓치는 고차원적인 문제를 찾아내고 건설적인 제안을 제공하세요.
+사용자가 보내는 PR 정보와 변경된 파일 정보를 바탕으로 전문적인 Walkthrough 스타일로 PR 분석을 수행해주세요.
+
+**분석 중점 사항:**
+1. **전체적인 변경사항 이해**: 비즈니스 로직과 기술적 의미
+2. **리팩터링 제안**: 코드 구조 개선, 중복 제거, 가독성 향상
+3. **로직 오류 위험**: 비즈니스 로직 실수, 엣지 케이스 누락
+4. **버그 가능성**: 런타임 오류, 메모리 누수, 동시성 문제
+5. **API 설계**: 인터페이스 일관성, 에러 처리
+6. **성능 이슈**: 비효율적인 알고리즘, 데이터베이스 쿼리 최적화
+
+**요청사항:**
+다음 형식으로 정확히 작성해주세요:
+
+## 📝 Walkthrough
+
+[전체적인 변경사항의 목적과 주요 내용을 2-3문장으로 요약. 비즈니스 가치와 기술적 의미를 포함하여 작성해주세요.]
+
+## Changes
+
+| File Path | Change Summary |
+|-----------|---------------|
+[사용자가 보낸 Changes 테이블 템플릿의 각 행을 채워서 작성]
+
+## 🚨 Critical Review Points
+
+**🔴 High Priority (버그 위험)**
+- [런타임 오류 가능성이 있는 부분을 구체적으로 명시]
+- [메모리 누수나 성능 저하 우려사항]
+
+**🟡 Medium Priority (리팩터링 제안)**
+- [코드 구조 개선이 필요한 부분]
+- [중복 코드 제거나 추상화 제안]
+
+**🔵 Low Priority (개선 아이디어)**
+- [가독성 향상을 위한 제안]
+- [미래 확장성을 고려한 개선사항]
+
+## 💡 Recommendations
+
+- [구체적이고 실행 가능한 개선 방안]
+- [베스트 프랙티스 적용 제안]
+- [추가 테스트 케이스 제안]
+
+**참고:**
+- 정적 분석은 SonarQube가 담당하므로 코드 스타일은 제외
+- 비즈니스 로직과 아키텍처 관점에서 분석
+- 실제 개발자가 놓칠 수 있는 부분에 집중
+- 구체적이고 실행 가능한 제안 제시
+""",
+    variable_suffix="""
+**프로젝트 기술 스택:** {project_context}
+
+**PR 정보:**
+- 제목: {pr_title}
+- 설명: {pr_body}
+
+**변경된 파일 정보:**
+{files_section}
+
+**Changes 테이블 템플릿:**
+{changes_table}
+"""
+)
 
 class PRAnalyzer:
-    def __init__(self):
-        self.openai_client = openai.OpenAI(api_key=os.environ['OPENAI_API_KEY'])
-        self.github_client = Github(os.environ['GITHUB_TOKEN'])
+    MODEL = "gpt-4o-mini"
+    # map 단계 요청 하나에 담을 diff 토큰 예산 (PR 전체가 이 안에 들어오면 단일 호출)
+    MAP_TOKEN_BUDGET = int(os.environ.get('AI_SUMMARY_MAP_TOKENS', '6000'))
+    # reduce 요청 전체(지침, PR 정보, 요약, Changes 테이블)의 입력 토큰 예산 (모델 컨텍스트보다 충분히 작게)
+    REDUCE_TOKEN_BUDGET = int(os.environ.get('AI_SUMMARY_REDUCE_TOKENS', '24000'))
+    # 요약의 요약을 반복할 최대 단계 수 (이후에도 넘치면 잘라냄)
+    MAX_COMBINE_LEVELS = 3
+    # Changes 테이블에 행으로 넣을 최대 파일 수 (나머지는 한 행으로 묶음)
+    MAX_CHANGES_ROWS = int(os.environ.get('AI_CHANGES_TABLE_ROWS', '100'))
+    # reduce 프롬프트에 넣을 PR 설명의 토큰 상한
+    PR_BODY_TOKENS = 2000
+
+    def __init__(self, openai_client=None, github_client=None):
+        # 클라이언트를 주입하면(오프라인 실행, 벤치마크) 환경 변수의 키 없이도 동작
+        # 주입하지 않으면 프로세스 공유 클라이언트 사용 (SDK import와 생성은 첫 호출 때)
+        self.openai_client = openai_client or get_openai_client()
+        self.github_client = github_client or get_github_client()
         self.repo_name = os.environ['REPO_NAME']
         self.pr_number = int(os.environ['PR_NUMBER'])
         self.pr_title = os.environ.get('PR_TITLE', '')
         self.pr_body = os.environ.get('PR_BODY', '')
 
         # GitHub repo 객체
-        self.repo = self.github_client.get_repo(self.repo_name)
-        self.pr = self.repo.get_pull(self.pr_number)
+        self.repo = call_github(self.github_client.get_repo, self.repo_name)
+        self.pr = call_github(self.repo.get_pull, self.pr_number)
+
+        # 프롬프트 입력 해시 기반 분석 결과 캐시
+        self.cache = get_analysis_cache()
+
+        # head 커밋의 파일 본문 조회 (로컬 체크아웃 우선, 없으면 contents API)
+        self.source = SourceProvider(self.repo, self.pr.head.sha)
 
     def get_project_context(self):
         """프로젝트 컨텍스트 파악 (언어, 프레임워크 등)"""
@@ -33,7 +174,8 @@ class PRAnalyzer:
 
             for config_file in config_files:
                 try:
-                    content = self.repo.get_contents(config_file)
+                    if not self.source.exists(config_file):
+                        continue
                     if config_file == 'package.json':
                         tech_stack.append('JavaScript/Node.js')
                     elif config_file in ['build.gradle', 'pom.xml']:
@@ -60,7 +202,8 @@ class PRAnalyzer:
         changed_files = []
 
         # PR의 모든 파일 변경사항 가져오기
-        files = self.pr.get_files()
+        files = fetch_all(self.pr.get_files)
+        file_filter = FileFilter(self.source)
 
         for file in files:
             file_info = {
@@ -69,30 +212,51 @@ class PRAnalyzer:
                 'additions': file.additions,
                 'deletions': file.deletions,
                 'patch': file.patch if hasattr(file, 'patch') else None,
-                'content': None
+                'content': None,
+                'skipped': None
             }
 
+            # 생성/벤더/락 파일 등은 목록과 변경량만 남기고 내용과 diff는 넘기지 않음
+            if file.status != 'removed' and file_filter.should_skip(file):
+                file_info['skipped'] = file_filter.skipped[file.filename]
+                file_info['patch'] = None
+                changed_files.append(file_info)
+                continue
+
             # 삭제된 파일이 아닌 경우 현재 내용도 가져오기
             if file.status != 'removed':
                 try:
-                    content = self.repo.get_contents(file.filename, ref=self.pr.head.sha)
-                    file_info['content'] = content.decoded_content.decode('utf-8')
+                    file_info['content'] = self.source.read_file(file.filename)
                 except:
+                    file_info['content'] = None
+                if file_info['content'] is None:
                     file_info['content'] = "파일 내용을 읽을 수 없습니다."
 
             changed_files.append(file_info)
 
+        file_filter.print_summary()
         return changed_files
 
     def find_related_prs(self):
-        """관련 PR들 찾기 (최근 30개 PR 중에서)"""
+        """관련 PR들 찾기 (로컬 PR 인덱스 조회, 인덱스를 쓸 수 없으면 최근 30개 PR 중에서)"""
+        # 현재 PR의 키워드 추출
+        current_keywords = self.extract_keywords(self.pr_title + " " + (self.pr_body or ""))
+
         try:
-            # 최근 30개 PR 가져오기 (현재 PR 제외)
-            recent_prs = list(self.repo.get_pulls(state='all', sort='updated', direction='desc'))[:30]
-            related_prs = []
+            index = PRIndex()
+            try:
+                synced = index.sync(self.repo, self.extract_keywords)
+                print(f"🗂️ PR 인덱스 갱신: {synced}개 PR 반영")
+                return index.search(current_keywords, self.pr_number)
+            finally:
+                index.close()
+        except Exception as e:
+            print(f"⚠️ PR 인덱스 사용 실패, 최근 PR 직접 조회로 대체: {e}")
 
-            # 현재 PR의 키워드 추출
-            current_keywords = self.extract_keywords(self.pr_title + " " + (self.pr_body or ""))
+        try:
+            # 최근 30개 PR만 가져오기 (전체 PR 목록을 만들지 않음)
+            recent_prs = fetch_all(self.repo.get_pulls, state='all', sort='updated', direction='desc', limit=30)
+            related_prs = []
 
             for pr in recent_prs:
                 if pr.number == self.pr_number:  # 현재 PR 제외
@@ -146,99 +310,206 @@ class PRAnalyzer:
     def generate_walkthrough_summary(self, changed_files, project_context):
         """전문적인 Walkthrough 스타일의 PR Summary 생성"""
 
-        # 변경된 파일들의 상세 정보 준비
-        files_info = []
-        for file in changed_files:
-            file_summary = f"**{file['filename']}** ({file['status']})\n"
-            file_summary += f"- 추가: {file['additions']}줄, 삭제: {file['deletions']}줄\n"
-
-            if file['patch']:
-                # diff 일부만 포함 (분석을 위해)
-                patch_preview = file['patch'][:1000] if len(file['patch']) > 1000 else file['patch']
-                file_summary += f"```diff\n{patch_preview}\n```\n"
-
-            files_info.append(file_summary)
-
-        analysis_prompt = f"""
-당신은 코드 리뷰 전문가입니다. 전문적인 Walkthrough 스타일로 PR 분석을 수행해주세요.
-
-**프로젝트 기술 스택:** {project_context}
-
-**PR 정보:**
-- 제목: {self.pr_title}
-- 설명: {self.pr_body}
-
-**변경된 파일 정보:**
-{chr(10).join(files_info)}
-
-**분석 중점 사항:**
-1. **전체적인 변경사항 이해**: 비즈니스 로직과 기술적 의미
-2. **리팩터링 제안**: 코드 구조 개선, 중복 제거, 가독성 향상
-3. **로직 오류 위험**: 비즈니스 로직 실수, 엣지 케이스 누락
-4. **버그 가능성**: 런타임 오류, 메모리 누수, 동시성 문제
-5. **API 설계**: 인터페이스 일관성, 에러 처리
-6. **성능 이슈**: 비효율적인 알고리즘, 데이터베이스 쿼리 최적화
-
-**요청사항:**
-다음 형식으로 정확히 작성해주세요:
-
-## 📝 Walkthrough
+        # 토큰 예산에 맞춰 파일들을 그룹으로 묶기
+        file_groups = self.pack_file_groups(changed_files)
 
-[전체적인 변경사항의 목적과 주요 내용을 2-3문장으로 요약. 비즈니스 가치와 기술적 의미를 포함하여 작성해주세요.]
+        if len(file_groups) <= 1:
+            # 작은 PR은 diff를 그대로 넣어 한 번에 생성
+            files_section = file_groups[0]['text'] if file_groups else ""
+        else:
+            # map: 파일 그룹별 요약을 병렬로 생성한 뒤 reduce 단계에 요약만 전달
+            print(f"🧮 {len(file_groups)}개 파일 그룹을 병렬로 요약한 뒤 Walkthrough를 생성합니다")
+            tasks = [partial(self.summarize_file_group, group, project_context) for group in file_groups]
+            group_summaries = ConcurrentRunner().run_all(tasks)
+
+            sections = []
+            for group, summary in zip(file_groups, group_summaries):
+                if summary is None:
+                    # 요약 실패 시 파일 목록과 통계만 전달
+                    summary = '\n'.join(
+                        f"- {file['filename']} ({file['status']}, +{file['additions']}/-{file['deletions']})"
+                        for file in group['files']
+                    )
+                sections.append(summary)
+            files_section = '\n\n'.join(sections)
+
+        # reduce 입력 전체가 예산을 넘지 않도록 PR 설명과 테이블을 줄이고, 남은 예산에 맞춰 요약을 합침
+        pr_body = truncate_to_tokens(self.pr_body, self.PR_BODY_TOKENS)
+        changes_table = self.generate_changes_table_template(changed_files)
+        fixed_tokens = sum(estimate_tokens(message['content']) for message in WALKTHROUGH_PROMPT.build_messages(
+            project_context=project_context,
+            pr_title=self.pr_title,
+            pr_body=pr_body,
+            files_section="",
+            changes_table=changes_table
+        ))
+        files_section = self.fit_files_section(files_section, self.REDUCE_TOKEN_BUDGET - fixed_tokens, project_context)
+
+        messages = WALKTHROUGH_PROMPT.build_messages(
+            project_context=project_context,
+            pr_title=self.pr_title,
+            pr_body=pr_body,
+            files_section=files_section,
+            changes_table=changes_table
+        )
+
+        # 동일한 PR 내용으로 이미 생성한 Walkthrough가 있으면 재사용
+        cache_key = self.cache.make_key('walkthrough', model=self.MODEL, messages=messages)
+        cached_summary = self.cache.get(cache_key)
+        if cached_summary is not None:
+            return cached_summary
 
-## Changes
+        try:
+            response = call_openai(
+                self.openai_client.chat.completions.create,
+                model=self.MODEL,
+                messages=messages,
+                max_tokens=2500,
+                temperature=0.2
+            )
+            WALKTHROUGH_PROMPT.record_usage(response)
 
-| File Path | Change Summary |
-|-----------|---------------|
-{self.generate_changes_table_template(changed_files)}
+            summary = response.choices[0].message.content
+            self.cache.set(cache_key, summary)
+            return summary
 
-## 🚨 Critical Review Points
-
-**🔴 High Priority (버그 위험)**
-- [런타임 오류 가능성이 있는 부분을 구체적으로 명시]
-- [메모리 누수나 성능 저하 우려사항]
+        except Exception as e:
+            return f"❌ PR Walkthrough 생성 중 오류가 발생했습니다: {str(e)}"
 
-**🟡 Medium Priority (리팩터링 제안)**
-- [코드 구조 개선이 필요한 부분]
-- [중복 코드 제거나 추상화 제안]
+    def format_file_for_prompt(self, file, max_tokens: int) -> str:
+        """파일 하나의 변경 정보를 토큰 예산 안에서 프롬프트용 텍스트로 변환"""
+        file_summary = f"**{file['filename']}** ({file['status']})\n"
+        file_summary += f"- 추가: {file['additions']}줄, 삭제: {file['deletions']}줄\n"
+        if file.get('skipped'):
+            file_summary += f"- 자동 생성/벤더/대용량 파일로 diff 생략 ({file['skipped']})\n"
 
-**🔵 Low Priority (개선 아이디어)**
-- [가독성 향상을 위한 제안]
-- [미래 확장성을 고려한 개선사항]
+        if file['patch']:
+            patch_budget = max(0, max_tokens - estimate_tokens(file_summary) - 10)
+            patch_preview = truncate_to_tokens(file['patch'], patch_budget)
+            file_summary += f"```diff\n{patch_preview}\n```\n"
 
-## 💡 Recommendations
+        return file_summary
 
-- [구체적이고 실행 가능한 개선 방안]
-- [베스트 프랙티스 적용 제안]
-- [추가 테스트 케이스 제안]
+    def pack_file_groups(self, changed_files):
+        """파일들을 토큰 예산을 넘지 않는 그룹으로 순서대로 묶기"""
+        groups = []
+        current = {'files': [], 'texts': [], 'tokens': 0}
 
-**참고:**
-- 정적 분석은 SonarQube가 담당하므로 코드 스타일은 제외
-- 비즈니스 로직과 아키텍처 관점에서 분석
-- 실제 개발자가 놓칠 수 있는 부분에 집중
-- 구체적이고 실행 가능한 제안 제시
-"""
+        for file in changed_files:
+            # 한 파일이 예산 전체를 넘으면 해당 파일 diff를 예산에 맞춰 축약
+            file_text = self.format_file_for_prompt(file, self.MAP_TOKEN_BUDGET)
+            file_tokens = estimate_tokens(file_text)
+
+            if current['files'] and current['tokens'] + file_tokens > self.MAP_TOKEN_BUDGET:
+                groups.append(current)
+                current = {'files': [], 'texts': [], 'tokens': 0}
+
+            current['files'].append(file)
+            current['texts'].append(file_text)
+            current['tokens'] += file_tokens
+
+        if current['files']:
+            groups.append(current)
+
+        for group in groups:
+            group['text'] = '\n'.join(group['texts'])
+        return groups
+
+    def summarize_file_group(self, group, project_context):
+        """map 단계: 파일 그룹의 변경 내용을 파일별로 요약 (실패 시 None)"""
+        messages = WALKTHROUGH_MAP_PROMPT.build_messages(
+            project_context=project_context,
+            pr_title=self.pr_title,
+            group_text=group['text']
+        )
+        return self.request_summary(WALKTHROUGH_MAP_PROMPT, messages)
+
+    def fit_files_section(self, files_section: str, token_budget: int, project_context) -> str:
+        """reduce에 넣을 요약이 예산을 넘으면 요약 묶음을 다시 요약 (요약의 요약), 그래도 넘치면 잘라냄"""
+        token_budget = max(1000, token_budget)
+        level = 0
+        while estimate_tokens(files_section) > token_budget and level < self.MAX_COMBINE_LEVELS:
+            level += 1
+            sections = files_section.split('\n\n')
+            batches = self.pack_texts(sections, self.MAP_TOKEN_BUDGET)
+            print(f"🧮 요약 {estimate_tokens(files_section)}토큰이 reduce 예산({token_budget}토큰)을 넘어 "
+                  f"{len(batches)}개 묶음으로 다시 요약합니다 ({level}단계)")
+
+            tasks = [partial(self.combine_summaries, batch, project_context) for batch in batches]
+            combined = [
+                summary if summary is not None else batch
+                for batch, summary in zip(batches, ConcurrentRunner().run_all(tasks))
+            ]
+            previous_tokens = estimate_tokens(files_section)
+            files_section = '\n\n'.join(combined)
+            if estimate_tokens(files_section) >= previous_tokens:
+                # 요약이 실패해 줄어들지 않으면 더 반복하지 않음
+                break
+
+        return truncate_to_tokens(files_section, token_budget)
+
+    @staticmethod
+    def pack_texts(texts, token_budget: int):
+        """텍스트들을 순서대로 토큰 예산을 넘지 않는 묶음으로 합치기 (예산보다 큰 텍스트는 잘라냄)"""
+        batches = []
+        current, current_tokens = [], 0
+        for text in texts:
+            text = truncate_to_tokens(text, token_budget)
+            text_tokens = estimate_tokens(text)
+            if current and current_tokens + text_tokens > token_budget:
+                batches.append('\n\n'.join(current))
+                current, current_tokens = [], 0
+            current.append(text)
+            current_tokens += text_tokens
+        if current:
+            batches.append('\n\n'.join(current))
+        return batches
+
+    def combine_summaries(self, summaries_text: str, project_context):
+        """중간 reduce 단계: 요약 묶음을 더 짧은 요약으로 합침 (실패 시 None)"""
+        messages = WALKTHROUGH_COMBINE_PROMPT.build_messages(
+            project_context=project_context,
+            pr_title=self.pr_title,
+            summaries_text=summaries_text
+        )
+        return self.request_summary(WALKTHROUGH_COMBINE_PROMPT, messages)
+
+    def request_summary(self, template: PromptTemplate, messages):
+        """요약 요청 하나 (입력이 같으면 캐시된 요약 재사용, 실패 시 None)"""
+        # 입력 내용이 같으면 이전 요약 재사용 (변경 없는 그룹은 재호출하지 않음)
+        cache_key = self.cache.make_key(template.name, model=self.MODEL, messages=messages)
+        cached_summary = self.cache.get(cache_key)
+        if cached_summary is not None:
+            return cached_summary
 
         try:
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "당신은 시니어 개발자로서 전문적인 코드 리뷰 전문가입니다. 정적 분석 도구가 놓치는 고차원적인 문제를 찾아내고 건설적인 제안을 제공하세요."},
-                    {"role": "user", "content": analysis_prompt}
-                ],
-                max_tokens=2500,
+            response = call_openai(
+                self.openai_client.chat.completions.create,
+                model=self.MODEL,
+                messages=messages,
+                max_tokens=700,
                 temperature=0.2
             )
+            template.record_usage(response)
 
-            return response.choices[0].message.content
+            summary = response.choices[0].message.content.strip()
+            self.cache.set(cache_key, summary)
+            return summary
 
         except Exception as e:
-            return f"❌ PR Walkthrough 생성 중 오류가 발생했습니다: {str(e)}"
+            print(f"⚠️ 요약 실패 ({template.name}): {e}")
+            return None
 
     def generate_changes_table_template(self, changed_files):
-        """Changes 테이블 템플릿 생성"""
+        """Changes 테이블 템플릿 생성 (파일이 많으면 변경량이 큰 파일만 행으로, 나머지는 한 행으로 묶음)"""
+        listed = changed_files
+        if len(changed_files) > self.MAX_CHANGES_ROWS:
+            ranked = sorted(changed_files, key=lambda file: (file['additions'] or 0) + (file['deletions'] or 0), reverse=True)
+            kept = {id(file) for file in ranked[:self.MAX_CHANGES_ROWS]}
+            listed = [file for file in changed_files if id(file) in kept]
+
         template_rows = []
-        for file in changed_files:
+        for file in listed:
             # 상태에 따른 이모지 추가
             status_emoji = {
                 'added': '➕',
@@ -248,6 +519,8 @@ class PRAnalyzer:
             }
             emoji = status_emoji.get(file['status'], '📝')
             template_rows.append(f"| {emoji} {file['filename']} | [AI가 이 파일의 주요 변경사항을 분석하여 요약] |")
+        if len(listed) < len(changed_files):
+            template_rows.append(f"| 📦 그 외 {len(changed_files) - len(listed)}개 파일 | [나머지 파일들의 공통 변경사항을 한 줄로 요약] |")
         return "\n".join(template_rows)
 
     def generate_tips_section(self):
@@ -273,60 +546,80 @@ class PRAnalyzer:
 
         return tips_section
 
-    def remove_previous_ai_comments(self):
-        """이전 AI 분석 코멘트들 삭제 또는 minimize 처리"""
-        try:
-            comments = self.pr.get_issue_comments()
-
-            for comment in comments:
-                # AI 봇이 작성한 코멘트 찾기
-                if (comment.user.login == 'github-actions[bot]' and
-                    '📝 Walkthrough' in comment.body):
-                    try:
-                        comment.delete()
-                        print(f"✅ 이전 AI 분석 코멘트 삭제: {comment.id}")
-                    except Exception as e:
-                        print(f"⚠️ 코멘트 삭제 실패, minimize 처리 시도: {e}")
-                        # 삭제 실패 시 minimize 처리
-                        try:
-                            minimized_body = f"<!-- Minimized by new analysis -->\n<details>\n<summary>이전 분석 결과 (클릭하여 보기)</summary>\n\n{comment.body}\n</details>"
-                            comment.edit(minimized_body)
-                            print(f"✅ 이전 코멘트 minimize 처리: {comment.id}")
-                        except Exception as e2:
-                            print(f"❌ 코멘트 처리 완전 실패: {e2}")
+    def walkthrough_comment_key(self) -> str:
+        """PR별 Walkthrough 코멘트 ID 저장 키"""
+        return self.cache.make_key('walkthrough_comment', repo=self.repo_name, pr=self.pr_number)
+
+    @staticmethod
+    def is_walkthrough_comment(comment) -> bool:
+        """봇이 작성한 Walkthrough 코멘트인지 (마커가 없는 이전 형식도 포함)"""
+        if comment.user.login != 'github-actions[bot]':
+            return False
+        marker = parse_marker(comment.body)
+        if marker is not None:
+            return marker.get('k') == 'walkthrough'
+        return '📝 Walkthrough' in comment.body
+
+    def find_walkthrough_comment(self):
+        """기존 Walkthrough 코멘트 찾기 - 저장된 ID로 한 번에 조회하고, 없으면 코멘트 목록에서 마커 검색"""
+        comment_id = self.cache.get(self.walkthrough_comment_key())
+        if comment_id:
+            try:
+                comment = call_github(self.pr.get_issue_comment, comment_id)
+                if self.is_walkthrough_comment(comment):
+                    return comment
+            except Exception as e:
+                print(f"⚠️ 저장된 Walkthrough 코멘트({comment_id}) 조회 실패, 목록에서 검색: {e}")
 
+        try:
+            # 찾으면 남은 페이지는 요청하지 않도록 페이지 단위로 지연 순회
+            for comment in scan_github(self.pr.get_issue_comments):
+                if self.is_walkthrough_comment(comment):
+                    return comment
         except Exception as e:
-            print(f"⚠️ 이전 코멘트 정리 중 오류: {e}")
+            print(f"⚠️ 기존 Walkthrough 코멘트 검색 중 오류: {e}")
+        return None
 
     def post_walkthrough_comment(self, walkthrough_content):
-        """Walkthrough 분석 결과를 PR에 코멘트로 등록"""
-
-        # 이전 AI 분석 코멘트 정리
-        self.remove_previous_ai_comments()
+        """Walkthrough 분석 결과를 PR 코멘트로 등록 (기존 코멘트가 있으면 제자리 수정)"""
 
         # Tips 섹션 추가
         tips_section = self.generate_tips_section()
-        final_content = walkthrough_content + tips_section
+        body = walkthrough_content + tips_section
+        final_content = with_marker(body, 'walkthrough')
 
-        # 코멘트 생성
+        existing = self.find_walkthrough_comment()
         try:
-            comment = self.pr.create_issue_comment(final_content)
-            print(f"✅ AI Walkthrough 코멘트 등록 완료: {comment.html_url}")
-            return True
+            if existing is None:
+                comment = post_github(self.pr.create_issue_comment, final_content)
+                print(f"✅ AI Walkthrough 코멘트 등록 완료: {comment.html_url}")
+            elif (parse_marker(existing.body) or {}).get('h') == content_hash(body):
+                # 내용이 같으면 수정하지 않음 (불필요한 알림 방지)
+                comment = existing
+                print(f"⏭️ Walkthrough 내용 변경 없음, 수정 생략: {comment.html_url}")
+            else:
+                comment = existing
+                call_github(comment.edit, final_content)
+                print(f"✅ AI Walkthrough 코멘트 수정 완료: {comment.html_url}")
         except Exception as e:
             print(f"❌ Walkthrough 코멘트 등록 실패: {e}")
             return False
 
+        self.cache.set(self.walkthrough_comment_key(), comment.id)
+        return True
+
     def run_analysis(self):
         """전체 분석 프로세스 실행"""
         print("🚀 AI PR 분석을 시작합니다...")
 
         # 1. 프로젝트 컨텍스트 파악
+        RUN_REPORT.begin_stage('project_context')
         print("🔍 프로젝트 기술 스택을 파악하는 중...")
         project_context = self.get_project_context()
         print(f"📊 감지된 기술 스택: {project_context}")
 
         # 2. 변경된 파일 정보 가져오기
+        RUN_REPORT.begin_stage('collect_files')
         print("📁 변경된 파일 정보를 수집하는 중...")
         changed_files = self.get_changed_files_content()
 
@@ -337,10 +630,12 @@ class PRAnalyzer:
         print(f"📊 총 {len(changed_files)}개 파일이 변경되었습니다.")
 
         # 3. Walkthrough Summary 생성
+        RUN_REPORT.begin_stage('walkthrough')
         print("🤖 AI Walkthrough 분석을 생성하는 중...")
         walkthrough_content = self.generate_walkthrough_summary(changed_files, project_context)
 
         # 4. PR에 코멘트로 등록
+        RUN_REPORT.begin_stage('post_comment')
         print("💬 PR에 Walkthrough 코멘트를 등록하는 중...")
         walkthrough_success = self.post_walkthrough_comment(walkthrough_content)
 
@@ -351,6 +646,14 @@ class PRAnalyzer:
         else:
             print("❌ AI PR 분석에 실패했습니다.")
 
+        PROMPT_USAGE.print_summary()
+        print_rate_limit_summary()
+        self.cache.close()
+        self.source.close()
+
 if __name__ == "__main__":
-    analyzer = PRAnalyzer()
-    analyzer.run_analysis()
\ No newline at end of file
+    try:
+        analyzer = PRAnalyzer()
+        analyzer.run_analysis()
+    finally:
+        RUN_REPORT.write('ai_pr_analyzer')
\ No newline at end of file
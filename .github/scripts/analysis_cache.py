@@ -0,0 +1,133 @@
+# .github/scripts/analysis_cache.py
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+from run_report import RUN_REPORT
+
+# 프롬프트나 결과 후처리 방식이 바뀌면 올려서 기존 캐시를 무효화
+CACHE_VERSION = "1"
+
+class AnalysisCache:
+    """LLM 분석 결과의 내용 주소 기반 영구 캐시 (SQLite, 크기 기반 LRU 제거)"""
+
+    def __init__(self, path: str = None, max_bytes: int = None):
+        if path is None:
+            cache_dir = os.environ.get('AI_CACHE_DIR', '.ai-review-cache')
+            path = os.path.join(cache_dir, 'analysis.sqlite3')
+        if max_bytes is None:
+            max_bytes = int(os.environ.get('AI_CACHE_MAX_BYTES', str(50 * 1024 * 1024)))
+
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = None
+
+        if os.environ.get('AI_CACHE_DISABLED', '').lower() == 'true':
+            print("⚠️ 분석 캐시 비활성화됨 (AI_CACHE_DISABLED)")
+            return
+
+        try:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            # 병렬 분석 스레드에서 공유하므로 잠금으로 직렬화
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "size INTEGER NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON entries(last_access)")
+            self._conn.commit()
+        except Exception as e:
+            print(f"⚠️ 분석 캐시 초기화 실패, 캐시 없이 진행: {e}")
+            self._conn = None
+
+    @staticmethod
+    def make_key(namespace: str, **inputs) -> str:
+        """프롬프트 입력(코드 컨텍스트, 설정, 모델 등)으로 캐시 키 생성"""
+        payload = json.dumps(
+            {'namespace': namespace, 'version': CACHE_VERSION, 'inputs': inputs},
+            sort_keys=True,
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """캐시된 결과 조회 (없으면 None)"""
+        if self._conn is None:
+            return None
+
+        with self._lock:
+            try:
+                row = self._conn.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+
+                # LRU를 위해 마지막 접근 시각 갱신
+                self._conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+                self._conn.commit()
+                self.hits += 1
+                return json.loads(row[0])
+            except Exception as e:
+                print(f"⚠️ 캐시 조회 실패: {e}")
+                return None
+
+    def set(self, key: str, value: Any):
+        """결과 저장 후 용량 초과 시 오래된 항목부터 제거"""
+        if self._conn is None:
+            return
+
+        serialized = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO entries (key, value, size, last_access) VALUES (?, ?, ?, ?)",
+                    (key, serialized, len(serialized.encode('utf-8')), time.time())
+                )
+                self._evict_locked()
+                self._conn.commit()
+            except Exception as e:
+                print(f"⚠️ 캐시 저장 실패: {e}")
+
+    def _evict_locked(self):
+        """전체 크기가 max_bytes 이하가 될 때까지 가장 오래 사용하지 않은 항목 제거"""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute("SELECT key, size FROM entries ORDER BY last_access ASC").fetchall()
+        evicted = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+
+        self._conn.executemany("DELETE FROM entries WHERE key = ?", evicted)
+
+    def close(self):
+        """연결 종료 및 통계 출력"""
+        if self._conn is None:
+            return
+        with self._lock:
+            self._conn.close()
+            self._conn = None
+        RUN_REPORT.add_cache_stats(self.hits, self.misses)
+        print(f"🗄️ 분석 캐시: {self.hits}개 적중, {self.misses}개 미적중")
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+def get_analysis_cache() -> AnalysisCache:
+    """프로세스 전체가 공유하는 분석 캐시 인스턴스"""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = AnalysisCache()
+        return _shared_cache
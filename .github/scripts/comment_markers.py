@@ -0,0 +1,38 @@
+# .github/scripts/comment_markers.py
+import hashlib
+import json
+import re
+from typing import Optional
+
+# 봇 코멘트 본문 끝에 붙이는 숨김 메타데이터 마커
+# 예: <!-- ai-review:meta {"k":"line","f":"app/Foo.kt","l":12,"h":"3f2a9c1b0d4e"} -->
+MARKER_PATTERN = re.compile(r'<!-- ai-review:meta (\{.*?\}) -->')
+
+def content_hash(text: str) -> str:
+    """본문 내용 해시 (짧은 16진수 문자열)"""
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:12]
+
+def build_marker(kind: str, body: str = "", file: Optional[str] = None, line: Optional[int] = None, **extra) -> str:
+    """코멘트 종류, 파일, 라인, 본문 해시를 담은 숨김 마커 생성"""
+    meta = {'k': kind}
+    if file is not None:
+        meta['f'] = file
+    if line is not None:
+        meta['l'] = line
+    meta['h'] = content_hash(body)
+    meta.update(extra)
+    return f"<!-- ai-review:meta {json.dumps(meta, ensure_ascii=False, separators=(',', ':'))} -->"
+
+def with_marker(body: str, kind: str, file: Optional[str] = None, line: Optional[int] = None, **extra) -> str:
+    """본문 끝에 숨김 마커를 붙인 코멘트 본문"""
+    return body + "\n\n" + build_marker(kind, body, file, line, **extra)
+
+def parse_marker(body: str) -> Optional[dict]:
+    """코멘트 본문에서 숨김 마커 메타데이터 추출 (없으면 None)"""
+    match = MARKER_PATTERN.search(body or "")
+    if not match:
+        return None
+    try:
+        return json.loads(match.group(1))
+    except json.JSONDecodeError:
+        return None
@@ -0,0 +1,32 @@
+# .github/scripts/concurrent_runner.py
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List
+
+class ConcurrentRunner:
+    """블로킹 API 호출을 제한된 병렬도로 동시에 실행하는 스레드 풀 엔진"""
+
+    def __init__(self, max_workers: int = None):
+        if max_workers is None:
+            max_workers = int(os.environ.get('AI_MAX_CONCURRENCY', '8'))
+        self.max_workers = max(1, max_workers)
+
+    def run_all(self, tasks: List[Callable[[], Any]], default: Any = None) -> List[Any]:
+        """작업 목록을 동시에 실행하고 입력 순서 그대로 결과 반환 (실패한 작업은 default)"""
+        if not tasks:
+            return []
+
+        def run_task(task):
+            try:
+                return task()
+            except Exception as e:
+                print(f"⚠️ 병렬 작업 실패: {e}")
+                return default
+
+        # 작업이 하나뿐이거나 병렬도가 1이면 스레드 없이 순차 실행
+        if len(tasks) == 1 or self.max_workers == 1:
+            return [run_task(task) for task in tasks]
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(tasks))) as executor:
+            # map은 제출 순서대로 결과를 돌려주므로 출력 순서가 고정됨
+            return list(executor.map(run_task, tasks))
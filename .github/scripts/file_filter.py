@@ -0,0 +1,173 @@
+# .github/scripts/file_filter.py
+import fnmatch
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+def glob_match(path: str, pattern: str) -> bool:
+    """경로가 glob 패턴과 맞는지 ('/'가 없는 패턴은 파일명 기준, '**/'로 시작하면 모든 깊이)"""
+    pattern = pattern.strip().lstrip('/')
+    if not pattern:
+        return False
+    if pattern.endswith('/'):
+        pattern += '**'
+    if '/' not in pattern:
+        return fnmatch.fnmatch(os.path.basename(path), pattern)
+
+    # fnmatch의 '*'는 '/'도 포함하므로 '**'는 '*'로 충분
+    if pattern.startswith('**/') and fnmatch.fnmatch(path, pattern[3:].replace('**', '*')):
+        return True
+    return fnmatch.fnmatch(path, pattern.replace('**', '*'))
+
+def parse_gitattributes(content: str) -> List[Tuple[str, Dict[str, bool]]]:
+    """.gitattributes에서 linguist-generated/linguist-vendored 설정 추출 [(패턴, {속성: 값})]"""
+    rules = []
+    for raw_line in (content or "").split('\n'):
+        line = raw_line.strip()
+        if not line or line.startswith('#'):
+            continue
+        parts = line.split()
+        attributes = {}
+        for attribute in parts[1:]:
+            if attribute.startswith(('-', '!')):
+                name, value = attribute[1:], False
+            elif '=' in attribute:
+                name, raw_value = attribute.split('=', 1)
+                value = raw_value.lower() not in ('false', '0')
+            else:
+                name, value = attribute, True
+            if name in ('linguist-generated', 'linguist-vendored'):
+                attributes[name] = value
+        if attributes:
+            rules.append((parts[0], attributes))
+    return rules
+
+def looks_minified(lines: List[str]) -> bool:
+    """아주 긴 라인이 있거나, 라인이 충분히 많은데 평균 길이가 긴 코드 (번들/압축 결과물 추정)"""
+    lengths = [len(line) for line in lines if line.strip()]
+    if not lengths:
+        return False
+    if max(lengths) >= FileFilter.MINIFIED_LINE_LENGTH:
+        return True
+    # 긴 URL이나 문자열 상수 한두 줄만 추가된 patch는 평균 길이로 판단하지 않음
+    return len(lengths) >= FileFilter.MINIFIED_MIN_LINES and (
+        sum(lengths) / len(lengths) >= FileFilter.MINIFIED_AVERAGE_LENGTH
+    )
+
+class FileFilter:
+    """내용 조회와 AI 호출 전에 생성/벤더/락 파일과 너무 큰 파일을 걸러내는 필터"""
+
+    # 기본 제외 패턴 (AI_EXCLUDE_GLOBS로 추가, .gitattributes의 -linguist-generated로 개별 해제)
+    DEFAULT_EXCLUDE_GLOBS = [
+        # 의존성 락 파일
+        'package-lock.json', 'yarn.lock', 'pnpm-lock.yaml', 'npm-shrinkwrap.json',
+        'Podfile.lock', 'Package.resolved', 'Cartfile.resolved', 'gradle.lockfile',
+        'Gemfile.lock', 'Cargo.lock', 'go.sum', 'poetry.lock', 'composer.lock',
+        # 벤더/의존성 디렉터리
+        '**/node_modules/**', '**/vendor/**', '**/Pods/**', '**/Carthage/**', '**/third_party/**',
+        # 빌드 결과물
+        'build/**', 'dist/**', 'out/**', '**/build/generated/**', '**/build/intermediates/**', '**/.gradle/**',
+        # 생성 코드, 번들, 소스맵
+        '**/generated/**', '*.generated.*', '*.g.dart', '*.pb.go', '*_pb2.py', '*.pb.swift',
+        '*.min.js', '*.min.css', '*.bundle.js', '*.chunk.js', '*.map', '*.snap',
+        # 바이너리/에셋
+        '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.ico', '*.pdf', '*.svg', '*.ttf', '*.otf', '*.woff',
+        '*.woff2', '*.jar', '*.aar', '*.so', '*.dylib', '*.a', '*.zip', '*.mp3', '*.mp4', '*.keystore',
+    ]
+
+    # 크기/라인 상한 (환경 변수로 조정)
+    MAX_FILE_BYTES = int(os.environ.get('AI_MAX_FILE_BYTES', 300_000))
+    MAX_FILE_LINES = int(os.environ.get('AI_MAX_FILE_LINES', 5000))
+    MAX_CHANGED_LINES = int(os.environ.get('AI_MAX_CHANGED_LINES', 3000))
+
+    # 압축 코드 판별 기준
+    MINIFIED_LINE_LENGTH = 1000
+    MINIFIED_AVERAGE_LENGTH = 250
+    MINIFIED_MIN_LINES = 10
+
+    def __init__(self, source_provider=None, exclude_globs: Optional[List[str]] = None):
+        self.source = source_provider
+        self.exclude_globs = list(self.DEFAULT_EXCLUDE_GLOBS)
+        extra = exclude_globs if exclude_globs is not None else re.split(r'[,\n]', os.environ.get('AI_EXCLUDE_GLOBS', ''))
+        self.exclude_globs += [pattern.strip() for pattern in extra if pattern.strip()]
+
+        # .gitattributes는 실행당 한 번만 읽음
+        self.gitattributes = []
+        if source_provider is not None:
+            try:
+                self.gitattributes = parse_gitattributes(source_provider.read_file('.gitattributes'))
+            except Exception as e:
+                print(f"⚠️ .gitattributes 읽기 실패: {e}")
+
+        self.skipped: Dict[str, str] = {}  # {파일 경로: 제외 사유}
+
+    def linguist_attributes(self, path: str) -> Dict[str, bool]:
+        """파일에 적용되는 linguist 속성 (뒤 규칙이 앞 규칙을 덮어씀)"""
+        attributes = {}
+        for pattern, values in self.gitattributes:
+            if glob_match(path, pattern):
+                attributes.update(values)
+        return attributes
+
+    def check_metadata(self, file) -> Optional[str]:
+        """PR 파일 메타데이터(경로, 변경량, patch)만으로 제외 사유 판단 (통과하면 None)"""
+        path = file.filename
+        attributes = self.linguist_attributes(path)
+        if attributes.get('linguist-generated'):
+            return "linguist-generated"
+        if attributes.get('linguist-vendored'):
+            return "linguist-vendored"
+
+        # .gitattributes에서 명시적으로 해제한 파일은 기본 패턴으로 제외하지 않음
+        explicitly_included = attributes.get('linguist-generated') is False or attributes.get('linguist-vendored') is False
+        if not explicitly_included:
+            for pattern in self.exclude_globs:
+                if glob_match(path, pattern):
+                    return f"제외 패턴 {pattern}"
+
+        changes = (file.additions or 0) + (file.deletions or 0)
+        if changes > self.MAX_CHANGED_LINES:
+            return f"변경 {changes}줄 (최대 {self.MAX_CHANGED_LINES}줄)"
+
+        patch = getattr(file, 'patch', None)
+        if patch is None and changes > 0:
+            # GitHub는 바이너리나 너무 큰 diff의 patch를 생략함
+            return "patch 없음 (바이너리 또는 대용량 diff)"
+        if patch:
+            added_lines = [line[1:] for line in patch.split('\n') if line.startswith('+')]
+            if looks_minified(added_lines):
+                return "압축(minified) 코드"
+
+        if self.source is not None:
+            size = self.source.get_file_size(path)
+            if size is not None and size > self.MAX_FILE_BYTES:
+                return f"파일 크기 {size}바이트 (최대 {self.MAX_FILE_BYTES}바이트)"
+
+        return None
+
+    def check_content(self, path: str, content: str) -> Optional[str]:
+        """내용을 받은 뒤 AI 호출 전에 크기/라인 수/압축 여부 확인 (통과하면 None)"""
+        size = len(content.encode('utf-8'))
+        if size > self.MAX_FILE_BYTES:
+            return f"파일 크기 {size}바이트 (최대 {self.MAX_FILE_BYTES}바이트)"
+        lines = content.split('\n')
+        if len(lines) > self.MAX_FILE_LINES:
+            return f"{len(lines)}줄 (최대 {self.MAX_FILE_LINES}줄)"
+        if looks_minified(lines):
+            return "압축(minified) 코드"
+        return None
+
+    def should_skip(self, file) -> bool:
+        """메타데이터 기준으로 제외할 파일이면 사유를 기록하고 True"""
+        reason = self.check_metadata(file)
+        if reason:
+            self.skip(file.filename, reason)
+        return reason is not None
+
+    def skip(self, path: str, reason: str):
+        self.skipped[path] = reason
+        print(f"  ⏭️ 분석 제외: {path} ({reason})")
+
+    def print_summary(self):
+        if self.skipped:
+            print(f"🧹 사전 필터: {len(self.skipped)}개 파일 제외")
@@ -0,0 +1,141 @@
+# .github/scripts/findings_aggregator.py
+import os
+import re
+from difflib import SequenceMatcher
+from typing import Callable, Dict, List, Optional
+from comment_markers import content_hash, parse_marker
+
+# 봇 라인 코멘트 본문의 "**카테고리**: 메시지" 줄
+COMMENT_FINDING_PATTERN = re.compile(r'^\*\*(?P<category>[^*]+)\*\*: (?P<message>.+)$', re.MULTILINE)
+
+def normalize_text(text: str) -> str:
+    """비교용 메시지 정규화 (대소문자, 마크다운/문장부호, 공백 차이 무시)"""
+    text = (text or "").lower()
+    text = re.sub(r'[`*_"\'“”‘’.,:;!?()\[\]{}<>]', ' ', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+def messages_similar(a: str, b: str, threshold: float) -> bool:
+    """정규화한 두 메시지가 같은 지적인지 (포함 관계이거나 유사도가 기준 이상)"""
+    if not a or not b:
+        return a == b
+    if a == b:
+        return True
+    # 짧은 메시지는 우연히 포함될 수 있으므로 포함 관계는 일정 길이 이상에서만 인정
+    shorter, longer = sorted((a, b), key=len)
+    if len(shorter) >= 10 and shorter in longer:
+        return True
+    return SequenceMatcher(None, a, b).ratio() >= threshold
+
+class FindingsAggregator:
+    """청크/린트 결과를 합쳐 중복 제거, 기존 봇 코멘트와 겹치는 지적 제거, 파일/PR별 개수 제한"""
+
+    # 같은 지적으로 볼 메시지 유사도와 라인 거리
+    SIMILARITY_THRESHOLD = 0.8
+    NEARBY_LINES = 2
+    # 코멘트 개수 상한 (우선순위가 높은 지적부터 남김)
+    MAX_PER_FILE = int(os.environ.get('AI_MAX_COMMENTS_PER_FILE', '10'))
+    MAX_PER_PR = int(os.environ.get('AI_MAX_COMMENTS_PER_PR', '50'))
+    PRIORITY_ORDER = {'P1': 0, 'P2': 1, 'P3': 2}
+
+    def __init__(self, existing_comments: Optional[List[Dict]] = None,
+                 render: Optional[Callable[[str, Dict], str]] = None):
+        # existing_comments: [{'file', 'line', 'hash', 'category', 'message'}]
+        # render: (파일 경로, 지적) → 게시할 코멘트 본문 (마커 해시 비교용)
+        self.existing = existing_comments or []
+        self.render = render
+        self.stats = {'duplicates': 0, 'already_posted': 0, 'capped': 0}
+
+    @staticmethod
+    def parse_existing_comments(review_comments) -> List[Dict]:
+        """PR 리뷰 코멘트 중 봇 라인 코멘트의 파일/라인/본문 해시/메시지 추출"""
+        existing = []
+        for comment in review_comments:
+            marker = parse_marker(comment.body)
+            if not marker or marker.get('k') != 'line':
+                continue
+            match = COMMENT_FINDING_PATTERN.search(comment.body)
+            existing.append({
+                'file': marker.get('f') or comment.path,
+                'line': marker.get('l') or getattr(comment, 'line', None),
+                'hash': marker.get('h'),
+                'category': normalize_text(match.group('category')) if match else "",
+                'message': normalize_text(match.group('message')) if match else ""
+            })
+        return existing
+
+    def same_finding(self, line_a, category_a: str, message_a: str, line_b, category_b: str, message_b: str) -> bool:
+        if line_a is None or line_b is None or abs(line_a - line_b) > self.NEARBY_LINES:
+            return False
+        return category_a == category_b and messages_similar(message_a, message_b, self.SIMILARITY_THRESHOLD)
+
+    def priority_rank(self, finding: Dict) -> int:
+        return self.PRIORITY_ORDER.get(finding.get('priority'), len(self.PRIORITY_ORDER))
+
+    def merge_duplicates(self, findings: List[Dict]) -> List[Dict]:
+        """한 파일 안에서 같은 지적을 하나로 합침 (우선순위는 높은 쪽, 제안은 있는 쪽 유지)"""
+        kept = []
+        for finding in findings:
+            category = normalize_text(finding.get('category'))
+            message = normalize_text(finding.get('message'))
+            duplicate = next((
+                existing for existing in kept
+                if self.same_finding(finding.get('line'), category, message,
+                                     existing.get('line'), existing['_category'], existing['_message'])
+            ), None)
+            if duplicate is None:
+                kept.append({**finding, '_category': category, '_message': message})
+                continue
+
+            self.stats['duplicates'] += 1
+            if self.priority_rank(finding) < self.priority_rank(duplicate):
+                duplicate['priority'] = finding['priority']
+            if not duplicate.get('suggestion') and finding.get('suggestion'):
+                duplicate['suggestion'] = finding['suggestion']
+        return kept
+
+    def already_posted(self, file_path: str, finding: Dict) -> bool:
+        """같은 파일 근처 라인에 같은 본문(해시) 또는 비슷한 지적의 봇 코멘트가 이미 있는지"""
+        body_hash = content_hash(self.render(file_path, finding)) if self.render else None
+        for existing in self.existing:
+            if existing['file'] != file_path:
+                continue
+            line = finding.get('line')
+            if body_hash and existing['hash'] == body_hash and existing['line'] is not None \
+                    and line is not None and abs(existing['line'] - line) <= self.NEARBY_LINES:
+                return True
+            if self.same_finding(line, finding['_category'], finding['_message'],
+                                 existing['line'], existing['category'], existing['message']):
+                return True
+        return False
+
+    def aggregate(self, all_issues: Dict[str, List[Dict]]) -> Dict[str, List[Dict]]:
+        """파일별 지적 목록을 정리해 게시할 지적만 반환 (파일 순서 유지, 파일 안에서는 라인 순)"""
+        per_file = {}
+        for file_path, findings in all_issues.items():
+            merged = self.merge_duplicates([f for f in findings if isinstance(f, dict)])
+            fresh = [finding for finding in merged if not self.already_posted(file_path, finding)]
+            self.stats['already_posted'] += len(merged) - len(fresh)
+
+            fresh.sort(key=lambda f: (self.priority_rank(f), f.get('line') or 0))
+            self.stats['capped'] += max(0, len(fresh) - self.MAX_PER_FILE)
+            per_file[file_path] = fresh[:self.MAX_PER_FILE]
+
+        # PR 전체 상한: 우선순위가 높은 지적부터, 같은 우선순위는 파일 순서대로
+        ranked = sorted(
+            ((self.priority_rank(finding), order, finding.get('line') or 0, file_path, finding)
+             for order, (file_path, findings) in enumerate(per_file.items()) for finding in findings),
+            key=lambda item: item[:3]
+        )
+        self.stats['capped'] += max(0, len(ranked) - self.MAX_PER_PR)
+
+        aggregated = {file_path: [] for file_path in per_file}
+        for _, _, _, file_path, finding in ranked[:self.MAX_PER_PR]:
+            aggregated[file_path].append({k: v for k, v in finding.items() if not k.startswith('_')})
+        for findings in aggregated.values():
+            findings.sort(key=lambda f: f.get('line') or 0)
+
+        return {file_path: findings for file_path, findings in aggregated.items() if findings}
+
+    def print_summary(self):
+        print(f"🧮 지적 정리: 중복 {self.stats['duplicates']}개 병합, "
+              f"기존 코멘트와 겹침 {self.stats['already_posted']}개, 상한 초과 {self.stats['capped']}개 제외")
@@ -1,90 +1,230 @@
 # .github/scripts/interactive_ai_responder.py
 import os
 import json
-import openai
-from github import Github
 import re
 from datetime import datetime
+from source_provider import SourceProvider
+from comment_markers import parse_marker, with_marker
+from prompt_templates import PromptTemplate, PROMPT_USAGE
+from rate_limit import call_github, call_openai, fetch_all, post_github, scan_github, print_rate_limit_summary
+from run_report import RUN_REPORT
+from runtime import get_github_client, get_openai_client
+
+# 대화형 응답 프롬프트 (응답 지침은 고정, 코멘트/코드 컨텍스트는 가변)
+RESPONSE_PROMPT = PromptTemplate(
+    name='interactive_response',
+    static_prefix="""
+당신은 친근하고 전문적인 코드 리뷰 AI 어시스턴트입니다. 개발자의 질문에 도움이 되는 구체적인 답변을 제공하세요.
+개발자가 당신의 이전 코멘트에 질문이나 의견을 남겼습니다.
+
+**응답 가이드라인:**
+1. 개발자의 질문에 구체적이고 도움이 되는 답변 제공
+2. 코드 컨텍스트를 바탕으로 한 실용적인 조언
+3. 필요시 대안 솔루션 제시
+4. 친근하고 전문적인 톤 유지
+5. 한국어로 자연스럽게 응답
+
+**응답 형식:**
+@[개발자 이름] [자연스러운 인사말]. [구체적인 답변 내용]. [필요시 추가 제안이나 코드 예시]
+
+답변은 간결하면서도 충분한 정보를 포함해야 합니다.
+""",
+    variable_suffix="""
+**개발자:** {comment_author}
+
+**이전 AI 코멘트:**
+{parent_comment}
+
+**개발자 질문/의견:**
+{user_comment}
+
+**코드 컨텍스트:**
+파일: {file_path}
+라인: {line_number}
+
+주변 코드:
+```
+{surrounding_code}
+```
+
+Diff:
+```diff
+{diff_context}
+```
+
+**대화 컨텍스트:**
+- 이슈 타입: {issue_type}
+- 이슈 제목: {issue_title}
+"""
+)
 
 class InteractiveAIResponder:
-    def __init__(self):
-        self.openai_client = openai.OpenAI(api_key=os.environ['OPENAI_API_KEY'])
-        self.github_client = Github(os.environ['GITHUB_TOKEN'])
+    def __init__(self, openai_client=None, github_client=None):
+        # 클라이언트를 주입하면(오프라인 실행, 벤치마크) 환경 변수의 키 없이도 동작
+        # 주입하지 않으면 프로세스 공유 클라이언트 사용 (SDK import와 생성은 첫 호출 때)
+        self.openai_client = openai_client or get_openai_client()
+        self.github_client = github_client or get_github_client()
         self.repo_name = os.environ['REPO_NAME']
         self.comment_id = int(os.environ['COMMENT_ID'])
         self.comment_body = os.environ.get('COMMENT_BODY', '')
         self.comment_author = os.environ.get('COMMENT_AUTHOR', '')
 
-        self.repo = self.github_client.get_repo(self.repo_name)
+        # 응답하지 않을 코멘트는 GitHub API를 호출하지 않고 끝나도록 저장소는 처음 사용할 때 조회
+        self._repo = None
+
+    @property
+    def repo(self):
+        if self._repo is None:
+            self._repo = call_github(self.github_client.get_repo, self.repo_name)
+        return self._repo
 
     def is_ai_generated_comment(self, comment) -> bool:
         """AI가 생성한 코멘트인지 확인"""
         if comment.user.login != 'github-actions[bot]':
             return False
 
-        # AI 생성 코멘트의 특징적 패턴들
+        # 숨김 메타데이터 마커가 있으면 바로 판별 (검토 head만 기록하는 상태 코멘트는 응답 대상이 아님)
+        marker = parse_marker(comment.body)
+        if marker:
+            return marker.get('k') != 'line_status'
+
+        # 마커 도입 이전 AI 생성 코멘트의 특징적 패턴들
         ai_patterns = [
             '⚠️ **Potential issue**',
             '🔧 **Refactor suggestion**',
             '📝 **Code quality**',
             '📝 Walkthrough',
             '🤖 **AI',
+            '] AI 분석**',
             'Committable suggestion'
         ]
 
         return any(pattern in comment.body for pattern in ai_patterns)
 
+    def load_event_payload(self) -> dict:
+        """GitHub Actions 이벤트 페이로드 읽기 (없으면 빈 dict)"""
+        event_path = os.environ.get('GITHUB_EVENT_PATH')
+        if not event_path or not os.path.exists(event_path):
+            return {}
+        try:
+            with open(event_path, encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"⚠️ 이벤트 페이로드 읽기 실패: {e}")
+            return {}
+
+    def is_review_comment_event(self):
+        """Review(라인) 코멘트 이벤트인지 여부 (이벤트 정보가 없으면 None)"""
+        event_name = os.environ.get('GITHUB_EVENT_NAME')
+        if event_name == 'pull_request_review_comment':
+            return True
+        if event_name == 'issue_comment':
+            return False
+        return None
+
+    def resolve_pr_number(self, is_review_comment):
+        """코멘트가 속한 PR 번호를 직접 조회 (전체 PR 탐색은 마지막 수단)"""
+        # 1. 워크플로우가 넘겨준 PR 번호
+        if os.environ.get('PR_NUMBER', '').isdigit():
+            return int(os.environ['PR_NUMBER'])
+
+        # 2. 이벤트 페이로드에 포함된 PR 정보
+        payload = self.load_event_payload()
+        if payload.get('pull_request', {}).get('number'):
+            return int(payload['pull_request']['number'])
+        if payload.get('issue', {}).get('pull_request') and payload['issue'].get('number'):
+            return int(payload['issue']['number'])
+
+        # 3. 코멘트 ID로 직접 조회해 PR URL에서 번호 추출
+        if is_review_comment is not False:
+            try:
+                review_comment = call_github(self.repo.get_pulls_comment, self.comment_id)
+                return int(review_comment.pull_request_url.split('/')[-1])
+            except Exception:
+                pass
+        if is_review_comment is not True:
+            try:
+                issue_comment = call_github(self.repo.get_issue_comment, self.comment_id)
+                return int(issue_comment.issue_url.split('/')[-1])
+            except Exception:
+                pass
+
+        # 4. 최후 수단: 열린 PR 전체 탐색
+        print("⚠️ PR 번호를 직접 찾지 못해 열린 PR 전체를 탐색합니다")
+        return self.find_pr_from_review_comment()
+
     def find_parent_ai_comment(self):
         """현재 코멘트의 부모 AI 코멘트 찾기"""
         try:
-            # 현재 코멘트 가져오기
-            current_comment = None
+            is_review_comment = self.is_review_comment_event()
+            pr_number = self.resolve_pr_number(is_review_comment)
+            if not pr_number:
+                return None, None
 
-            # PR 코멘트인지 확인
-            try:
-                current_comment = self.github_client.get_repo(self.repo_name).get_issue_comment(self.comment_id)
-                pr_number = current_comment.issue_url.split('/')[-1]
-                pr = self.repo.get_pull(int(pr_number))
-
-                # Issue 코멘트 방식
-                comments = pr.get_issue_comments()
-
-            except:
-                # Review 코멘트 방식 시도
-                pr_number = self.find_pr_from_review_comment()
-                if not pr_number:
-                    return None, None
-
-                pr = self.repo.get_pull(pr_number)
-                comments = pr.get_review_comments()
-
-            # 현재 코멘트 이전의 AI 코멘트들 찾기
-            ai_comments = []
-            for comment in comments:
-                if comment.id == self.comment_id:
-                    break
-                if self.is_ai_generated_comment(comment):
-                    ai_comments.append(comment)
-
-            if not ai_comments:
+            pr = call_github(self.repo.get_pull, pr_number)
+
+            if is_review_comment is None:
+                # 이벤트 정보가 없으면 Issue 코멘트 조회 성공 여부로 판단
+                try:
+                    call_github(self.repo.get_issue_comment, self.comment_id)
+                    is_review_comment = False
+                except Exception:
+                    is_review_comment = True
+
+            if is_review_comment:
+                # Review 코멘트: in_reply_to_id 체인을 따라 스레드의 AI 코멘트 찾기
+                parent_comment = self.find_parent_in_review_thread(pr)
+            else:
+                # Issue 코멘트: 현재 코멘트 직전의 가장 최근 AI 코멘트 찾기
+                parent_comment = self.find_recent_ai_issue_comment(pr)
+
+            if not parent_comment:
                 return None, None
 
-            # 가장 최근의 AI 코멘트 반환
-            parent_comment = ai_comments[-1]
             return parent_comment, pr
 
         except Exception as e:
             print(f"부모 AI 코멘트 찾기 실패: {e}")
             return None, None
 
+    def find_parent_in_review_thread(self, pr):
+        """in_reply_to_id 체인을 거슬러 올라가며 가장 가까운 AI 코멘트 반환 (스레드 깊이에 비례)"""
+        # 이벤트 페이로드에 현재 코멘트가 있으면 API 조회 없이 사용
+        payload_comment = self.load_event_payload().get('comment', {})
+        if payload_comment.get('id') == self.comment_id:
+            parent_id = payload_comment.get('in_reply_to_id')
+        else:
+            parent_id = call_github(pr.get_review_comment, self.comment_id).in_reply_to_id
+
+        visited = set()
+        while parent_id and parent_id not in visited:
+            visited.add(parent_id)
+            parent = call_github(pr.get_review_comment, parent_id)
+            if self.is_ai_generated_comment(parent):
+                return parent
+            parent_id = parent.in_reply_to_id
+
+        return None
+
+    def find_recent_ai_issue_comment(self, pr, max_scan: int = 100):
+        """현재 코멘트 이전의 가장 최근 AI Issue 코멘트 (최신 코멘트부터 역순으로 탐색)"""
+        def get_issue_comments_reversed():
+            return pr.get_issue_comments().reversed
+
+        # 역순 목록을 최대 max_scan개까지만 받아 확인 (현재 코멘트 이후의 코멘트도 개수에 포함)
+        for comment in fetch_all(get_issue_comments_reversed, limit=max_scan):
+            if comment.id >= self.comment_id:
+                continue
+            if self.is_ai_generated_comment(comment):
+                return comment
+        return None
+
     def find_pr_from_review_comment(self):
-        """Review 코멘트에서 PR 번호 찾기"""
+        """Review 코멘트에서 PR 번호 찾기 (열린 PR 전체 탐색)"""
         try:
             # GitHub API로 모든 열린 PR 확인
-            pulls = self.repo.get_pulls(state='open')
-            for pr in pulls:
-                review_comments = pr.get_review_comments()
-                for comment in review_comments:
+            for pr in scan_github(self.repo.get_pulls, state='open'):
+                for comment in scan_github(pr.get_review_comments):
                     if comment.id == self.comment_id:
                         return pr.number
             return None
@@ -104,12 +244,19 @@ class InteractiveAIResponder:
             # Review 코멘트인 경우
             if hasattr(parent_comment, 'path'):
                 context['file_path'] = parent_comment.path
-                context['line_number'] = getattr(parent_comment, 'line', None)
+                # outdated 코멘트는 line이 비어 있으므로 마커에 기록된 라인 사용
+                marker = parse_marker(parent_comment.body) or {}
+                context['line_number'] = getattr(parent_comment, 'line', None) or marker.get('l')
 
                 # 파일 내용 가져오기
                 try:
-                    file_content = self.repo.get_contents(parent_comment.path, ref=pr.head.sha)
-                    lines = file_content.decoded_content.decode('utf-8').split('\n')
+                    # 로컬 체크아웃에 head 커밋이 있으면 API 대신 로컬에서 읽음
+                    source = SourceProvider(self.repo, pr.head.sha)
+                    file_content = source.read_file(parent_comment.path)
+                    source.close()
+                    if file_content is None:
+                        raise FileNotFoundError(parent_comment.path)
+                    lines = file_content.split('\n')
 
                     if context['line_number']:
                         start = max(0, context['line_number'] - 5)
@@ -121,8 +268,8 @@ class InteractiveAIResponder:
 
             # Diff 정보 가져오기
             try:
-                files = pr.get_files()
-                for file in files:
+                # 대상 파일을 찾으면 남은 페이지는 요청하지 않도록 페이지 단위로 지연 순회
+                for file in scan_github(pr.get_files):
                     if context['file_path'] and file.filename == context['file_path']:
                         context['diff_context'] = file.patch[:1000] if file.patch else ''
                         break
@@ -173,56 +320,27 @@ class InteractiveAIResponder:
     def generate_ai_response(self, parent_comment, user_comment, code_context, conversation_context):
         """AI 응답 생성"""
 
-        response_prompt = f"""
-당신은 코드 리뷰를 도와주는 AI 어시스턴트입니다. 개발자가 당신의 이전 코멘트에 질문이나 의견을 남겼습니다.
-
-**이전 AI 코멘트:**
-{parent_comment.body[:1000]}
-
-**개발자 질문/의견:**
-{user_comment}
-
-**코드 컨텍스트:**
-파일: {code_context.get('file_path', 'N/A')}
-라인: {code_context.get('line_number', 'N/A')}
-
-주변 코드:
-```
-{code_context.get('surrounding_code', 'N/A')}
-```
-
-Diff:
-```diff
-{code_context.get('diff_context', 'N/A')[:500]}
-```
-
-**대화 컨텍스트:**
-- 이슈 타입: {conversation_context.get('issue_type')}
-- 이슈 제목: {conversation_context.get('issue_title')}
-
-**응답 가이드라인:**
-1. 개발자의 질문에 구체적이고 도움이 되는 답변 제공
-2. 코드 컨텍스트를 바탕으로 한 실용적인 조언
-3. 필요시 대안 솔루션 제시
-4. 친근하고 전문적인 톤 유지
-5. 한국어로 자연스럽게 응답
-
-**응답 형식:**
-@{self.comment_author} [자연스러운 인사말]. [구체적인 답변 내용]. [필요시 추가 제안이나 코드 예시]
-
-답변은 간결하면서도 충분한 정보를 포함해야 합니다.
-"""
+        messages = RESPONSE_PROMPT.build_messages(
+            parent_comment=parent_comment.body[:1000],
+            user_comment=user_comment,
+            file_path=code_context.get('file_path', 'N/A'),
+            line_number=code_context.get('line_number', 'N/A'),
+            surrounding_code=code_context.get('surrounding_code', 'N/A'),
+            diff_context=code_context.get('diff_context', 'N/A')[:500],
+            issue_type=conversation_context.get('issue_type'),
+            issue_title=conversation_context.get('issue_title'),
+            comment_author=self.comment_author
+        )
 
         try:
-            response = self.openai_client.chat.completions.create(
+            response = call_openai(
+                self.openai_client.chat.completions.create,
                 model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "당신은 친근하고 전문적인 코드 리뷰 AI 어시스턴트입니다. 개발자의 질문에 도움이 되는 구체적인 답변을 제공하세요."},
-                    {"role": "user", "content": response_prompt}
-                ],
+                messages=messages,
                 max_tokens=1000,
                 temperature=0.3
             )
+            RESPONSE_PROMPT.record_usage(response)
 
             return response.choices[0].message.content.strip()
 
@@ -235,22 +353,37 @@ Diff:
         try:
             # Review 코멘트에 대한 응답인 경우
             if hasattr(parent_comment, 'path'):
-                # Review 코멘트에는 직접 응답할 수 없으므로 PR에 일반 코멘트로 게시
                 pr_url = parent_comment.pull_request_url
                 pr_number = int(pr_url.split('/')[-1])
-                pr = self.repo.get_pull(pr_number)
-
-                response_body = f"**💬 AI 응답**\n\n{ai_response}\n\n*[라인별 코멘트](#{parent_comment.id})에 대한 응답*"
-                comment = pr.create_issue_comment(response_body)
+                pr = call_github(self.repo.get_pull, pr_number)
+
+                # 같은 스레드에 답글로 게시해 이후 질문도 in_reply_to_id로 부모를 찾을 수 있게 함
+                response_body = with_marker(
+                    f"**💬 AI 응답**\n\n{ai_response}",
+                    'reply',
+                    file=parent_comment.path,
+                    line=getattr(parent_comment, 'line', None),
+                    parent=parent_comment.id
+                )
+                try:
+                    comment = post_github(pr.create_review_comment_reply, parent_comment.id, response_body)
+                except Exception as e:
+                    status = getattr(e, 'status', None)
+                    if not isinstance(status, int) or status >= 500:
+                        # 5xx/시간 초과는 답글이 이미 생성됐을 수 있으므로 일반 코멘트로 다시 게시하지 않음
+                        raise
+                    print(f"⚠️ 스레드 답글 실패, 일반 코멘트로 게시: {e}")
+                    response_body = f"**💬 AI 응답**\n\n{ai_response}\n\n*[라인별 코멘트](#{parent_comment.id})에 대한 응답*"
+                    comment = post_github(pr.create_issue_comment, with_marker(response_body, 'reply', parent=parent_comment.id))
 
             else:
                 # Issue 코멘트에 대한 응답
-                response_body = f"**💬 AI 응답**\n\n{ai_response}"
+                response_body = with_marker(f"**💬 AI 응답**\n\n{ai_response}", 'reply', parent=parent_comment.id)
 
                 # 부모 코멘트가 속한 PR 찾기
                 pr_number = parent_comment.issue_url.split('/')[-1]
-                pr = self.repo.get_pull(int(pr_number))
-                comment = pr.create_issue_comment(response_body)
+                pr = call_github(self.repo.get_pull, int(pr_number))
+                comment = post_github(pr.create_issue_comment, response_body)
 
             print(f"✅ AI 응답이 게시되었습니다: {comment.html_url}")
             return True
@@ -306,6 +439,7 @@ Diff:
         print(f"📝 사용자 코멘트: {self.comment_author} - '{self.comment_body[:100]}...'")
 
         # 2. 부모 AI 코멘트 찾기
+        RUN_REPORT.begin_stage('find_parent')
         print("🔍 부모 AI 코멘트를 찾는 중...")
         parent_comment, pr = self.find_parent_ai_comment()
 
@@ -316,6 +450,7 @@ Diff:
         print(f"✅ 부모 AI 코멘트 발견: ID {parent_comment.id}")
 
         # 3. 코드 컨텍스트 수집
+        RUN_REPORT.begin_stage('code_context')
         print("📄 코드 컨텍스트를 수집하는 중...")
         code_context = self.get_code_context(pr, parent_comment)
 
@@ -324,6 +459,7 @@ Diff:
         conversation_context = self.extract_conversation_context(parent_comment, self.comment_body)
 
         # 5. AI 응답 생성
+        RUN_REPORT.begin_stage('generate_response')
         print("🤖 AI 응답을 생성하는 중...")
         ai_response = self.generate_ai_response(
             parent_comment,
@@ -333,6 +469,7 @@ Diff:
         )
 
         # 6. 응답 게시
+        RUN_REPORT.begin_stage('post_response')
         print("💬 응답을 게시하는 중...")
         success = self.post_ai_response(parent_comment, ai_response)
 
@@ -341,6 +478,12 @@ Diff:
         else:
             print("❌ 대화형 AI 응답에 실패했습니다.")
 
+        PROMPT_USAGE.print_summary()
+        print_rate_limit_summary()
+
 if __name__ == "__main__":
-    responder = InteractiveAIResponder()
-    responder.run_interactive_response()
+    try:
+        responder = InteractiveAIResponder()
+        responder.run_interactive_response()
+    finally:
+        RUN_REPORT.write('interactive_ai_responder')
@@ -0,0 +1,258 @@
+# .github/scripts/local_rules.py
+import fnmatch
+import json
+import os
+import re
+from typing import Dict, List, Optional, Pattern
+
+try:
+    # 워크플로에 설치되어 있으면 사용 (없으면 필요한 키만 정규식으로 읽음)
+    import yaml
+except ImportError:
+    yaml = None
+
+# 문자열/주석 구분자 (언어별)
+_STRING_DELIMITERS = {
+    'kotlin': ('"""', '"', "'"),
+    'swift': ('"""', '"'),
+    'javascript': ('`', '"', "'"),
+}
+
+def mask_code(file_content: str, language: str) -> List[str]:
+    """주석은 지우고 문자열 리터럴은 빈 따옴표로 바꾼 라인 목록 (라인 수 유지)"""
+    delimiters = _STRING_DELIMITERS.get(language, ('"', "'"))
+    masked_lines = []
+    current = []
+    state = None  # None(코드), 'block'(블록 주석), 또는 문자열 구분자
+    text = file_content
+    i = 0
+    length = len(text)
+
+    while i < length:
+        ch = text[i]
+        if ch == '\n':
+            masked_lines.append(''.join(current))
+            current = []
+            # 한 줄 문자열은 줄바꿈에서 끝난 것으로 처리 (잘못된 코드에서 상태가 번지지 않도록)
+            if state in ('"', "'"):
+                state = None
+            i += 1
+            continue
+
+        if state == 'block':
+            if text.startswith('*/', i):
+                state = None
+                i += 2
+            else:
+                i += 1
+            continue
+
+        if state is not None:
+            if ch == '\\' and i + 1 < length and text[i + 1] != '\n':
+                i += 2
+                continue
+            if text.startswith(state, i):
+                current.append(state)
+                i += len(state)
+                state = None
+            else:
+                i += 1
+            continue
+
+        if text.startswith('//', i):
+            # 라인 주석: 줄 끝까지 건너뜀
+            end = text.find('\n', i)
+            i = length if end == -1 else end
+            continue
+        if text.startswith('/*', i):
+            state = 'block'
+            i += 2
+            continue
+
+        for delimiter in delimiters:
+            if text.startswith(delimiter, i):
+                current.append(delimiter)
+                state = delimiter
+                i += len(delimiter)
+                break
+        else:
+            current.append(ch)
+            i += 1
+
+    masked_lines.append(''.join(current))
+    return masked_lines
+
+def _violation(line: int, rule: str, language: str, message: str, suggestion: str) -> Dict:
+    return {
+        'line': line,
+        'rule': rule,
+        'priority': 'P3',
+        'category': f"{language}lint",
+        'message': message,
+        'suggestion': suggestion,
+        'source': 'local'
+    }
+
+def check_max_line_length(lines: List[str], limit: int, rule: str, language: str) -> List[Dict]:
+    """최대 라인 길이 초과 검사 (원본 라인 기준)"""
+    return [
+        _violation(number, rule, language, f"라인 길이 {len(line)}자 (최대 {limit}자)", "라인을 나눠 길이를 줄이세요")
+        for number, line in enumerate(lines, 1)
+        if len(line) > limit
+    ]
+
+def check_pattern(masked_lines: List[str], pattern: Pattern, rule: str, language: str,
+                  message: str, suggestion: str) -> List[Dict]:
+    """주석/문자열을 제외한 코드에서 패턴이 나오는 라인 검사"""
+    return [
+        _violation(number, rule, language, message, suggestion)
+        for number, line in enumerate(masked_lines, 1)
+        if pattern.search(line)
+    ]
+
+def check_indentation(lines: List[str], masked_lines: List[str], indent_style: str, indent_size: int,
+                      rule: str, language: str) -> List[Dict]:
+    """들여쓰기 문자(탭/스페이스)와 스페이스 들여쓰기 폭 검사"""
+    violations = []
+    for number, (line, masked) in enumerate(zip(lines, masked_lines), 1):
+        # 빈 줄, 여러 줄 주석/문자열 안쪽 라인은 검사하지 않음
+        if not line.strip() or not masked.strip():
+            continue
+        indent = line[:len(line) - len(line.lstrip(' \t'))]
+        if indent_style == 'space' and '\t' in indent:
+            violations.append(_violation(number, rule, language, "탭 대신 스페이스로 들여쓰기", f"{indent_size}칸 스페이스 사용"))
+        elif indent_style == 'tab' and ' ' in indent.replace('\t', ''):
+            violations.append(_violation(number, rule, language, "스페이스 대신 탭으로 들여쓰기", "탭 문자 사용"))
+        elif indent_style == 'space' and indent_size and len(indent) % indent_size:
+            violations.append(_violation(number, rule, language, f"들여쓰기가 {indent_size}칸 단위가 아님", f"{indent_size}칸 단위로 맞추세요"))
+    return violations
+
+def _expand_braces(pattern: str) -> List[str]:
+    """'*.{kt,kts}' → ['*.kt', '*.kts']"""
+    match = re.search(r'\{([^{}]*)\}', pattern)
+    if not match:
+        return [pattern]
+    expanded = []
+    for option in match.group(1).split(','):
+        expanded.extend(_expand_braces(pattern[:match.start()] + option + pattern[match.end():]))
+    return expanded
+
+def parse_editorconfig(config_content: str, file_path: str) -> Dict[str, str]:
+    """.editorconfig에서 파일에 적용되는 속성 (뒤 섹션이 앞 섹션을 덮어씀)"""
+    properties = {}
+    applies = False
+    file_name = os.path.basename(file_path)
+
+    for raw_line in (config_content or "").split('\n'):
+        line = raw_line.strip()
+        if not line or line[0] in '#;':
+            continue
+        if line.startswith('[') and line.endswith(']'):
+            patterns = _expand_braces(line[1:-1])
+            applies = any(
+                fnmatch.fnmatch(file_path if '/' in pattern else file_name, pattern.lstrip('/').replace('**', '*'))
+                for pattern in patterns
+            )
+            continue
+        if applies and '=' in line:
+            key, value = line.split('=', 1)
+            properties[key.strip().lower()] = value.strip().lower()
+
+    return properties
+
+def is_editorconfig_root(config_content: str) -> bool:
+    """첫 섹션 전에 root = true가 있는 .editorconfig인지 (아니면 상위 .editorconfig와 합쳐 적용)"""
+    for raw_line in (config_content or "").split('\n'):
+        line = raw_line.strip()
+        if not line or line[0] in '#;':
+            continue
+        if line.startswith('['):
+            return False
+        if '=' in line:
+            key, value = line.split('=', 1)
+            if key.strip().lower() == 'root' and value.strip().lower() == 'true':
+                return True
+    return False
+
+def _load_yaml(config_content: str) -> Dict:
+    if yaml is not None:
+        try:
+            loaded = yaml.safe_load(config_content)
+            return loaded if isinstance(loaded, dict) else {}
+        except Exception:
+            return {}
+
+    # pyyaml이 없으면 로컬 규칙에 필요한 키만 읽음
+    loaded = {}
+    match = re.search(r'^line_length:\s*(\d+)', config_content, re.MULTILINE)
+    if match:
+        loaded['line_length'] = int(match.group(1))
+    match = re.search(r'^line_length:\s*\n(?:\s+.*\n)*?\s+warning:\s*(\d+)', config_content, re.MULTILINE)
+    if match:
+        loaded['line_length'] = {'warning': int(match.group(1))}
+    for key in ('disabled_rules', 'opt_in_rules'):
+        match = re.search(rf'^{key}:\s*\n((?:\s*-\s*\S+.*\n?)*)', config_content, re.MULTILINE)
+        if match:
+            loaded[key] = re.findall(r'-\s*(\S+)', match.group(1))
+    return loaded
+
+def parse_swiftlint_config(config_content: str) -> Dict:
+    """.swiftlint.yml에서 로컬 규칙 설정 추출"""
+    loaded = _load_yaml(config_content or "")
+    line_length = loaded.get('line_length', 120)
+    if isinstance(line_length, dict):
+        line_length = line_length.get('warning', line_length.get('error', 120))
+    elif isinstance(line_length, list) and line_length:
+        line_length = line_length[0]
+
+    indentation = loaded.get('indentation_width')
+    indentation_width = indentation.get('indentation_width', 4) if isinstance(indentation, dict) else 4
+
+    return {
+        'line_length': parse_int(line_length, 120),
+        'disabled_rules': set(loaded.get('disabled_rules') or []),
+        'opt_in_rules': set(loaded.get('opt_in_rules') or []),
+        'indentation_width': parse_int(indentation_width, 4)
+    }
+
+def parse_eslint_rules(config_content: str) -> Dict:
+    """.eslintrc.json(또는 package.json의 eslintConfig)의 rules (JS 형식 설정은 읽지 않음)"""
+    content = config_content or ""
+    try:
+        loaded = json.loads(content)
+    except ValueError:
+        # .eslintrc.json은 주석을 허용하므로 라인 주석을 지우고 한 번 더 시도
+        try:
+            loaded = json.loads(re.sub(r'^\s*//.*$', '', content, flags=re.MULTILINE))
+        except ValueError:
+            return {}
+    if not isinstance(loaded, dict):
+        return {}
+    if 'eslintConfig' in loaded:
+        loaded = loaded['eslintConfig'] or {}
+    rules = loaded.get('rules')
+    return rules if isinstance(rules, dict) else {}
+
+def has_eslint_config(package_json: str) -> bool:
+    """package.json에 eslintConfig 키가 있는지 (없으면 ESLint 설정 파일이 아님)"""
+    try:
+        loaded = json.loads(package_json or "")
+    except ValueError:
+        return False
+    return isinstance(loaded, dict) and 'eslintConfig' in loaded
+
+def eslint_rule_setting(rules: Dict, name: str):
+    """ESLint 규칙의 (활성 여부, 옵션 목록), 설정이 없으면 (None, [])"""
+    if name not in rules:
+        return None, []
+    setting = rules[name]
+    options = []
+    if isinstance(setting, list):
+        setting, options = (setting[0] if setting else 'off'), setting[1:]
+    return setting not in ('off', 0, '0'), options
+
+def parse_int(value, default: Optional[int]) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
@@ -0,0 +1,227 @@
+# .github/scripts/offline_cli.py
+# GitHub Actions 밖에서 분석 스크립트를 실행하는 CLI
+#
+#   # 합성 PR(50개 파일)로 라인 분석 실행, OpenAI/GitHub 요청마다 0.3초 지연
+#   python offline_cli.py run --target lines --synthetic 50 --latency 0.3
+#
+#   # 실제 OpenAI 응답을 녹화한 뒤 재생
+#   python offline_cli.py run --target walkthrough --fixture pr.json --openai record --cassette pr.cassette.json
+#   python offline_cli.py run --target walkthrough --fixture pr.json --openai replay --cassette pr.cassette.json
+#
+#   # 1/50/500개 파일 × 작은/큰 hunk 벤치마크
+#   python offline_cli.py bench --output bench.json
+import argparse
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+from offline_clients import CallLog, CassetteOpenAI, FakeGithub, FakeOpenAI, Latency, synthetic_pr
+
+TARGETS = ('walkthrough', 'lines', 'respond')
+
+def load_fixture(args) -> Dict:
+    """픽스처 JSON 파일 또는 합성 PR"""
+    if args.fixture:
+        with open(args.fixture, encoding='utf-8') as f:
+            return json.load(f)
+    return synthetic_pr(args.synthetic, args.hunk, args.seed)
+
+def prepare_environment(fixture: Dict, args, work_dir: str):
+    """분석 스크립트가 읽는 환경 변수 설정 (모듈 import 전에 호출해야 클래스 상수에도 반영됨)"""
+    pull = fixture['pull']
+    os.environ.update({
+        'REPO_NAME': fixture['repo'],
+        'PR_NUMBER': str(pull['number']),
+        'PR_TITLE': pull.get('title', ''),
+        'PR_BODY': pull.get('body', ''),
+        'FULL_REVIEW': 'true',
+        'AI_LOCAL_SOURCE': 'true' if args.local_source else 'false',
+        'AI_CACHE_DIR': args.cache_dir or os.path.join(work_dir, 'cache'),
+    })
+    os.environ.setdefault('GITHUB_TOKEN', 'offline')
+    os.environ.setdefault('OPENAI_API_KEY', 'offline')
+    if args.openai_rps:
+        os.environ['AI_OPENAI_RPS'] = str(args.openai_rps)
+        os.environ['AI_OPENAI_BURST'] = str(max(1, int(args.openai_rps)))
+    if args.github_rps:
+        os.environ['AI_GITHUB_RPS'] = str(args.github_rps)
+        os.environ['AI_GITHUB_BURST'] = str(max(1, int(args.github_rps)))
+
+    # 대화형 응답은 라인 코멘트 이벤트로 실행
+    comment = fixture.get('comment')
+    if comment:
+        payload_path = os.path.join(work_dir, 'event.json')
+        with open(payload_path, 'w', encoding='utf-8') as f:
+            json.dump({'comment': comment, 'pull_request': {'number': pull['number']}}, f, ensure_ascii=False)
+        os.environ.update({
+            'GITHUB_EVENT_NAME': 'pull_request_review_comment',
+            'GITHUB_EVENT_PATH': payload_path,
+            'COMMENT_ID': str(comment['id']),
+            'COMMENT_BODY': comment['body'],
+            'COMMENT_AUTHOR': comment.get('user', 'developer'),
+        })
+
+def build_clients(fixture: Dict, args, log: CallLog):
+    """픽스처 기반 GitHub 대역과 OpenAI 대역(또는 cassette) 생성"""
+    latency = Latency(args.latency, args.token_latency)
+    github_client = FakeGithub(fixture, log, latency)
+
+    if args.openai == 'fake':
+        return FakeOpenAI(log, latency), github_client, None
+
+    if not args.cassette:
+        raise SystemExit("--openai record/replay에는 --cassette 경로가 필요합니다")
+    inner = None
+    if args.openai == 'record':
+        from runtime import get_openai_client
+        inner = get_openai_client()
+    cassette = CassetteOpenAI(args.cassette, args.openai, log, latency, inner)
+    return cassette, github_client, cassette
+
+def run_target(target: str, openai_client, github_client):
+    """대상 스크립트를 주입한 클라이언트로 실행"""
+    if target == 'walkthrough':
+        from ai_pr_analyzer import PRAnalyzer
+        PRAnalyzer(openai_client, github_client).run_analysis()
+    elif target == 'lines':
+        from universal_line_analyzer import UniversalLineAnalyzer
+        UniversalLineAnalyzer(openai_client, github_client).run_universal_analysis()
+    elif target == 'respond':
+        from interactive_ai_responder import InteractiveAIResponder
+        InteractiveAIResponder(openai_client, github_client).run_interactive_response()
+    else:
+        raise ValueError(f"알 수 없는 대상: {target}")
+
+def command_run(args) -> Dict:
+    """한 대상 스크립트를 오프라인으로 실행하고 실행 보고서 반환"""
+    fixture = load_fixture(args)
+    with tempfile.TemporaryDirectory() as work_dir:
+        prepare_environment(fixture, args, work_dir)
+        log = CallLog()
+        openai_client, github_client, cassette = build_clients(fixture, args, log)
+
+        output = io.StringIO()
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(output) if args.quiet else contextlib.nullcontext():
+            run_target(args.target, openai_client, github_client)
+        wall_seconds = time.perf_counter() - started
+
+        if cassette is not None:
+            cassette.save()
+
+    from run_report import RUN_REPORT
+    usage = log.to_dict()
+    openai_calls = sum(count for endpoint, count in usage['calls'].items() if endpoint.endswith('/chat/completions'))
+    report = {
+        'target': args.target,
+        'fixture': args.fixture or f"synthetic:{args.synthetic}:{args.hunk}",
+        'files': len(fixture['pull'].get('files', [])),
+        'wall_seconds': round(wall_seconds, 3),
+        'openai_calls': openai_calls,
+        'github_calls': sum(usage['calls'].values()) - openai_calls,
+        'calls': usage['calls'],
+        'tokens': usage['tokens'],
+        # 스크립트가 기록한 단계별 지표 (실행 보고서와 같은 형식)
+        'stages': RUN_REPORT.to_dict(args.target)['stages'],
+    }
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if not args.quiet:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    return report
+
+def command_bench(args):
+    """합성 PR 크기 × hunk 크기 × 대상 스크립트 조합을 각각 별도 프로세스로 실행 (프로세스 전역 캐시/집계 분리)"""
+    reports = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        for size in args.sizes:
+            for hunk in args.hunks:
+                for target in args.targets:
+                    report_path = os.path.join(work_dir, f"{size}-{hunk}-{target}.json")
+                    command = [
+                        sys.executable, os.path.abspath(__file__), 'run',
+                        '--target', target, '--synthetic', str(size), '--hunk', hunk,
+                        '--latency', str(args.latency), '--token-latency', str(args.token_latency),
+                        '--report', report_path, '--quiet'
+                    ]
+                    if args.openai_rps:
+                        command += ['--openai-rps', str(args.openai_rps)]
+                    if args.github_rps:
+                        command += ['--github-rps', str(args.github_rps)]
+
+                    print(f"⏱️ {size}개 파일 / {hunk} hunk / {target} 실행 중...", file=sys.stderr)
+                    result = subprocess.run(command, capture_output=True, text=True)
+                    if result.returncode != 0 or not os.path.exists(report_path):
+                        print(f"❌ 실패: {result.stderr[-2000:]}", file=sys.stderr)
+                        continue
+                    with open(report_path, encoding='utf-8') as f:
+                        reports.append(json.load(f))
+
+    print(format_bench_table(reports))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(reports, f, ensure_ascii=False, indent=2)
+    return reports
+
+def format_bench_table(reports: List[Dict]) -> str:
+    """벤치마크 결과 마크다운 표"""
+    lines = [
+        "| PR | 대상 | 실행 시간(s) | OpenAI 호출 | GitHub 호출 | 입력 토큰 | 캐시 토큰 | 출력 토큰 |",
+        "|----|------|-------------|------------|------------|----------|----------|----------|",
+    ]
+    for report in reports:
+        tokens = report['tokens']
+        lines.append(
+            f"| {report['fixture']} | {report['target']} | {report['wall_seconds']:.2f} | {report['openai_calls']} | "
+            f"{report['github_calls']} | {tokens['prompt']} | {tokens['cached']} | {tokens['completion']} |"
+        )
+    return '\n'.join(lines)
+
+def add_common_arguments(parser):
+    parser.add_argument('--latency', type=float, default=0.05, help="요청당 지연(초)")
+    parser.add_argument('--token-latency', type=float, default=0.0, help="OpenAI 출력 토큰당 추가 지연(초)")
+    parser.add_argument('--openai-rps', type=float, help="OpenAI 초당 요청 제한 (기본값은 rate_limit 설정)")
+    parser.add_argument('--github-rps', type=float, help="GitHub 초당 요청 제한 (기본값은 rate_limit 설정)")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AI 리뷰 스크립트 오프라인 실행/벤치마크")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help="대상 스크립트 한 번 실행")
+    run_parser.add_argument('--target', choices=TARGETS, required=True)
+    source = run_parser.add_mutually_exclusive_group()
+    source.add_argument('--fixture', help="PR 픽스처 JSON 경로 (offline_clients.synthetic_pr과 같은 형식)")
+    source.add_argument('--synthetic', type=int, default=1, help="합성 PR 파일 수")
+    run_parser.add_argument('--hunk', choices=('small', 'huge'), default='small')
+    run_parser.add_argument('--seed', type=int, default=0)
+    run_parser.add_argument('--openai', choices=('fake', 'record', 'replay'), default='fake')
+    run_parser.add_argument('--cassette', help="OpenAI 녹화 파일 경로")
+    run_parser.add_argument('--cache-dir', help="분석 캐시 디렉터리 (기본: 실행마다 새 임시 디렉터리)")
+    run_parser.add_argument('--local-source', action='store_true', help="파일 내용을 로컬 git에서 읽음")
+    run_parser.add_argument('--report', help="실행 보고서 JSON 저장 경로")
+    run_parser.add_argument('--quiet', action='store_true', help="스크립트 출력 숨김")
+    add_common_arguments(run_parser)
+
+    bench_parser = subparsers.add_parser('bench', help="합성 PR 벤치마크")
+    bench_parser.add_argument('--sizes', type=lambda v: [int(x) for x in v.split(',')], default=[1, 50, 500])
+    bench_parser.add_argument('--hunks', type=lambda v: v.split(','), default=['small', 'huge'])
+    bench_parser.add_argument('--targets', type=lambda v: v.split(','), default=list(TARGETS))
+    bench_parser.add_argument('--output', help="전체 결과 JSON 저장 경로")
+    add_common_arguments(bench_parser)
+
+    args = parser.parse_args(argv)
+    if args.command == 'run':
+        command_run(args)
+    else:
+        command_bench(args)
+
+if __name__ == "__main__":
+    main()
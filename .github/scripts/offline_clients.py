@@ -0,0 +1,523 @@
+# .github/scripts/offline_clients.py
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+from token_budget import estimate_tokens
+from comment_markers import with_marker
+from prompt_templates import CACHE_MIN_TOKENS
+from rate_limit import GITHUB_PAGE_SIZE
+
+# 오프라인 실행용 GitHub/OpenAI 대역 (PyGithub/openai 클라이언트 중 스크립트가 쓰는 부분만 흉내냄)
+
+class CallLog:
+    """엔드포인트별 호출 수와 토큰 사용량 집계"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls: Dict[str, int] = {}
+        self.tokens = {'prompt': 0, 'cached': 0, 'completion': 0}
+
+    def record(self, endpoint: str, count: int = 1):
+        with self._lock:
+            self.calls[endpoint] = self.calls.get(endpoint, 0) + count
+
+    def add_usage(self, usage):
+        if usage is None:
+            return
+        details = getattr(usage, 'prompt_tokens_details', None)
+        with self._lock:
+            self.tokens['prompt'] += getattr(usage, 'prompt_tokens', 0) or 0
+            self.tokens['cached'] += (getattr(details, 'cached_tokens', 0) or 0) if details else 0
+            self.tokens['completion'] += getattr(usage, 'completion_tokens', 0) or 0
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            return {'calls': dict(sorted(self.calls.items())), 'tokens': dict(self.tokens)}
+
+class Latency:
+    """요청 1회 고정 지연 + 응답 토큰당 지연 (±jitter 비율만큼 흔들림)"""
+
+    def __init__(self, request_seconds: float = 0.0, per_token_seconds: float = 0.0, jitter: float = 0.2):
+        self.request_seconds = request_seconds
+        self.per_token_seconds = per_token_seconds
+        self.jitter = jitter
+
+    def wait(self, output_tokens: int = 0):
+        seconds = self.request_seconds + self.per_token_seconds * output_tokens
+        if seconds <= 0:
+            return
+        time.sleep(seconds * random.uniform(1 - self.jitter, 1 + self.jitter))
+
+class FakeGithubException(Exception):
+    """GithubException과 같은 status/data/headers 속성을 가진 예외"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(status, message)
+        self.status = status
+        self.data = {'message': message}
+        self.headers = {}
+
+class FakePaginatedList:
+    """PaginatedList처럼 순회/역순 순회/페이지 조회 시 페이지 단위로 호출을 기록"""
+
+    PER_PAGE = GITHUB_PAGE_SIZE
+
+    def __init__(self, items: List, endpoint: str, github):
+        self._items = items
+        self._endpoint = endpoint
+        self._github = github
+
+    def _pages(self, items):
+        for start in range(0, max(len(items), 1), self.PER_PAGE):
+            self._github.request(self._endpoint)
+            for item in items[start:start + self.PER_PAGE]:
+                yield item
+
+    def __iter__(self):
+        return self._pages(list(self._items))
+
+    @property
+    def reversed(self):
+        return self._pages(list(reversed(self._items)))
+
+    def get_page(self, page: int):
+        self._github.request(self._endpoint)
+        return list(self._items[page * self.PER_PAGE:(page + 1) * self.PER_PAGE])
+
+    @property
+    def totalCount(self):
+        self._github.request(self._endpoint)
+        return len(self._items)
+
+class FakeUser:
+    def __init__(self, login: str):
+        self.login = login
+
+class FakeIssueComment:
+    def __init__(self, github, pr_number: int, comment_id: int, body: str, login: str):
+        self._github = github
+        self.id = comment_id
+        self.body = body
+        self.user = FakeUser(login)
+        self.issue_url = f"https://api.github.com/repos/{github.repo_name}/issues/{pr_number}"
+        self.html_url = f"https://github.com/{github.repo_name}/pull/{pr_number}#issuecomment-{comment_id}"
+
+    def edit(self, body: str):
+        self._github.request('PATCH /issues/comments/:id')
+        self.body = body
+
+    def delete(self):
+        self._github.request('DELETE /issues/comments/:id')
+        self._github.delete_issue_comment(self.id)
+
+class FakeReviewComment:
+    def __init__(self, github, pr_number: int, comment_id: int, body: str, login: str,
+                 path: str, line: Optional[int], in_reply_to_id: Optional[int] = None):
+        self.id = comment_id
+        self.body = body
+        self.user = FakeUser(login)
+        self.path = path
+        self.line = line
+        self.in_reply_to_id = in_reply_to_id
+        self.pull_request_url = f"https://api.github.com/repos/{github.repo_name}/pulls/{pr_number}"
+        self.html_url = f"https://github.com/{github.repo_name}/pull/{pr_number}#discussion_r{comment_id}"
+
+class FakeFile:
+    def __init__(self, data: Dict):
+        self.filename = data['filename']
+        self.status = data.get('status', 'modified')
+        self.patch = data.get('patch')
+        self.additions = data.get('additions', sum(1 for l in (self.patch or '').split('\n') if l.startswith('+')))
+        self.deletions = data.get('deletions', sum(1 for l in (self.patch or '').split('\n') if l.startswith('-')))
+        self.changes = self.additions + self.deletions
+
+class FakePullRequest:
+    def __init__(self, github, data: Dict):
+        self._github = github
+        self.number = data['number']
+        self.title = data.get('title', '')
+        self.body = data.get('body', '')
+        self.state = data.get('state', 'open')
+        self.updated_at = datetime.fromisoformat(data.get('updated_at', '2024-01-01T00:00:00'))
+        self.head = SimpleNamespace(sha=data.get('head_sha', '0' * 40))
+        self.html_url = f"https://github.com/{github.repo_name}/pull/{self.number}"
+        self._files = [FakeFile(f) for f in data.get('files', [])]
+        self._reviews = []
+        self.issue_comments = [
+            FakeIssueComment(github, self.number, c['id'], c['body'], c.get('user', 'github-actions[bot]'))
+            for c in data.get('issue_comments', [])
+        ]
+        self.review_comments = [
+            FakeReviewComment(github, self.number, c['id'], c['body'], c.get('user', 'github-actions[bot]'),
+                              c['path'], c.get('line'), c.get('in_reply_to_id'))
+            for c in data.get('review_comments', [])
+        ]
+
+    def get_files(self):
+        return FakePaginatedList(self._files, 'GET /pulls/:n/files', self._github)
+
+    def get_reviews(self):
+        return FakePaginatedList(self._reviews, 'GET /pulls/:n/reviews', self._github)
+
+    def create_review(self, body: str = "", event: str = "COMMENT", comments: List[Dict] = None):
+        self._github.request('POST /pulls/:n/reviews')
+        valid_positions = {f.filename: len((f.patch or '').split('\n')) for f in self._files}
+        for comment in comments or []:
+            # 실제 API처럼 diff 밖 position이면 리뷰 전체가 422로 실패
+            if not 0 < comment.get('position', 0) < valid_positions.get(comment.get('path'), 0):
+                raise FakeGithubException(422, f"position 오류: {comment.get('path')}:{comment.get('position')}")
+        for comment in comments or []:
+            self.review_comments.append(FakeReviewComment(
+                self._github, self.number, self._github.next_id(), comment['body'],
+                'github-actions[bot]', comment['path'], None
+            ))
+        review = SimpleNamespace(
+            id=self._github.next_id(), body=body,
+            html_url=f"{self.html_url}#pullrequestreview-{len(self._reviews) + 1}"
+        )
+        self._reviews.append(review)
+        return review
+
+    def get_issue_comments(self):
+        return FakePaginatedList(self.issue_comments, 'GET /issues/:n/comments', self._github)
+
+    def create_issue_comment(self, body: str):
+        self._github.request('POST /issues/:n/comments')
+        comment = FakeIssueComment(self._github, self.number, self._github.next_id(), body, 'github-actions[bot]')
+        self.issue_comments.append(comment)
+        return comment
+
+    def get_issue_comment(self, comment_id: int):
+        self._github.request('GET /issues/comments/:id')
+        for comment in self.issue_comments:
+            if comment.id == comment_id:
+                return comment
+        raise FakeGithubException(404, "Not Found")
+
+    def get_review_comments(self):
+        return FakePaginatedList(self.review_comments, 'GET /pulls/:n/comments', self._github)
+
+    def get_review_comment(self, comment_id: int):
+        self._github.request('GET /pulls/comments/:id')
+        for comment in self.review_comments:
+            if comment.id == comment_id:
+                return comment
+        raise FakeGithubException(404, "Not Found")
+
+    def create_review_comment_reply(self, comment_id: int, body: str):
+        self._github.request('POST /pulls/:n/comments/:id/replies')
+        parent = next((c for c in self.review_comments if c.id == comment_id), None)
+        if parent is None:
+            raise FakeGithubException(404, "Not Found")
+        reply = FakeReviewComment(self._github, self.number, self._github.next_id(), body,
+                                  'github-actions[bot]', parent.path, parent.line, comment_id)
+        self.review_comments.append(reply)
+        return reply
+
+class FakeRepository:
+    def __init__(self, github, fixture: Dict):
+        self._github = github
+        self.full_name = github.repo_name
+        # head 커밋의 파일 내용: PR 변경 파일 + 설정 파일 등 추가 파일
+        self._contents = dict(fixture.get('contents', {}))
+        for file_data in fixture['pull'].get('files', []):
+            if file_data.get('content') is not None:
+                self._contents[file_data['filename']] = file_data['content']
+        self._pulls = {fixture['pull']['number']: FakePullRequest(github, fixture['pull'])}
+        for data in fixture.get('other_pulls', []):
+            self._pulls[data['number']] = FakePullRequest(github, data)
+
+    def get_pull(self, number: int):
+        self._github.request('GET /pulls/:n')
+        if number not in self._pulls:
+            raise FakeGithubException(404, "Not Found")
+        return self._pulls[number]
+
+    def get_pulls(self, state: str = 'open', sort: str = 'created', direction: str = 'desc'):
+        pulls = [pr for pr in self._pulls.values() if state == 'all' or pr.state == state]
+        if sort == 'updated':
+            pulls.sort(key=lambda pr: pr.updated_at, reverse=(direction == 'desc'))
+        return FakePaginatedList(pulls, 'GET /pulls', self._github)
+
+    def get_contents(self, path: str, ref: str = None):
+        self._github.request('GET /contents/:path')
+        if path not in self._contents:
+            raise FakeGithubException(404, "Not Found")
+        return SimpleNamespace(path=path, decoded_content=self._contents[path].encode('utf-8'))
+
+    def compare(self, base: str, head: str):
+        self._github.request('GET /compare/:base...:head')
+        # 합성 PR에는 커밋 이력이 없으므로 PR 전체 변경을 증분 변경으로 돌려줌
+        pr = next(iter(self._pulls.values()))
+        return SimpleNamespace(status='ahead', files=list(pr._files))
+
+    def _find_comment(self, comment_id: int, review: bool):
+        for pr in self._pulls.values():
+            for comment in (pr.review_comments if review else pr.issue_comments):
+                if comment.id == comment_id:
+                    return comment
+        raise FakeGithubException(404, "Not Found")
+
+    def get_pulls_comment(self, comment_id: int):
+        self._github.request('GET /pulls/comments/:id')
+        return self._find_comment(comment_id, review=True)
+
+    def get_issue_comment(self, comment_id: int):
+        self._github.request('GET /issues/comments/:id')
+        return self._find_comment(comment_id, review=False)
+
+class FakeGithub:
+    """픽스처(JSON) 기반 GitHub 대역 - 모든 요청을 CallLog에 기록하고 지연을 흉내냄"""
+
+    def __init__(self, fixture: Dict, log: CallLog, latency: Latency):
+        self.repo_name = fixture['repo']
+        self.log = log
+        self.latency = latency
+        self._id_lock = threading.Lock()
+        self._last_id = max(
+            [c['id'] for c in fixture['pull'].get('issue_comments', []) + fixture['pull'].get('review_comments', [])]
+            + [1000]
+        )
+        self._repo = FakeRepository(self, fixture)
+
+    def request(self, endpoint: str):
+        self.log.record(endpoint)
+        self.latency.wait()
+
+    def next_id(self) -> int:
+        with self._id_lock:
+            self._last_id += 1
+            return self._last_id
+
+    def get_repo(self, name: str):
+        self.request('GET /repos/:repo')
+        return self._repo
+
+    def delete_issue_comment(self, comment_id: int):
+        for pr in self._repo._pulls.values():
+            pr.issue_comments = [c for c in pr.issue_comments if c.id != comment_id]
+
+class FakeOpenAI:
+    """결정적인 응답을 돌려주는 OpenAI 대역 (토큰 수 추정, 프롬프트 캐시 적중 흉내)"""
+
+    # OpenAI 프롬프트 캐시는 1024토큰 이상 프롬프트의 앞부분을 128토큰 단위로 재사용
+    CACHE_MIN_TOKENS = CACHE_MIN_TOKENS
+    CACHE_BLOCK_TOKENS = 128
+    TARGET_LINE = re.compile(r'^>>>\s*(\d+):', re.MULTILINE)
+
+    def __init__(self, log: CallLog, latency: Latency):
+        self.log = log
+        self.latency = latency
+        self._seen_prefixes = set()
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, model: str, messages: List[Dict], max_tokens: int = 1000, temperature: float = 0.0,
+               response_format: Dict = None, **kwargs):
+        self.log.record('POST /chat/completions')
+        prompt_tokens = sum(estimate_tokens(m['content']) for m in messages)
+        cached_tokens = self._cached_tokens(messages)
+
+        if response_format is not None:
+            content = json.dumps({'findings': self._findings(messages)}, ensure_ascii=False)
+        else:
+            content = self._markdown(messages, max_tokens)
+
+        completion_tokens = min(estimate_tokens(content), max_tokens)
+        self.latency.wait(completion_tokens)
+
+        usage = SimpleNamespace(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            total_tokens=prompt_tokens + completion_tokens,
+            prompt_tokens_details=SimpleNamespace(cached_tokens=cached_tokens)
+        )
+        self.log.add_usage(usage)
+        message = SimpleNamespace(role='assistant', content=content, refusal=None)
+        return SimpleNamespace(
+            model=model,
+            choices=[SimpleNamespace(index=0, message=message, finish_reason='stop')],
+            usage=usage
+        )
+
+    def _cached_tokens(self, messages: List[Dict]) -> int:
+        prefix = messages[0]['content'] if messages and messages[0]['role'] == 'system' else ''
+        prefix_tokens = estimate_tokens(prefix)
+        if prefix_tokens < self.CACHE_MIN_TOKENS:
+            return 0
+        with self._lock:
+            if prefix in self._seen_prefixes:
+                return prefix_tokens // self.CACHE_BLOCK_TOKENS * self.CACHE_BLOCK_TOKENS
+            self._seen_prefixes.add(prefix)
+            return 0
+
+    def _findings(self, messages: List[Dict]) -> List[Dict]:
+        """변경 청크는 첫 변경 라인에 지적 하나, 린트 윈도우는 위반 없음"""
+        user_content = messages[-1]['content']
+        match = self.TARGET_LINE.search(user_content)
+        if not match:
+            return []
+        return [{
+            'line': int(match.group(1)),
+            'priority': 'P3',
+            'category': '로직',
+            'message': '오프라인 실행용 합성 지적',
+            'suggestion': '합성 제안'
+        }]
+
+    def _markdown(self, messages: List[Dict], max_tokens: int) -> str:
+        digest = hashlib.sha1(messages[-1]['content'].encode('utf-8')).hexdigest()[:8]
+        body = "## 📝 Walkthrough\n\n오프라인 합성 응답입니다. ({digest})\n\n".format(digest=digest)
+        # 실제 응답 길이와 비슷하도록 max_tokens의 절반 정도를 채움
+        filler = "- 합성 검토 항목\n"
+        repeat = max(1, (max_tokens // 2) // max(estimate_tokens(filler), 1))
+        return body + filler * repeat
+
+def _to_namespace(value):
+    if isinstance(value, dict):
+        return SimpleNamespace(**{k: _to_namespace(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return [_to_namespace(v) for v in value]
+    return value
+
+def _to_plain(value):
+    if hasattr(value, 'model_dump'):
+        return value.model_dump()
+    if isinstance(value, SimpleNamespace):
+        return {k: _to_plain(v) for k, v in vars(value).items()}
+    if isinstance(value, list):
+        return [_to_plain(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _to_plain(v) for k, v in value.items()}
+    return value
+
+class CassetteOpenAI:
+    """OpenAI 요청/응답 녹화(record) 및 재생(replay) - 요청 인자 해시로 응답을 찾음"""
+
+    def __init__(self, path: str, mode: str, log: CallLog, latency: Latency, inner=None):
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"알 수 없는 cassette 모드: {mode}")
+        if mode == 'record' and inner is None:
+            raise ValueError("record 모드에는 실제 OpenAI 클라이언트가 필요합니다")
+        self.path = path
+        self.mode = mode
+        self.log = log
+        self.latency = latency
+        self.inner = inner
+        self._lock = threading.Lock()
+        self.entries: Dict[str, Dict] = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self.entries = json.load(f)
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    @staticmethod
+    def request_key(kwargs: Dict) -> str:
+        payload = json.dumps(kwargs, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def create(self, **kwargs):
+        self.log.record('POST /chat/completions')
+        key = self.request_key(kwargs)
+
+        if self.mode == 'replay':
+            if key not in self.entries:
+                raise KeyError(f"cassette에 없는 요청: {key[:12]}")
+            response = _to_namespace(self.entries[key])
+            self.latency.wait(getattr(response.usage, 'completion_tokens', 0) if response.usage else 0)
+        else:
+            response = self.inner.chat.completions.create(**kwargs)
+            with self._lock:
+                self.entries[key] = _to_plain(response)
+
+        self.log.add_usage(getattr(response, 'usage', None))
+        return response
+
+    def save(self):
+        if self.mode != 'record':
+            return
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with self._lock:
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f, ensure_ascii=False, indent=1)
+
+# 합성 PR 생성기 ------------------------------------------------------------
+
+_LANGUAGES = [
+    ('kt', "    val value{i} = compute({i}) + offset"),
+    ('swift', "    let value{i} = compute({i}) + offset"),
+    ('js', "  const value{i} = compute({i}) + offset;"),
+]
+
+def synthetic_pr(file_count: int, hunk: str = 'small', seed: int = 0) -> Dict:
+    """file_count개 파일을 바꾸는 합성 PR 픽스처 (small: 60줄 파일의 3줄 수정, huge: 400줄 신규 파일)"""
+    rng = random.Random(seed)
+    files = []
+    for index in range(file_count):
+        extension, template = _LANGUAGES[index % len(_LANGUAGES)]
+        path = f"app/src/module{index // 20}/File{index}.{extension}"
+
+        if hunk == 'huge':
+            lines = [template.format(i=i) for i in range(400)]
+            patch = f"@@ -0,0 +1,{len(lines)} @@\n" + '\n'.join('+' + line for line in lines)
+            files.append({'filename': path, 'status': 'added', 'patch': patch, 'content': '\n'.join(lines)})
+            continue
+
+        lines = [template.format(i=i) for i in range(60)]
+        start = rng.randint(10, 50)
+        old_lines = lines[start:start + 3]
+        new_lines = [line.replace('offset', 'offset * 2') for line in old_lines]
+        lines[start:start + 3] = new_lines
+        context_before = lines[start - 3:start]
+        context_after = lines[start + 3:start + 6]
+        patch = (
+            f"@@ -{start - 2},9 +{start - 2},9 @@\n"
+            + '\n'.join(' ' + l for l in context_before) + '\n'
+            + '\n'.join('-' + l for l in old_lines) + '\n'
+            + '\n'.join('+' + l for l in new_lines) + '\n'
+            + '\n'.join(' ' + l for l in context_after)
+        )
+        files.append({'filename': path, 'status': 'modified', 'patch': patch, 'content': '\n'.join(lines)})
+
+    base_time = datetime(2024, 1, 1)
+    other_pulls = [
+        {
+            'number': number,
+            'title': f"module{number % 5} compute offset 개선",
+            'body': "compute offset 처리 변경",
+            'state': 'closed',
+            'updated_at': (base_time + timedelta(hours=number)).isoformat()
+        }
+        for number in range(1, 40)
+    ]
+
+    ai_comment_id, user_comment_id = 5001, 5002
+    first_file = files[0]['filename'] if files else 'app/src/File0.kt'
+    return {
+        'repo': 'offline/synthetic',
+        'pull': {
+            'number': 100,
+            'title': f"compute offset 로직 변경 ({file_count}개 파일, {hunk})",
+            'body': "합성 벤치마크 PR입니다.",
+            'head_sha': hashlib.sha1(f"{file_count}-{hunk}-{seed}".encode()).hexdigest(),
+            'updated_at': (base_time + timedelta(days=30)).isoformat(),
+            'files': files,
+            'review_comments': [
+                {'id': ai_comment_id, 'path': first_file, 'line': 12,
+                 'body': with_marker("🔵 **[P3] AI 분석**\n\n**로직**: 합성 지적입니다.\n", 'line', file=first_file, line=12)},
+                {'id': user_comment_id, 'path': first_file, 'line': 12, 'user': 'developer',
+                 'in_reply_to_id': ai_comment_id, 'body': "이 부분은 왜 문제가 되나요? 어떻게 고치면 좋을까요?"}
+            ]
+        },
+        'other_pulls': other_pulls,
+        'contents': {'build.gradle.kts': 'plugins { kotlin("android") }\n'},
+        'comment': {'id': user_comment_id, 'in_reply_to_id': ai_comment_id,
+                    'body': "이 부분은 왜 문제가 되나요? 어떻게 고치면 좋을까요?", 'user': 'developer'}
+    }
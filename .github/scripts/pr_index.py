@@ -0,0 +1,91 @@
+# .github/scripts/pr_index.py
+import os
+import sqlite3
+from datetime import datetime
+from itertools import islice
+from typing import Callable, Dict, List, Optional, Set
+from rate_limit import scan_github
+
+class PRIndex:
+    """저장소 PR 제목/본문의 로컬 인덱스 (updated_at 기준으로 증분 갱신)"""
+
+    # 인덱스가 비어 있을 때 처음 가져올 최대 PR 수 (증분 갱신은 워터마크에 닿을 때까지 가져옴)
+    INITIAL_SYNC_LIMIT = 300
+
+    def __init__(self, path: str = None):
+        if path is None:
+            cache_dir = os.environ.get('AI_CACHE_DIR', '.ai-review-cache')
+            path = os.path.join(cache_dir, 'pr_index.sqlite3')
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS prs ("
+            "number INTEGER PRIMARY KEY, title TEXT NOT NULL, state TEXT NOT NULL, "
+            "keywords TEXT NOT NULL, updated_at TEXT NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_prs_updated_at ON prs(updated_at)")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self.conn.commit()
+
+    def get_watermark(self) -> Optional[datetime]:
+        """마지막으로 인덱싱한 PR의 updated_at"""
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'synced_until'").fetchone()
+        return datetime.fromisoformat(row[0]) if row else None
+
+    def sync(self, repo, extract_keywords: Callable[[str], Set[str]]) -> int:
+        """최근 갱신된 PR부터 워터마크에 닿을 때까지만 가져와 인덱스 갱신 (추가/갱신 수 반환)"""
+        watermark = self.get_watermark()
+        # 증분 갱신에 상한을 두면 상한 밖의 PR을 건너뛴 채 워터마크가 넘어가므로, 워터마크 이후 갱신분은 모두 가져옴
+        # (캐시는 일정 기간 쓰이지 않으면 만료되므로 가져올 양은 그 기간의 PR 갱신 수 정도)
+        limit = None if watermark else self.INITIAL_SYNC_LIMIT
+
+        # 워터마크에서 멈추도록 페이지 단위로 지연 순회하고, 첫 동기화는 islice로 상한을 둠
+        pulls = scan_github(repo.get_pulls, state='all', sort='updated', direction='desc')
+        newest = watermark
+        updated = 0
+
+        for pr in islice(pulls, limit):
+            updated_at = pr.updated_at
+            if watermark and updated_at <= watermark:
+                break
+
+            keywords = extract_keywords(pr.title + " " + (pr.body or ""))
+            self.conn.execute(
+                "INSERT OR REPLACE INTO prs (number, title, state, keywords, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (pr.number, pr.title, pr.state, ' '.join(sorted(keywords)), updated_at.isoformat())
+            )
+            updated += 1
+            if newest is None or updated_at > newest:
+                newest = updated_at
+
+        if newest is not None:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('synced_until', ?)",
+                (newest.isoformat(),)
+            )
+        self.conn.commit()
+        return updated
+
+    def search(self, keywords: Set[str], exclude_number: int, min_common: int = 2, limit: int = 3) -> List[Dict]:
+        """공통 키워드가 min_common개 이상인 PR을 최근 갱신 순으로 조회"""
+        related = []
+        rows = self.conn.execute(
+            "SELECT number, title, state, keywords FROM prs WHERE number != ? ORDER BY updated_at DESC",
+            (exclude_number,)
+        )
+        for number, title, state, pr_keywords in rows:
+            common_keywords = keywords.intersection(pr_keywords.split())
+            if len(common_keywords) >= min_common:
+                related.append({
+                    'number': number,
+                    'title': title,
+                    'state': state,
+                    'common_keywords': sorted(common_keywords)
+                })
+                if len(related) >= limit:
+                    break
+        return related
+
+    def close(self):
+        self.conn.close()
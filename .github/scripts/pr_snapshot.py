@@ -0,0 +1,67 @@
+# .github/scripts/pr_snapshot.py
+import re
+from typing import Dict, List, Optional
+from rate_limit import fetch_all
+
+class PatchLineMap:
+    """diff patch 파싱 결과 (추가된 라인 목록과 파일 라인 → diff position 매핑)"""
+
+    def __init__(self, patch: str):
+        self.changed_lines: List[int] = []  # '+' 라인의 실제 파일 라인 번호
+        self.positions: Dict[int, int] = {}  # {실제_파일_라인: diff_position} ('+'와 컨텍스트 라인)
+
+        if not patch:
+            return
+
+        current_file_line = 0
+        diff_position = 0
+
+        for line in patch.split('\n'):
+            if line.startswith('@@'):
+                # @@ -old_start,old_count +new_start,new_count @@ 형식 파싱
+                match = re.search(r'\+(\d+)', line)
+                if match:
+                    current_file_line = int(match.group(1)) - 1
+            elif line.startswith('+'):
+                # 추가된 라인
+                current_file_line += 1
+                self.changed_lines.append(current_file_line)
+                self.positions[current_file_line] = diff_position
+            elif line.startswith(' '):
+                # 변경되지 않은 라인 (컨텍스트)
+                current_file_line += 1
+                self.positions[current_file_line] = diff_position
+            # '-'로 시작하는 라인은 삭제된 라인이므로 current_file_line 증가하지 않음
+
+            diff_position += 1
+
+class PRSnapshot:
+    """한 번의 실행 동안 공유하는 PR 파일 목록 스냅샷 (파일 목록은 실행당 한 번만 조회)"""
+
+    def __init__(self, pr):
+        self.pr = pr
+        self.head_sha = pr.head.sha
+
+        # PR의 변경 파일 목록을 한 번만 가져와 파일명 인덱스 구성
+        self.files = fetch_all(pr.get_files)
+        self.files_by_name = {file.filename: file for file in self.files}
+
+        # 파일명 → 파싱된 patch (지연 생성 후 재사용)
+        self._line_maps: Dict[str, PatchLineMap] = {}
+
+    def get_file(self, filename: str):
+        """파일명으로 PR 파일 조회 (없으면 None)"""
+        return self.files_by_name.get(filename)
+
+    def get_patch(self, filename: str) -> str:
+        """파일의 diff patch (없으면 빈 문자열)"""
+        file = self.get_file(filename)
+        return (file.patch or "") if file else ""
+
+    def get_line_map(self, filename: str, patch: Optional[str] = None) -> PatchLineMap:
+        """파일의 파싱된 patch 반환 (파일당 한 번만 파싱)"""
+        if filename not in self._line_maps:
+            if patch is None:
+                patch = self.get_patch(filename)
+            self._line_maps[filename] = PatchLineMap(patch)
+        return self._line_maps[filename]
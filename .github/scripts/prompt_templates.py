@@ -0,0 +1,87 @@
+# .github/scripts/prompt_templates.py
+import threading
+from typing import Dict, List, Optional
+from token_budget import estimate_tokens
+
+# OpenAI 프롬프트 캐시는 요청 앞부분이 1024토큰 이상일 때만 적용됨
+CACHE_MIN_TOKENS = 1024
+
+class PromptUsageStats:
+    """템플릿별 토큰 사용량과 프롬프트 캐시 적중 토큰 집계"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.by_template: Dict[str, Dict[str, int]] = {}
+        self.prefix_tokens: Dict[str, int] = {}  # 템플릿별 가장 긴 정적 접두부 토큰 수
+
+    def record(self, template_name: str, response):
+        """API 응답의 usage(프롬프트/완성/캐시 토큰)를 기록"""
+        usage = getattr(response, 'usage', None)
+        if usage is None:
+            return
+
+        details = getattr(usage, 'prompt_tokens_details', None)
+        cached_tokens = (getattr(details, 'cached_tokens', 0) or 0) if details else 0
+
+        with self._lock:
+            stats = self.by_template.setdefault(
+                template_name,
+                {'calls': 0, 'prompt_tokens': 0, 'cached_tokens': 0, 'completion_tokens': 0}
+            )
+            stats['calls'] += 1
+            stats['prompt_tokens'] += getattr(usage, 'prompt_tokens', 0) or 0
+            stats['cached_tokens'] += cached_tokens
+            stats['completion_tokens'] += getattr(usage, 'completion_tokens', 0) or 0
+
+    def record_prefix(self, template_name: str, tokens: int):
+        """정적 접두부 길이 기록 (캐시 최소 길이에 못 미치는 템플릿을 요약에 표시하기 위해)"""
+        with self._lock:
+            self.prefix_tokens[template_name] = max(tokens, self.prefix_tokens.get(template_name, 0))
+
+    def print_summary(self):
+        """템플릿별 사용량과 프롬프트 캐시 적중률 출력"""
+        if not self.by_template:
+            return
+        print("📈 프롬프트 토큰 사용량:")
+        for name, stats in sorted(self.by_template.items()):
+            hit_rate = stats['cached_tokens'] / stats['prompt_tokens'] * 100 if stats['prompt_tokens'] else 0
+            prefix_tokens = self.prefix_tokens.get(name)
+            prefix_note = ""
+            if prefix_tokens is not None and prefix_tokens < CACHE_MIN_TOKENS:
+                prefix_note = f", 접두부 약 {prefix_tokens}토큰 < {CACHE_MIN_TOKENS}토큰이라 캐시 대상 아님"
+            print(f"  - {name}: {stats['calls']}회, 입력 {stats['prompt_tokens']} "
+                  f"(캐시 {stats['cached_tokens']}, {hit_rate:.0f}%), 출력 {stats['completion_tokens']}{prefix_note}")
+
+# 프로세스 전체가 공유하는 사용량 집계
+PROMPT_USAGE = PromptUsageStats()
+
+# OpenAI 프롬프트 캐시는 요청 앞부분이 같을 때만 적중하므로, 지침과 응답 형식처럼
+# 변하지 않는 내용은 모두 접두부에 두고 파일 경로·라인·코드는 접미부에만 둔다.
+# 단, 캐시는 접두부가 CACHE_MIN_TOKENS 이상일 때만 적용된다. 현재 기본 프롬프트의 접두부는
+# 약 240~660토큰이라 린터 설정 파일이 큰 린트 요청 외에는 캐시가 적용되지 않는다.
+# 캐시 토큰도 절반 가격으로 과금되므로 최소 길이를 맞추려고 접두부를 늘리면 오히려 비용이 커져서
+# 일부러 늘리지 않는다. 실제 접두부 길이는 실행 끝의 사용량 요약에 함께 표시된다.
+class PromptTemplate:
+    """정적 접두부(system)와 가변 접미부(user)로 나뉜 프롬프트 템플릿"""
+
+    def __init__(self, name: str, static_prefix: str, variable_suffix: str):
+        self.name = name
+        self.static_prefix = static_prefix
+        self.variable_suffix = variable_suffix
+        self._last_prefix = None
+
+    def build_messages(self, static: Optional[Dict] = None, **variables) -> List[Dict[str, str]]:
+        """static 값(언어, 린터 설정 등 실행 중 고정)은 접두부에, 나머지는 접미부에 채워 메시지 생성"""
+        prefix = self.static_prefix.format(**(static or {})).strip()
+        if prefix != self._last_prefix:
+            # 접두부는 실행 중 거의 바뀌지 않으므로 바뀔 때만 길이 계산
+            self._last_prefix = prefix
+            PROMPT_USAGE.record_prefix(self.name, estimate_tokens(prefix))
+        return [
+            {"role": "system", "content": prefix},
+            {"role": "user", "content": self.variable_suffix.format(**variables).strip()}
+        ]
+
+    def record_usage(self, response):
+        """응답의 토큰 사용량(캐시 적중 토큰 포함) 기록"""
+        PROMPT_USAGE.record(self.name, response)
@@ -0,0 +1,308 @@
+# .github/scripts/rate_limit.py
+import os
+import random
+import threading
+import time
+from itertools import islice
+from typing import Callable, Dict, Optional
+from run_report import RUN_REPORT
+
+class CircuitOpenError(Exception):
+    """연속 실패로 차단기가 열려 호출을 즉시 거부함"""
+
+class TokenBucket:
+    """초당 rate개씩 채워지고 최대 capacity개까지 쌓이는 토큰 버킷"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """토큰 하나를 얻을 때까지 대기"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+class CircuitBreaker:
+    """재시도 후에도 실패한 호출이 연속으로 임계치를 넘으면 일정 시간 호출을 차단"""
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._lock = threading.Lock()
+
+    def check(self, name: str):
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                raise CircuitOpenError(f"{name} 호출 차단 중 (연속 {self._failures}회 실패)")
+            # 대기 시간이 지나면 반열림 상태로 한 번 시도하고, 다시 실패하면 곧바로 열림
+            self._opened_at = None
+            self._failures = self.failure_threshold - 1
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+
+    def record_failure(self, name: str):
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.failure_threshold and self._opened_at is None:
+                self._opened_at = time.monotonic()
+                print(f"🚫 {name} 연속 {self._failures}회 실패, {self.reset_timeout:.0f}초간 호출 차단")
+
+class Upstream:
+    """업스트림(OpenAI, GitHub)별 호출 스케줄러: 토큰 버킷, 재시도/백오프, 남은 할당량 반영, 차단기"""
+
+    # 재시도할 HTTP 상태 코드 (403은 rate limit 메시지일 때만 재시도)
+    RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+    # 재시도할 연결 오류 예외 이름 (SDK를 직접 import하지 않고 이름으로 판별)
+    RETRYABLE_ERRORS = {'APIConnectionError', 'APITimeoutError', 'ConnectionError', 'Timeout', 'ReadTimeout'}
+    # 백오프 최대 대기 시간 (초)
+    MAX_BACKOFF = 60.0
+
+    def __init__(self, name: str, rate: float, burst: int, max_retries: int = 4,
+                 base_delay: float = 1.0, failure_threshold: int = 3, reset_timeout: float = 60.0):
+        self.name = name
+        self.bucket = TokenBucket(rate, burst)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.quota_probe: Optional[Callable[[], tuple]] = None
+        self.low_quota = 0
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        self.stats = {'calls': 0, 'retries': 0, 'failures': 0}
+
+    def call(self, fn: Callable, *args, **kwargs):
+        """fn(*args, **kwargs)를 속도 제한과 재시도 정책에 따라 실행 (최종 실패 시 마지막 예외 발생)"""
+        return self.call_named(getattr(fn, '__name__', 'call'), fn, *args, **kwargs)
+
+    def call_named(self, endpoint: str, fn: Callable, *args, **kwargs):
+        """call과 같지만 실행 보고서에 기록할 엔드포인트 이름을 직접 지정"""
+        return self._run(endpoint, self.is_retryable, fn, args, kwargs)
+
+    def call_write(self, endpoint: str, fn: Callable, *args, **kwargs):
+        """생성 요청(리뷰/코멘트 등록 등) 실행 - 요청이 처리되지 않았음이 확실한 rate limit 응답에만 재시도
+        (5xx나 시간 초과는 서버에서 이미 생성됐을 수 있어 재시도하면 중복 게시됨)"""
+        return self._run(endpoint, self.is_rejected, fn, args, kwargs)
+
+    def _run(self, endpoint: str, retryable: Callable[[Exception], bool], fn: Callable, args, kwargs):
+        endpoint = f"{self.name}.{endpoint}"
+        started = time.perf_counter()
+        attempt = 0
+        while True:
+            self.breaker.check(self.name)
+            self._wait_for_pause()
+            self.bucket.acquire()
+            with self._lock:
+                self.stats['calls'] += 1
+
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                if not retryable(e):
+                    RUN_REPORT.record_call(endpoint, time.perf_counter() - started, attempt, error=True)
+                    raise
+                if attempt >= self.max_retries:
+                    # 재시도까지 모두 실패한 호출만 차단기에 반영 (일시적인 429로 차단되지 않도록)
+                    self.breaker.record_failure(self.name)
+                    with self._lock:
+                        self.stats['failures'] += 1
+                    RUN_REPORT.record_call(endpoint, time.perf_counter() - started, attempt, error=True)
+                    raise
+                delay = self.retry_delay(e, attempt)
+                attempt += 1
+                with self._lock:
+                    self.stats['retries'] += 1
+                print(f"⏳ {self.name} 일시 오류, {delay:.1f}초 후 재시도 ({attempt}/{self.max_retries}): {e}")
+                # 같은 업스트림의 다른 호출도 함께 쉬어야 재시도 폭주를 막을 수 있음
+                self.pause(delay)
+                continue
+
+            self.breaker.record_success()
+            self.observe_quota()
+            RUN_REPORT.record_call(endpoint, time.perf_counter() - started, attempt, result=result)
+            return result
+
+    def is_retryable(self, error: Exception) -> bool:
+        """일시적인 오류(429, 5xx, 2차 rate limit, 연결 오류)인지 판별"""
+        status = self.status_of(error)
+        if status in self.RETRYABLE_STATUS:
+            return True
+        if status == 403:
+            return 'rate limit' in str(error).lower()
+        return status is None and type(error).__name__ in self.RETRYABLE_ERRORS
+
+    def is_rejected(self, error: Exception) -> bool:
+        """처리되지 않고 거부된 요청인지 (429, 2차 rate limit 403)"""
+        status = self.status_of(error)
+        if status == 429:
+            return True
+        return status == 403 and 'rate limit' in str(error).lower()
+
+    def retry_delay(self, error: Exception, attempt: int) -> float:
+        """Retry-After(또는 rate limit 초기화 시각)가 있으면 따르고, 없으면 지수 백오프 + full jitter"""
+        headers = self.headers_of(error)
+        retry_after = headers.get('retry-after-ms')
+        if retry_after is not None:
+            try:
+                return min(self.MAX_BACKOFF, float(retry_after) / 1000)
+            except ValueError:
+                pass
+        retry_after = headers.get('retry-after')
+        if retry_after is not None:
+            try:
+                return min(self.MAX_BACKOFF, float(retry_after))
+            except ValueError:
+                pass
+        if headers.get('x-ratelimit-remaining') == '0' and headers.get('x-ratelimit-reset'):
+            try:
+                return min(self.MAX_BACKOFF, max(1.0, float(headers['x-ratelimit-reset']) - time.time()))
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.MAX_BACKOFF, self.base_delay * (2 ** attempt)))
+
+    def status_of(self, error: Exception) -> Optional[int]:
+        """GithubException.status 또는 openai APIStatusError.status_code"""
+        status = getattr(error, 'status', None)
+        if status is None:
+            status = getattr(error, 'status_code', None)
+        return status if isinstance(status, int) else None
+
+    def headers_of(self, error: Exception) -> Dict[str, str]:
+        """예외에 담긴 응답 헤더 (키는 소문자)"""
+        headers = getattr(error, 'headers', None)
+        if headers is None:
+            response = getattr(error, 'response', None)
+            headers = getattr(response, 'headers', None)
+        try:
+            return {str(k).lower(): str(v) for k, v in dict(headers or {}).items()}
+        except Exception:
+            return {}
+
+    def pause(self, seconds: float):
+        """지정 시간 동안 이 업스트림의 새 호출을 모두 대기시킴"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def _wait_for_pause(self):
+        while True:
+            with self._lock:
+                wait = self._paused_until - time.monotonic()
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    def watch_quota(self, probe: Callable[[], tuple], low_quota: int):
+        """probe()가 돌려주는 (남은 요청 수, 초기화 epoch)로 할당량이 바닥나기 전에 속도를 늦춤"""
+        self.quota_probe = probe
+        self.low_quota = low_quota
+
+    def observe_quota(self):
+        if self.quota_probe is None:
+            return
+        try:
+            remaining, reset_at = self.quota_probe()
+        except Exception:
+            return
+        if remaining is None or remaining < 0 or remaining > self.low_quota:
+            return
+        # 남은 요청을 초기화 시각까지 고르게 나눠 쓰도록 간격을 둠
+        delay = min(self.MAX_BACKOFF, max(0.0, (reset_at - time.time()) / max(remaining, 1)))
+        if delay > 0:
+            print(f"🐢 {self.name} 남은 요청 {remaining}회, {delay:.1f}초 간격으로 감속")
+            self.pause(delay)
+
+    def print_summary(self):
+        if self.stats['retries'] or self.stats['failures']:
+            print(f"🔁 {self.name} 호출 {self.stats['calls']}회 (재시도 {self.stats['retries']}, "
+                  f"최종 실패 {self.stats['failures']})")
+
+_UPSTREAMS: Dict[str, Upstream] = {}
+_UPSTREAMS_LOCK = threading.Lock()
+
+# 업스트림별 기본 설정 (초당 요청 수, 버스트) - 환경 변수로 조정 가능
+_DEFAULTS = {
+    'openai': ('AI_OPENAI_RPS', '5', 'AI_OPENAI_BURST', '8'),
+    'github': ('AI_GITHUB_RPS', '10', 'AI_GITHUB_BURST', '10'),
+}
+
+def get_upstream(name: str) -> Upstream:
+    """업스트림 이름별 스케줄러 (프로세스 전체에서 하나씩 공유)"""
+    with _UPSTREAMS_LOCK:
+        if name not in _UPSTREAMS:
+            rate_env, rate_default, burst_env, burst_default = _DEFAULTS.get(
+                name, ('', '5', '', '5')
+            )
+            _UPSTREAMS[name] = Upstream(
+                name,
+                rate=float(os.environ.get(rate_env, rate_default)),
+                burst=int(os.environ.get(burst_env, burst_default)),
+                max_retries=int(os.environ.get('AI_MAX_RETRIES', '4'))
+            )
+        return _UPSTREAMS[name]
+
+def call_openai(fn: Callable, *args, **kwargs):
+    """OpenAI 호출을 공유 스케줄러로 실행"""
+    return get_upstream('openai').call_named('chat.completions.create', fn, *args, **kwargs)
+
+def call_github(fn: Callable, *args, **kwargs):
+    """GitHub 호출을 공유 스케줄러로 실행 (조회/수정처럼 다시 보내도 결과가 같은 요청)"""
+    return get_upstream('github').call(fn, *args, **kwargs)
+
+def post_github(fn: Callable, *args, **kwargs):
+    """GitHub 생성 요청을 공유 스케줄러로 실행 (rate limit 거부에만 재시도)"""
+    return get_upstream('github').call_write(getattr(fn, '__name__', 'call'), fn, *args, **kwargs)
+
+# PaginatedList 한 페이지의 항목 수 (공유 GitHub 클라이언트의 per_page)
+GITHUB_PAGE_SIZE = 100
+
+def fetch_all(list_fn: Callable, *args, limit: Optional[int] = None, **kwargs) -> list:
+    """PaginatedList를 (최대 limit개까지) 한 번에 받아 목록으로 반환 - 페이지 요청 전체를 한 호출로 재시도/기록"""
+    return get_upstream('github').call_named(
+        getattr(list_fn, '__name__', 'list'),
+        lambda: list(islice(list_fn(*args, **kwargs), limit))
+    )
+
+def scan_github(list_fn: Callable, *args, **kwargs):
+    """PaginatedList를 페이지 단위로 지연 순회 - 페이지 요청마다 재시도/기록하고, 순회를 멈추면 남은 페이지는 요청하지 않음"""
+    paginated = list_fn(*args, **kwargs)
+    upstream = get_upstream('github')
+    endpoint = getattr(list_fn, '__name__', 'list')
+    page = 0
+    while True:
+        items = upstream.call_named(endpoint, paginated.get_page, page)
+        yield from items
+        if len(items) < GITHUB_PAGE_SIZE:
+            return
+        page += 1
+
+def watch_github_quota(github_client, low_quota: int = 100):
+    """PyGithub가 마지막 응답 헤더로 기록한 X-RateLimit-Remaining을 감속에 사용"""
+    def probe():
+        # Github.rate_limiting 속성은 값이 없으면 API를 호출하므로 requester에 기록된 값만 확인
+        requester = getattr(github_client, 'requester', None) or github_client._Github__requester
+        remaining, _ = requester.rate_limiting
+        if remaining < 0:
+            return None, 0
+        return remaining, requester.rate_limiting_resettime
+    get_upstream('github').watch_quota(probe, low_quota)
+
+def print_rate_limit_summary():
+    for upstream in list(_UPSTREAMS.values()):
+        upstream.print_summary()
@@ -0,0 +1,160 @@
+# .github/scripts/run_report.py
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+def _empty_metrics() -> Dict[str, float]:
+    return {
+        'calls': 0, 'errors': 0, 'retries': 0, 'seconds': 0.0, 'bytes': 0,
+        'tokens_in': 0, 'tokens_out': 0, 'cached_tokens': 0
+    }
+
+def result_metrics(result) -> Dict[str, int]:
+    """API 응답에서 바이트 수와 토큰 사용량 추출 (알 수 없으면 0)"""
+    metrics = {'bytes': 0, 'tokens_in': 0, 'tokens_out': 0, 'cached_tokens': 0}
+
+    usage = getattr(result, 'usage', None)
+    if usage is not None:
+        details = getattr(usage, 'prompt_tokens_details', None)
+        metrics['tokens_in'] = getattr(usage, 'prompt_tokens', 0) or 0
+        metrics['tokens_out'] = getattr(usage, 'completion_tokens', 0) or 0
+        metrics['cached_tokens'] = (getattr(details, 'cached_tokens', 0) or 0) if details else 0
+        choices = getattr(result, 'choices', None) or []
+        if choices:
+            metrics['bytes'] = len((getattr(choices[0].message, 'content', None) or '').encode('utf-8'))
+        return metrics
+
+    # ContentFile은 size 속성에 파일 크기를 담고 있음
+    size = getattr(result, 'size', None)
+    if isinstance(size, int):
+        metrics['bytes'] = size
+    return metrics
+
+class RunReport:
+    """실행 단계별 소요 시간과 API 호출(시간, 바이트, 토큰, 재시도), 캐시 적중을 모아 보고서로 출력"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+        self._started = time.perf_counter()
+        self.stages = []  # [{'name', 'seconds', ...지표}] 순서대로
+        self._current_stage: Optional[Dict] = None
+        self.endpoints: Dict[str, Dict[str, float]] = {}
+        self.cache = {'hits': 0, 'misses': 0}
+
+    def begin_stage(self, name: str):
+        """새 단계 시작 (이전 단계는 종료) - 이후 기록되는 호출은 이 단계에 집계"""
+        with self._lock:
+            self._close_stage_locked()
+            self._current_stage = {'name': name, '_started': time.perf_counter(), **_empty_metrics()}
+            self.stages.append(self._current_stage)
+
+    def _close_stage_locked(self):
+        if self._current_stage is not None:
+            self._current_stage['seconds'] = round(time.perf_counter() - self._current_stage.pop('_started'), 3)
+            self._current_stage = None
+
+    def record_call(self, endpoint: str, seconds: float, retries: int = 0, error: bool = False, result=None):
+        """API 호출 한 건 기록 (재시도를 포함한 전체 소요 시간)"""
+        metrics = result_metrics(result) if result is not None else {}
+        with self._lock:
+            targets = [self.endpoints.setdefault(endpoint, _empty_metrics())]
+            if self._current_stage is not None:
+                targets.append(self._current_stage)
+            for target in targets:
+                target['calls'] += 1
+                target['errors'] += 1 if error else 0
+                target['retries'] += retries
+                target['seconds'] += seconds
+                for key, value in metrics.items():
+                    target[key] += value
+
+    def add_cache_stats(self, hits: int, misses: int):
+        with self._lock:
+            self.cache['hits'] += hits
+            self.cache['misses'] += misses
+
+    def to_dict(self, script: str) -> Dict:
+        with self._lock:
+            self._close_stage_locked()
+            totals = _empty_metrics()
+            for metrics in self.endpoints.values():
+                for key in totals:
+                    totals[key] += metrics[key]
+            return {
+                'script': script,
+                'repo': os.environ.get('REPO_NAME'),
+                'pr_number': os.environ.get('PR_NUMBER'),
+                'run_id': os.environ.get('GITHUB_RUN_ID'),
+                'started_at': datetime.fromtimestamp(self.started_at, timezone.utc).isoformat(),
+                'wall_seconds': round(time.perf_counter() - self._started, 3),
+                'stages': [self._rounded(stage) for stage in self.stages],
+                'endpoints': {name: self._rounded(m) for name, m in sorted(self.endpoints.items())},
+                'totals': self._rounded(totals),
+                'cache': dict(self.cache),
+            }
+
+    @staticmethod
+    def _rounded(metrics: Dict) -> Dict:
+        return {k: round(v, 3) if isinstance(v, float) else v for k, v in metrics.items()}
+
+    def write(self, script: str):
+        """JSON 보고서 저장 및 GitHub step summary에 표 추가 (실패해도 실행 결과에는 영향 없음)"""
+        report = self.to_dict(script)
+
+        try:
+            report_dir = os.environ.get('AI_RUN_REPORT_DIR', '.ai-review-reports')
+            os.makedirs(report_dir, exist_ok=True)
+            report_path = os.path.join(report_dir, f"{script}.json")
+            with open(report_path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            print(f"🧾 실행 보고서 저장: {report_path}")
+        except Exception as e:
+            print(f"⚠️ 실행 보고서 저장 실패: {e}")
+
+        summary_path = os.environ.get('GITHUB_STEP_SUMMARY')
+        if summary_path:
+            try:
+                with open(summary_path, 'a', encoding='utf-8') as f:
+                    f.write(self.format_summary(report) + '\n')
+            except Exception as e:
+                print(f"⚠️ step summary 작성 실패: {e}")
+
+        return report
+
+    @staticmethod
+    def format_summary(report: Dict) -> str:
+        """step summary용 마크다운 표"""
+        totals = report['totals']
+        lines = [
+            f"### 🧾 {report['script']} 실행 보고서 (PR #{report['pr_number']})",
+            "",
+            f"총 {report['wall_seconds']:.1f}초 · API {totals['calls']}회 (재시도 {totals['retries']}, 실패 {totals['errors']}) · "
+            f"토큰 입력 {totals['tokens_in']} (캐시 {totals['cached_tokens']}) / 출력 {totals['tokens_out']} · "
+            f"분석 캐시 적중 {report['cache']['hits']} / 미적중 {report['cache']['misses']}",
+            "",
+            "| 단계 | 시간(s) | 호출 | 재시도 | 입력 토큰 | 출력 토큰 |",
+            "|------|--------|------|--------|----------|----------|",
+        ]
+        for stage in report['stages']:
+            lines.append(
+                f"| {stage['name']} | {stage['seconds']:.2f} | {stage['calls']} | {stage['retries']} | "
+                f"{stage['tokens_in']} | {stage['tokens_out']} |"
+            )
+        lines += [
+            "",
+            "| 엔드포인트 | 호출 | 누적 시간(s) | 바이트 | 재시도 | 실패 | 입력 토큰 | 출력 토큰 |",
+            "|-----------|------|-------------|--------|--------|------|----------|----------|",
+        ]
+        for name, metrics in report['endpoints'].items():
+            lines.append(
+                f"| {name} | {metrics['calls']} | {metrics['seconds']:.2f} | {metrics['bytes']} | {metrics['retries']} | "
+                f"{metrics['errors']} | {metrics['tokens_in']} | {metrics['tokens_out']} |"
+            )
+        return '\n'.join(lines)
+
+# 프로세스 전체가 공유하는 실행 보고서
+RUN_REPORT = RunReport()
@@ -0,0 +1,53 @@
+# .github/scripts/runtime.py
+import os
+import threading
+from rate_limit import GITHUB_PAGE_SIZE, watch_github_quota
+
+class LazyClient:
+    """처음 속성에 접근할 때 실제 클라이언트를 만드는 대리 객체 (SDK import도 그때 수행)"""
+
+    def __init__(self, name: str, factory):
+        self._name = name
+        self._factory = factory
+        self._client = None
+        self._lock = threading.Lock()
+
+    def resolve(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = self._factory()
+        return self._client
+
+    def __getattr__(self, attribute):
+        return getattr(self.resolve(), attribute)
+
+    def __repr__(self):
+        state = 'ready' if self._client is not None else 'lazy'
+        return f"<LazyClient {self._name} ({state})>"
+
+def _create_openai_client():
+    import openai
+    # 재시도는 공유 스케줄러(rate_limit)가 담당하므로 SDK 자체 재시도는 끔
+    return openai.OpenAI(api_key=os.environ['OPENAI_API_KEY'], max_retries=0)
+
+def _create_github_client():
+    from github import Github
+    # 동시 작업 수만큼 연결을 재사용하도록 requests 세션 풀 크기 설정
+    pool_size = max(10, int(os.environ.get('AI_MAX_CONCURRENCY', '8')))
+    # 재시도는 공유 스케줄러가 담당하므로 SDK 재시도는 끔 (모든 GitHub 호출은 call_github/post_github/fetch_all/scan_github 경유)
+    github_client = Github(os.environ['GITHUB_TOKEN'], retry=None, pool_size=pool_size, per_page=GITHUB_PAGE_SIZE)
+    watch_github_quota(github_client)
+    return github_client
+
+# 프로세스 전체가 공유하는 클라이언트 (업스트림마다 연결 풀 하나)
+_OPENAI_CLIENT = LazyClient('openai', _create_openai_client)
+_GITHUB_CLIENT = LazyClient('github', _create_github_client)
+
+def get_openai_client() -> LazyClient:
+    """공유 OpenAI 클라이언트 (첫 API 호출 때 생성)"""
+    return _OPENAI_CLIENT
+
+def get_github_client() -> LazyClient:
+    """공유 GitHub 클라이언트 (첫 API 호출 때 생성)"""
+    return _GITHUB_CLIENT
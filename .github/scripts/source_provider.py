@@ -0,0 +1,216 @@
+# .github/scripts/source_provider.py
+import mmap
+import os
+import subprocess
+import threading
+from typing import Dict, Optional
+from rate_limit import call_github
+
+class LocalGitSource:
+    """로컬 체크아웃(git 객체 저장소와 작업 트리)에서 특정 커밋의 파일 읽기"""
+
+    # 이 크기 이상인 작업 트리 파일은 mmap으로 읽음
+    MMAP_THRESHOLD = 1024 * 1024
+
+    def __init__(self, repo_root: str, ref: str):
+        self.repo_root = repo_root
+        self.ref = ref
+        self._lock = threading.Lock()
+        self._batch = None  # git cat-file --batch 프로세스 (요청 시 시작)
+
+        # 작업 트리가 바로 그 커밋이면 git 객체 대신 파일을 직접 읽음
+        head = self._git('rev-parse', 'HEAD')
+        self.worktree_matches = head is not None and head.strip() == ref
+
+    @classmethod
+    def open(cls, ref: str) -> Optional['LocalGitSource']:
+        """체크아웃이 있고 ref 커밋이 로컬에 존재하면 LocalGitSource 생성"""
+        repo_root = os.environ.get('GITHUB_WORKSPACE') or os.getcwd()
+        try:
+            result = subprocess.run(
+                ['git', 'cat-file', '-e', f'{ref}^{{commit}}'],
+                cwd=repo_root, capture_output=True, timeout=10
+            )
+        except Exception:
+            return None
+        if result.returncode != 0:
+            return None
+        return cls(repo_root, ref)
+
+    def _git(self, *args) -> Optional[str]:
+        """git 명령 실행 (실패 시 None)"""
+        try:
+            result = subprocess.run(
+                ['git', '-c', 'core.quotepath=off', *args],
+                cwd=self.repo_root, capture_output=True, timeout=60
+            )
+        except Exception:
+            return None
+        if result.returncode != 0:
+            return None
+        return result.stdout.decode('utf-8', errors='replace')
+
+    def read_bytes(self, path: str) -> Optional[bytes]:
+        """파일 내용 (없으면 None)"""
+        if self.worktree_matches:
+            return self._read_worktree(path)
+        return self._read_object(path)
+
+    def _read_worktree(self, path: str) -> Optional[bytes]:
+        full_path = os.path.join(self.repo_root, path)
+        if not os.path.isfile(full_path):
+            return None
+        size = os.path.getsize(full_path)
+        with open(full_path, 'rb') as f:
+            if size >= self.MMAP_THRESHOLD:
+                # 큰 파일은 페이지 캐시를 그대로 매핑해 복사 비용 절감
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    return mapped[:]
+            return f.read()
+
+    def _read_object(self, path: str) -> Optional[bytes]:
+        """git cat-file --batch 하나로 여러 파일을 스트리밍 조회"""
+        with self._lock:
+            if self._batch is None:
+                self._batch = subprocess.Popen(
+                    ['git', 'cat-file', '--batch'],
+                    cwd=self.repo_root,
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL
+                )
+
+            self._batch.stdin.write(f"{self.ref}:{path}\n".encode('utf-8'))
+            self._batch.stdin.flush()
+
+            # 응답 헤더: "<sha> <type> <size>" 또는 "<object> missing"
+            header = self._batch.stdout.readline().decode('utf-8').split()
+            if len(header) != 3:
+                return None
+
+            size = int(header[2])
+            content = self._batch.stdout.read(size)
+            self._batch.stdout.read(1)  # 객체 뒤의 개행
+            # 경로가 디렉터리(tree)나 서브모듈(commit)이어도 본문은 읽어 둬야 다음 응답과 어긋나지 않음
+            return content if header[1] == 'blob' else None
+
+    def get_file_size(self, path: str) -> Optional[int]:
+        """파일 크기 (내용을 읽지 않고 조회, 없으면 None)"""
+        if self.worktree_matches:
+            full_path = os.path.join(self.repo_root, path)
+            return os.path.getsize(full_path) if os.path.isfile(full_path) else None
+        output = self._git('cat-file', '-s', f'{self.ref}:{path}')
+        return int(output.strip()) if output else None
+
+    def diff_patches(self, base_sha: str) -> Optional[Dict[str, str]]:
+        """base_sha..ref 사이의 파일별 patch (base가 조상이 아니거나 없으면 None)"""
+        if self._git('merge-base', '--is-ancestor', base_sha, self.ref) is None:
+            return None
+
+        output = self._git('diff', '--no-color', '--no-ext-diff', '-M', base_sha, self.ref)
+        if output is None:
+            return None
+
+        patches = {}
+        current_file = None
+        current_lines = []
+        # 파일 헤더(diff --git ~ 첫 @@) 안에서만 ---/+++ 를 경로로 해석 ('++'로 시작하는 추가 라인과 구분)
+        in_header = False
+        for line in output.split('\n'):
+            if line.startswith('diff --git '):
+                if current_file:
+                    patches[current_file] = '\n'.join(current_lines)
+                current_file, current_lines = None, []
+                in_header = True
+            elif in_header:
+                if line.startswith('+++ '):
+                    # 삭제된 파일은 '+++ /dev/null', 공백이 있는 경로는 git이 끝에 탭을 붙임
+                    current_file = line[6:].rstrip('\t') if line.startswith('+++ b/') else None
+                elif line.startswith('@@'):
+                    in_header = False
+                    if current_file:
+                        current_lines.append(line)
+            elif current_file:
+                current_lines.append(line)
+        if current_file:
+            patches[current_file] = '\n'.join(current_lines)
+
+        return patches
+
+    def close(self):
+        with self._lock:
+            if self._batch is not None:
+                self._batch.stdin.close()
+                self._batch.wait(timeout=10)
+                self._batch = None
+
+class SourceProvider:
+    """특정 커밋의 파일 본문 조회기 (로컬 체크아웃 우선, 없으면 GitHub contents API)"""
+
+    def __init__(self, repo, ref: str, use_local: bool = None):
+        self.repo = repo
+        self.ref = ref
+
+        if use_local is None:
+            use_local = os.environ.get('AI_LOCAL_SOURCE', 'true').lower() == 'true'
+        self.local = LocalGitSource.open(ref) if use_local else None
+
+        if self.local:
+            print(f"📂 로컬 체크아웃에서 파일을 읽습니다 ({ref[:7]})")
+        else:
+            print(f"🌐 로컬 체크아웃에 {ref[:7]} 커밋이 없어 GitHub API로 파일을 읽습니다")
+
+    def read_file(self, path: str) -> Optional[str]:
+        """파일 내용을 UTF-8 문자열로 반환 (없으면 None)"""
+        if self.local:
+            # 로컬에 커밋이 있으면 파일 부재도 확정이므로 API로 다시 묻지 않음
+            content = self.local.read_bytes(path)
+            if content is None:
+                return None
+            try:
+                return content.decode('utf-8')
+            except UnicodeDecodeError:
+                return None
+
+        # REST API 대체 경로
+        try:
+            content = call_github(self.repo.get_contents, path, ref=self.ref)
+            return content.decoded_content.decode('utf-8')
+        except Exception:
+            return None
+
+    def exists(self, path: str) -> bool:
+        """파일 존재 여부"""
+        if self.local:
+            return self.local.get_file_size(path) is not None
+        return self.read_file(path) is not None
+
+    def get_file_size(self, path: str) -> Optional[int]:
+        """파일 크기 (로컬 체크아웃이 있을 때만 내용 없이 조회 가능)"""
+        if self.local:
+            return self.local.get_file_size(path)
+        return None
+
+    def get_compare_patches(self, base_sha: str) -> Optional[Dict[str, str]]:
+        """base_sha부터 ref까지 파일별 patch (로컬 git 우선, 없으면 compare API)"""
+        if self.local:
+            patches = self.local.diff_patches(base_sha)
+            if patches is not None:
+                return patches
+
+        try:
+            comparison = call_github(self.repo.compare, base_sha, self.ref)
+        except Exception as e:
+            print(f"⚠️ 커밋 비교 실패: {e}")
+            return None
+
+        # 이전 head가 현재 head의 조상이 아니면(force-push, rebase) 증분 비교 불가
+        if comparison.status not in ('ahead', 'identical'):
+            print(f"⚠️ 이전 검토 커밋과의 관계가 '{comparison.status}'입니다")
+            return None
+
+        return {file.filename: file.patch or "" for file in comparison.files}
+
+    def close(self):
+        if self.local:
+            self.local.close()
@@ -0,0 +1,145 @@
+# .github/scripts/structure_context.py
+import hashlib
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+from local_rules import mask_code
+from token_budget import estimate_tokens
+
+# 블록 헤더로 함수/클래스 블록 판별 (언어별)
+FUNCTION_HEADERS = {
+    'kotlin': re.compile(r'\bfun\b|^\s*init\s*$|^\s*(get|set)\s*\([^)]*\)\s*$'),
+    'swift': re.compile(r'\bfunc\b|\binit\b[?!]?\s*[(<]|\bdeinit\b|\bsubscript\b|^\s*(get|set|willSet|didSet)\b'),
+    'javascript': re.compile(
+        r'\bfunction\b|=>\s*$|'
+        r'^\s*(?:(?:async|static|get|set|public|private|protected|override|readonly)\s+)*\*?[\w$]+\s*(?:<[^>]*>)?\s*\([^)]*\)\s*(?::[^=]+)?$'
+    ),
+}
+CLASS_HEADERS = {
+    'kotlin': re.compile(r'\b(class|object|interface)\b'),
+    'swift': re.compile(r'\b(class|struct|enum|extension|protocol|actor)\b'),
+    'javascript': re.compile(r'\b(class|interface|namespace|enum)\b'),
+}
+# 함수처럼 보이지만 제어문인 블록 헤더
+CONTROL_HEADER = re.compile(r'^\s*(if|else|for|while|switch|catch|do|try|when|guard|return|repeat|defer|finally)\b')
+# 다음 줄로 이어지는 헤더의 줄 끝 (여러 줄 파라미터 목록 등)
+CONTINUATION_ENDINGS = (',', '(', ':', '=', '->', '&&', '||', '<')
+
+class StructureIndex:
+    """파일의 함수/클래스 블록 범위 (주석과 문자열을 제외한 중괄호 짝으로 계산)"""
+
+    # 헤더가 여러 줄에 걸칠 때 거슬러 올라갈 최대 라인 수
+    MAX_HEADER_LINES = 8
+
+    def __init__(self, file_content: str, language: str):
+        self.lines = file_content.split('\n')
+        self._line_tokens: Optional[List[int]] = None
+        self.blocks: List[Dict] = []  # [{'start', 'header_end', 'end', 'kind'}]
+        if language in FUNCTION_HEADERS:
+            self._scan(mask_code(file_content, language), language)
+
+    def _scan(self, masked_lines: List[str], language: str):
+        stack = []  # 열린 블록의 (헤더 시작 라인, 여는 중괄호 라인, 종류)
+        for number, line in enumerate(masked_lines, 1):
+            for index, ch in enumerate(line):
+                if ch == '{':
+                    header_start, header = self._header(masked_lines, number, line[:index])
+                    stack.append((header_start, number, self._classify(header, language)))
+                elif ch == '}' and stack:
+                    header_start, header_end, kind = stack.pop()
+                    if kind:
+                        self.blocks.append({'start': header_start, 'header_end': header_end, 'end': number, 'kind': kind})
+
+    def _header(self, masked_lines: List[str], number: int, before_brace: str) -> Tuple[int, str]:
+        """여는 중괄호 앞의 선언부 (이전 문장이 끝난 지점부터, 필요하면 윗줄까지)"""
+        text = re.split(r'[{};]', before_brace)[-1]
+        start = number
+        while start > 1 and number - start < self.MAX_HEADER_LINES:
+            previous = masked_lines[start - 2].rstrip()
+            stripped = text.strip()
+            continues = not stripped or stripped[0] in ').:>' or previous.endswith(CONTINUATION_ENDINGS)
+            if not continues or not previous.strip() or previous.endswith(('{', '}', ';')):
+                break
+            text = re.split(r'[{};]', previous)[-1] + ' ' + text
+            start -= 1
+        return start, text
+
+    @staticmethod
+    def _classify(header: str, language: str) -> Optional[str]:
+        if CONTROL_HEADER.search(header):
+            return None
+        if FUNCTION_HEADERS[language].search(header):
+            return 'function'
+        if CLASS_HEADERS[language].search(header):
+            return 'class'
+        return None
+
+    def enclosing_blocks(self, first_line: int, last_line: int) -> List[Dict]:
+        """라인 범위를 감싸는 함수 블록들 (없으면 클래스 블록들), 작은 것부터"""
+        for kind in ('function', 'class'):
+            candidates = [
+                block for block in self.blocks
+                if block['kind'] == kind and block['start'] <= first_line and last_line <= block['end']
+            ]
+            if candidates:
+                return sorted(candidates, key=lambda block: block['end'] - block['start'])
+        return []
+
+    def enclosing(self, first_line: int, last_line: int) -> Optional[Dict]:
+        """라인 범위를 감싸는 가장 작은 함수 블록 (없으면 가장 작은 클래스 블록)"""
+        blocks = self.enclosing_blocks(first_line, last_line)
+        return blocks[0] if blocks else None
+
+    def _tokens(self, line_number: int) -> int:
+        if self._line_tokens is None:
+            self._line_tokens = [estimate_tokens(line) + 1 for line in self.lines]
+        return self._line_tokens[line_number - 1]
+
+    def context_lines(self, target_lines: List[int], token_budget: int, radius: int) -> List[int]:
+        """변경 라인들에 붙일 컨텍스트 라인 번호 - 감싸는 블록 전체, 예산을 넘으면 선언부와 변경 라인 주변만"""
+        line_count = len(self.lines)
+        included = set()
+        for target in target_lines:
+            included.update(range(max(1, target - radius), min(line_count, target + radius) + 1))
+
+        blocks = self.enclosing_blocks(min(target_lines), max(target_lines))
+        if not blocks:
+            return sorted(included)
+
+        # 변경 라인을 감싸는 가장 작은 블록 전체가 예산에 들어가면 그 블록만 사용
+        block = blocks[0]
+        span = set(range(block['start'], block['end'] + 1)) | included
+        if sum(self._tokens(line) for line in span) <= token_budget:
+            return sorted(span)
+
+        # 예산을 넘으면 선언부는 항상 포함하고, 예산이 남는 동안 블록 안에서 변경 라인 주변을 넓힘
+        included.update(range(block['start'], block['header_end'] + 1))
+        used_tokens = sum(self._tokens(line) for line in included)
+        distance = radius
+        while distance < block['end'] - block['start']:
+            distance += 1
+            added = {
+                line for target in target_lines for line in (target - distance, target + distance)
+                if block['start'] <= line <= block['end'] and line not in included
+            }
+            added_tokens = sum(self._tokens(line) for line in added)
+            if used_tokens + added_tokens > token_budget:
+                break
+            included |= added
+            used_tokens += added_tokens
+
+        return sorted(included)
+
+_index_cache: Dict[Tuple[str, str], StructureIndex] = {}
+_index_cache_lock = threading.Lock()
+
+def get_structure_index(file_path: str, file_content: str, language: str) -> StructureIndex:
+    """파일 내용별로 한 번만 만드는 구조 인덱스"""
+    key = (file_path, hashlib.sha1(file_content.encode('utf-8')).hexdigest())
+    with _index_cache_lock:
+        index = _index_cache.get(key)
+    if index is None:
+        index = StructureIndex(file_content, language)
+        with _index_cache_lock:
+            _index_cache[key] = index
+    return index
@@ -0,0 +1,150 @@
+# .github/scripts/structured_output.py
+import json
+import threading
+from rate_limit import call_openai
+from typing import Dict, List, Tuple
+
+def findings_response_format(name: str, item_properties: Dict[str, Dict]) -> Dict:
+    """{"findings": [...]} 형태를 강제하는 JSON 스키마 response_format 생성"""
+    # strict 모드는 최상위 객체와 모든 속성의 required 지정을 요구함
+    item_schema = {
+        'type': 'object',
+        'properties': item_properties,
+        'required': list(item_properties),
+        'additionalProperties': False
+    }
+    return {
+        'type': 'json_schema',
+        'json_schema': {
+            'name': name,
+            'strict': True,
+            'schema': {
+                'type': 'object',
+                'properties': {'findings': {'type': 'array', 'items': item_schema}},
+                'required': ['findings'],
+                'additionalProperties': False
+            }
+        }
+    }
+
+class IncrementalArrayParser:
+    """JSON 배열을 조각 단위로 받아 완성된 원소만 꺼내는 파서 (잘린 응답 복구용)"""
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = None  # 다음 원소를 읽을 위치 (배열 시작 전이면 None)
+        self.items: List = []
+        self.complete = False
+
+    def feed(self, text: str) -> List:
+        """텍스트 조각을 추가하고 새로 완성된 원소 목록 반환"""
+        self._buffer += text
+        if self.complete:
+            return []
+
+        if self._pos is None:
+            # 감싸는 객체 키, 마크다운 코드 블록 등 첫 '[' 앞의 내용은 건너뜀
+            start = self._buffer.find('[')
+            if start == -1:
+                return []
+            self._pos = start + 1
+
+        new_items = []
+        while True:
+            pos = self._skip(self._pos, ',')
+            if pos >= len(self._buffer):
+                break
+            if self._buffer[pos] == ']':
+                self.complete = True
+                break
+            try:
+                item, end = self._decoder.raw_decode(self._buffer, pos)
+            except json.JSONDecodeError:
+                break  # 원소가 아직 다 도착하지 않음 (또는 잘림)
+
+            # 스칼라 원소는 뒤에 구분자가 와야 완성된 것으로 판단
+            if not isinstance(item, (dict, list)) and self._skip(end) >= len(self._buffer):
+                break
+
+            new_items.append(item)
+            self._pos = end
+
+        self.items.extend(new_items)
+        return new_items
+
+    def _skip(self, pos: int, extra: str = "") -> int:
+        """공백(과 extra 문자)을 건너뛴 위치"""
+        while pos < len(self._buffer) and (self._buffer[pos].isspace() or self._buffer[pos] in extra):
+            pos += 1
+        return pos
+
+class ParseStats:
+    """구조화 응답 파싱 결과(정상/잘림 복구/실패) 집계"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.by_name: Dict[str, Dict[str, int]] = {}
+
+    def record(self, name: str, outcome: str, recovered_items: int = 0):
+        with self._lock:
+            stats = self.by_name.setdefault(name, {'ok': 0, 'recovered': 0, 'failed': 0, 'recovered_items': 0})
+            stats[outcome] += 1
+            stats['recovered_items'] += recovered_items
+
+    def print_summary(self):
+        """파싱 실패/복구가 있었던 경우에만 요약 출력"""
+        troubled = {name: s for name, s in self.by_name.items() if s['recovered'] or s['failed']}
+        if not troubled:
+            return
+        print("🧩 구조화 응답 파싱 결과:")
+        for name, stats in sorted(troubled.items()):
+            print(f"  - {name}: 정상 {stats['ok']}, 잘림 복구 {stats['recovered']}"
+                  f"(원소 {stats['recovered_items']}개), 실패 {stats['failed']}")
+
+# 프로세스 전체가 공유하는 파싱 결과 집계
+PARSE_STATS = ParseStats()
+
+def parse_findings(name: str, response_text: str, truncated: bool = False) -> Tuple[List, bool]:
+    """응답 본문에서 findings 배열 추출 (잘린 응답은 완성된 원소만 복구), (원소 목록, 완전 여부) 반환"""
+    text = (response_text or "").strip()
+
+    if not truncated:
+        try:
+            parsed = json.loads(text)
+            findings = parsed.get('findings') if isinstance(parsed, dict) else parsed
+            if isinstance(findings, list):
+                PARSE_STATS.record(name, 'ok')
+                return findings, True
+        except json.JSONDecodeError:
+            pass
+
+    parser = IncrementalArrayParser()
+    parser.feed(text)
+    if parser.complete and not truncated:
+        PARSE_STATS.record(name, 'ok')
+        return parser.items, True
+
+    if parser.items:
+        print(f"⚠️ {name} 응답이 잘려 완성된 {len(parser.items)}개 항목만 복구")
+        PARSE_STATS.record(name, 'recovered', len(parser.items))
+        return parser.items, False
+
+    print(f"{name} JSON 파싱 실패: {text[:200]}...")
+    PARSE_STATS.record(name, 'failed')
+    return [], False
+
+def request_findings(openai_client, name: str, response_format: Dict, **create_kwargs) -> Tuple[List, bool, object]:
+    """스키마 강제 모드로 요청하고 findings 추출, (원소 목록, 완전 여부, 원본 응답) 반환"""
+    response = call_openai(openai_client.chat.completions.create, response_format=response_format, **create_kwargs)
+    choice = response.choices[0]
+
+    # 스키마 응답을 거부하면 refusal만 채워지고 content는 비어 있음
+    if getattr(choice.message, 'refusal', None):
+        print(f"⚠️ {name} 응답 거부: {choice.message.refusal}")
+        PARSE_STATS.record(name, 'failed')
+        return [], False, response
+
+    truncated = getattr(choice, 'finish_reason', None) == 'length'
+    findings, complete = parse_findings(name, choice.message.content or "", truncated)
+    return findings, complete, response
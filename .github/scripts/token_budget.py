@@ -0,0 +1,40 @@
+# .github/scripts/token_budget.py
+import re
+
+try:
+    # 설치되어 있으면 실제 토크나이저로 정확히 계산 (선택 의존성)
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("o200k_base")
+except Exception:
+    _ENCODING = None
+
+# ASCII가 아닌 문자(한글 등)는 대략 글자당 1토큰, ASCII는 약 4글자당 1토큰
+_NON_ASCII = re.compile(r'[^\x00-\x7f]')
+
+def estimate_tokens(text: str) -> int:
+    """텍스트의 토큰 수를 로컬에서 계산 (tiktoken이 없으면 보수적으로 추정)"""
+    if not text:
+        return 0
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text, disallowed_special=()))
+
+    non_ascii = len(_NON_ASCII.findall(text))
+    ascii_chars = len(text) - non_ascii
+    return non_ascii + (ascii_chars + 3) // 4
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """라인 단위로 잘라 토큰 예산 안에 들어오도록 축약"""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    kept = []
+    used_tokens = 0
+    for line in text.split('\n'):
+        line_tokens = estimate_tokens(line) + 1
+        if used_tokens + line_tokens > max_tokens:
+            break
+        kept.append(line)
+        used_tokens += line_tokens
+
+    kept.append("... (토큰 예산 초과로 이하 생략)")
+    return '\n'.join(kept)
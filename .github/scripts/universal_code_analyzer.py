@@ -1,16 +1,148 @@
 # .github/scripts/universal_code_analyzer.py
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
 import os
 import re
-from github import Github
-import openai
+import threading
+from functools import partial
+from analysis_cache import get_analysis_cache
+from source_provider import SourceProvider
+from concurrent_runner import ConcurrentRunner
+from token_budget import estimate_tokens
+from prompt_templates import PromptTemplate
+from structured_output import findings_response_format, request_findings
+from runtime import get_openai_client
+from local_rules import (
+    mask_code, check_max_line_length, check_pattern, check_indentation,
+    parse_editorconfig, parse_swiftlint_config, parse_eslint_rules, eslint_rule_setting, parse_int,
+    is_editorconfig_root, has_eslint_config
+)
+
+# 적용할 설정 파일이 없을 때 프롬프트에 넣는 안내
+NO_CONFIG_MESSAGE = "# 설정 파일이 없습니다. 기본 규칙을 사용합니다."
+
+# 린트 윈도우 분석 프롬프트 (린터 설명/설정/응답 형식은 고정 접두부, 파일과 코드는 가변 접미부)
+LINT_WINDOW_PROMPT = PromptTemplate(
+    name='lint_window',
+    static_prefix="""
+JSON으로만 응답하는 {language} 린터입니다.
+사용자가 보내는 파일을 분석하여 린트 규칙 위반을 찾아주세요.
+
+**린터 도구 정보:**
+{linter_description}
+
+**프로젝트 설정 파일:**
+{config_content}
+
+**분석 요청:**
+위 설정에 따라 코드를 검사하고, 위반사항을 찾아 JSON으로만 응답해주세요.
+
+응답 형식:
+{{
+  "findings": [
+    {{
+      "line": 코드 앞에 표시된 줄번호,
+      "rule": "규칙명",
+      "priority": "P3",
+      "category": "{language}lint",
+      "message": "위반 내용을 한 문장으로 간단히",
+      "suggestion": "수정 예시를 한 줄로"
+    }}
+  ]
+}}
+
+중요사항:
+- 문제없으면 빈 배열("findings": [])
+- 각 메시지는 50자 이내로 간단히
+- suggestion도 한 줄 코드로만
+""",
+    variable_suffix="""
+**파일:** {file_path}
+**언어:** {language}
+
+**분석할 코드:**
+```{language}
+{numbered_code}
+```
+"""
+)
+
+# 린트 윈도우 응답 스키마
+LINT_WINDOW_RESPONSE_FORMAT = findings_response_format('lint_window_findings', {
+    'line': {'type': 'integer'},
+    'rule': {'type': 'string'},
+    'priority': {'type': 'string'},
+    'category': {'type': 'string'},
+    'message': {'type': 'string'},
+    'suggestion': {'type': 'string'}
+})
+
+# 여러 작은 파일을 한 번에 검사하는 배치 린트 프롬프트 (결과는 파일 경로로 구분)
+LINT_BATCH_PROMPT = PromptTemplate(
+    name='lint_batch',
+    static_prefix="""
+JSON으로만 응답하는 {language} 린터입니다.
+사용자가 보내는 여러 파일을 각각 분석하여 린트 규칙 위반을 찾아주세요.
+
+**린터 도구 정보:**
+{linter_description}
+
+**프로젝트 설정 파일:**
+{config_content}
+
+**분석 요청:**
+위 설정에 따라 각 파일의 코드를 검사하고, 위반사항을 찾아 JSON으로만 응답해주세요.
+
+응답 형식:
+{{
+  "findings": [
+    {{
+      "file": "위반이 있는 파일 경로 (요청에 표시된 그대로)",
+      "line": 해당 파일 코드 앞에 표시된 줄번호,
+      "rule": "규칙명",
+      "priority": "P3",
+      "category": "{language}lint",
+      "message": "위반 내용을 한 문장으로 간단히",
+      "suggestion": "수정 예시를 한 줄로"
+    }}
+  ]
+}}
+
+중요사항:
+- 줄번호는 파일마다 1부터 시작
+- 문제없으면 빈 배열("findings": [])
+- 각 메시지는 50자 이내로 간단히
+- suggestion도 한 줄 코드로만
+""",
+    variable_suffix="""
+**언어:** {language}
+
+{files_section}
+"""
+)
+
+# 배치 린트 응답 스키마
+LINT_BATCH_RESPONSE_FORMAT = findings_response_format('lint_batch_findings', {
+    'file': {'type': 'string'},
+    'line': {'type': 'integer'},
+    'rule': {'type': 'string'},
+    'priority': {'type': 'string'},
+    'category': {'type': 'string'},
+    'message': {'type': 'string'},
+    'suggestion': {'type': 'string'}
+})
 
 class LanguageLinter(ABC):
     """언어별 린터 인터페이스 (AI 기반)"""
+    MODEL = "gpt-4o-mini"
+    # 윈도우 하나에 담을 코드 토큰 수와 윈도우 사이에 겹치는 라인 수
+    WINDOW_TOKEN_BUDGET = int(os.environ.get('AI_LINT_WINDOW_TOKENS', '1500'))
+    WINDOW_OVERLAP_LINES = 5
 
-    def __init__(self, openai_client):
+    def __init__(self, openai_client, cache=None):
         self.openai_client = openai_client
+        self.cache = cache
+        self.window_runner = ConcurrentRunner(int(os.environ.get('AI_LINT_WINDOW_CONCURRENCY', '4')))
 
     @abstractmethod
     def get_language_name(self) -> str:
@@ -27,118 +159,184 @@ class LanguageLinter(ABC):
         """설정 파일 이름 목록 (우선순위 순)"""
         pass
 
+    def accepts_config(self, config_file: str, config_content: str) -> bool:
+        """찾은 파일을 린트 설정으로 쓸지 (package.json처럼 린트 설정이 없을 수도 있는 파일용)"""
+        return True
+
+    def is_root_config(self, config_file: str, config_content: str) -> bool:
+        """이 설정에서 상위 디렉터리 탐색을 멈출지 (False면 상위 설정 뒤에 이어 붙임)"""
+        return True
+
     @abstractmethod
     def get_linter_description(self) -> str:
         """린터 도구 설명 (AI가 이해할 수 있는 형태)"""
         pass
 
-    def analyze_with_ai(self, file_content: str, file_path: str, config_content: str) -> List[Dict]:
-        """AI를 사용한 린트 분석"""
-
-        analysis_prompt = f"""
-당신은 {self.get_language_name()} 전문 린터입니다. 다음 파일을 분석하여 린트 규칙 위반을 찾아주세요.
-
-**파일:** {file_path}
-**언어:** {self.get_language_name()}
-
-**린터 도구 정보:**
-{self.get_linter_description()}
-
-**프로젝트 설정 파일:**
-{config_content}
-
-**분석할 코드:**
-```{self.get_language_name()}
-{file_content[:2000]}
-```
-
-**분석 요청:**
-위 설정에 따라 코드를 검사하고, 위반사항을 찾아 순수한 JSON 배열로만 응답해주세요.
-
-응답 형식 (마크다운 코드 블록 사용하지 말고 순수 JSON만):
-[
-  {{
-    "line": 줄번호,
-    "rule": "규칙명",
-    "priority": "P3",
-    "category": "{self.get_language_name().lower()}lint",
-    "message": "위반 내용을 한 문장으로 간단히",
-    "suggestion": "수정 예시를 한 줄로"
-  }}
-]
+    def check_local_rules(self, file_content: str, file_path: str, config_content: str) -> List[Dict]:
+        """AI 없이 로컬에서 검사하는 기계적 규칙 (라인 길이, 금지 패턴, 들여쓰기 등)"""
+        return []
+
+    def split_into_windows(self, file_content: str) -> List[Dict]:
+        """파일을 토큰 예산 크기의 겹치는 라인 윈도우로 분할"""
+        lines = file_content.split('\n')
+        windows = []
+        start = 0
+
+        while start < len(lines):
+            end = start
+            used_tokens = 0
+            # 최소 한 줄은 포함하고, 예산을 넘기기 직전까지 라인 추가
+            while end < len(lines):
+                line_tokens = estimate_tokens(lines[end]) + 1
+                if end > start and used_tokens + line_tokens > self.WINDOW_TOKEN_BUDGET:
+                    break
+                used_tokens += line_tokens
+                end += 1
+
+            windows.append({'start_line': start + 1, 'lines': lines[start:end]})
+            if end >= len(lines):
+                break
+            # 다음 윈도우는 경계 부분 규칙을 놓치지 않도록 일부 라인을 겹쳐서 시작
+            start = max(start + 1, end - self.WINDOW_OVERLAP_LINES)
+
+        return windows
 
-중요사항:
-- 마크다운 ```json 블록 사용 금지
-- 순수 JSON 배열만 응답
-- 문제없으면 빈 배열 []
-- 각 메시지는 50자 이내로 간단히
-- suggestion도 한 줄 코드로만
-"""
+    def analyze_with_ai(self, file_content: str, file_path: str, config_content: str) -> List[Dict]:
+        """AI를 사용한 린트 분석 (파일 전체를 윈도우로 나눠 동시에 분석)"""
+
+        windows = self.split_into_windows(file_content)
+        tasks = [partial(self.analyze_window_with_ai, window, file_path, config_content) for window in windows]
+        results = self.window_runner.run_all(tasks, default=[])
+
+        # 겹치는 구간에서 중복 보고된 위반 제거 (파일 좌표 기준)
+        violations = []
+        seen = set()
+        for window_violations in results:
+            for violation in window_violations:
+                key = (violation.get('line'), violation.get('rule'))
+                if key in seen:
+                    continue
+                seen.add(key)
+                violations.append(violation)
+
+        return sorted(violations, key=lambda v: v['line'])
+
+    def analyze_window_with_ai(self, window: Dict, file_path: str, config_content: str) -> List[Dict]:
+        """윈도우 하나를 린트 분석하고 라인 번호를 파일 좌표로 변환"""
+
+        # 윈도우 내부 기준 라인 번호를 붙여서 전달 (같은 코드 블록은 위치와 무관하게 캐시 재사용)
+        numbered_code = '\n'.join(f"{i + 1:4d}: {line}" for i, line in enumerate(window['lines']))
+
+        # 린터 설명과 프로젝트 설정은 언어별로 고정되므로 접두부에, 파일과 코드는 접미부에 둠
+        messages = LINT_WINDOW_PROMPT.build_messages(
+            static={
+                'language': self.get_language_name(),
+                'linter_description': self.get_linter_description(),
+                'config_content': config_content
+            },
+            file_path=file_path,
+            language=self.get_language_name(),
+            numbered_code=numbered_code
+        )
+
+        relative_violations = self.request_lint_violations(messages)
+        return self.rebase_violation_lines(relative_violations, window)
+
+    def rebase_violation_lines(self, violations: List[Dict], window: Dict) -> List[Dict]:
+        """윈도우 기준 라인 번호를 파일 기준 라인 번호로 변환 (범위 밖 라인은 제외)"""
+        rebased = []
+        for violation in violations:
+            if not isinstance(violation, dict):
+                continue
+            try:
+                relative_line = int(violation.get('line'))
+            except (TypeError, ValueError):
+                continue
+            if not 1 <= relative_line <= len(window['lines']):
+                continue
+            rebased.append({**violation, 'line': window['start_line'] + relative_line - 1})
+        return rebased
+
+    def analyze_batch_with_ai(self, files: List[Tuple[str, str]], config_content: str) -> Dict[str, List[Dict]]:
+        """윈도우 하나에 들어가는 작은 파일 여러 개를 한 번에 린트 분석 ({파일 경로: 위반 목록})"""
+        windows = {file_path: {'start_line': 1, 'lines': file_content.split('\n')} for file_path, file_content in files}
+
+        sections = []
+        for file_path, window in windows.items():
+            numbered_code = '\n'.join(f"{i + 1:4d}: {line}" for i, line in enumerate(window['lines']))
+            sections.append(f"**파일:** {file_path}\n```{self.get_language_name()}\n{numbered_code}\n```")
+
+        messages = LINT_BATCH_PROMPT.build_messages(
+            static={
+                'language': self.get_language_name(),
+                'linter_description': self.get_linter_description(),
+                'config_content': config_content
+            },
+            language=self.get_language_name(),
+            files_section='\n\n'.join(sections)
+        )
+
+        # 응답 토큰 상한은 파일 수에 비례해 늘림
+        max_tokens = min(4000, 1000 + 300 * (len(files) - 1))
+        findings = self.request_lint_violations(messages, 'lint_batch', LINT_BATCH_RESPONSE_FORMAT, LINT_BATCH_PROMPT, max_tokens)
+
+        # 요청에 없던 파일 경로로 보고된 위반은 버리고, 파일별로 라인 범위 확인
+        grouped = {file_path: [] for file_path in windows}
+        for finding in findings:
+            if isinstance(finding, dict) and finding.get('file') in grouped:
+                grouped[finding['file']].append({k: v for k, v in finding.items() if k != 'file'})
+
+        results = {}
+        for file_path, violations in grouped.items():
+            seen = set()
+            results[file_path] = []
+            for violation in self.rebase_violation_lines(violations, windows[file_path]):
+                key = (violation['line'], violation.get('rule'))
+                if key not in seen:
+                    seen.add(key)
+                    results[file_path].append(violation)
+        return results
+
+    def request_lint_violations(self, messages: List[Dict], name: str = 'lint_window',
+                                response_format: Dict = LINT_WINDOW_RESPONSE_FORMAT,
+                                template: PromptTemplate = LINT_WINDOW_PROMPT, max_tokens: int = 1000) -> List[Dict]:
+        """린트 요청 실행 (요청 메시지 단위로 캐시)"""
+
+        # 코드, 린터 설정, 모델이 같으면 이전 린트 결과 재사용
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.make_key(name, model=self.MODEL, messages=messages)
+            cached_violations = self.cache.get(cache_key)
+            if cached_violations is not None:
+                return cached_violations
 
         try:
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": f"순수 JSON만 응답하는 {self.get_language_name()} 린터입니다. 마크다운 사용 금지."},
-                    {"role": "user", "content": analysis_prompt}
-                ],
-                max_tokens=1000,  # 토큰 제한을 줄여서 응답 잘림 방지
+            violations, complete, response = request_findings(
+                self.openai_client,
+                name,
+                response_format,
+                model=self.MODEL,
+                messages=messages,
+                max_tokens=max_tokens,
                 temperature=0.1
             )
+            template.record_usage(response)
 
-            response_text = response.choices[0].message.content.strip()
-
-            # 마크다운 코드 블록 제거
-            response_text = self.clean_json_response(response_text)
-
-            import json
-            try:
-                violations = json.loads(response_text)
-                return violations if isinstance(violations, list) else []
-            except json.JSONDecodeError as e:
-                print(f"AI 린트 분석 JSON 파싱 실패: {response_text[:200]}...")
-                print(f"JSON 오류: {e}")
-                return []
+            # 잘린 응답에서 복구한 일부 결과는 캐시하지 않음
+            if complete and cache_key is not None:
+                self.cache.set(cache_key, violations)
+            return violations
 
         except Exception as e:
             print(f"AI 린트 분석 실패: {e}")
             return []
 
-    def clean_json_response(self, response_text: str) -> str:
-        """AI 응답에서 순수 JSON만 추출"""
-
-        # 마크다운 코드 블록 제거
-        if "```json" in response_text:
-            start = response_text.find("```json") + 7
-            end = response_text.find("```", start)
-            if end != -1:
-                response_text = response_text[start:end].strip()
-            else:
-                response_text = response_text[start:].strip()
-        elif "```" in response_text:
-            start = response_text.find("```") + 3
-            end = response_text.find("```", start)
-            if end != -1:
-                response_text = response_text[start:end].strip()
-
-        # 앞뒤 불필요한 텍스트 제거
-        response_text = response_text.strip()
-
-        # JSON 배열이 시작하는 지점 찾기
-        start_bracket = response_text.find('[')
-        if start_bracket != -1:
-            response_text = response_text[start_bracket:]
-
-        # JSON 배열이 끝나는 지점 찾기 (마지막 ]까지)
-        end_bracket = response_text.rfind(']')
-        if end_bracket != -1:
-            response_text = response_text[:end_bracket + 1]
-
-        return response_text
-
 class KotlinLinter(LanguageLinter):
     """Kotlin ktlint 린터 (AI 기반)"""
 
+    # 와일드카드 import (예: import kotlinx.coroutines.*)
+    WILDCARD_IMPORT = re.compile(r'^\s*import\s+[\w.`]+\.\*')
+
     def get_language_name(self) -> str:
         return "kotlin"
 
@@ -148,25 +346,55 @@ class KotlinLinter(LanguageLinter):
     def get_config_files(self) -> List[str]:
         return [".editorconfig", "ktlint.conf"]
 
+    def is_root_config(self, config_file: str, config_content: str) -> bool:
+        # root = true가 없는 .editorconfig는 상위 .editorconfig와 합쳐서 적용됨
+        return config_file != ".editorconfig" or is_editorconfig_root(config_content)
+
     def get_linter_description(self) -> str:
         return """
 ktlint는 Kotlin 코드 스타일 린터입니다.
 
 주요 규칙:
-- ktlint_standard_indent: 들여쓰기 (기본 4칸 스페이스)
-- ktlint_standard_max-line-length: 최대 라인 길이 (기본 120자)
-- ktlint_standard_no-wildcard-imports: 와일드카드 import 금지
 - ktlint_standard_function-naming: 함수명 camelCase
 - ktlint_standard_property-naming: 프로퍼티명 camelCase
 - ktlint_standard_enum-entry-name-case: enum 항목 UPPER_SNAKE_CASE
 - ktlint_code_style: android_studio 또는 official
 
 설정에서 "disabled"로 표시된 규칙은 검사하지 않습니다.
+들여쓰기, 최대 라인 길이, 와일드카드 import는 로컬 검사기가 처리하므로 보고하지 마세요.
 """
 
+    def check_local_rules(self, file_content: str, file_path: str, config_content: str) -> List[Dict]:
+        properties = parse_editorconfig(config_content, file_path)
+        disabled = {
+            key[len('ktlint_standard_'):] for key, value in properties.items()
+            if key.startswith('ktlint_standard_') and value == 'disabled'
+        }
+        lines = file_content.split('\n')
+        masked_lines = mask_code(file_content, 'kotlin')
+        violations = []
+
+        max_line_length = properties.get('max_line_length', '120')
+        if 'max-line-length' not in disabled and max_line_length != 'off':
+            violations += check_max_line_length(lines, parse_int(max_line_length, 120), 'max-line-length', 'kotlin')
+        if 'no-wildcard-imports' not in disabled:
+            violations += check_pattern(
+                masked_lines, self.WILDCARD_IMPORT, 'no-wildcard-imports', 'kotlin',
+                "와일드카드 import 사용", "사용하는 클래스만 명시적으로 import"
+            )
+        if 'indent' not in disabled:
+            violations += check_indentation(
+                lines, masked_lines, properties.get('indent_style', 'space'),
+                parse_int(properties.get('indent_size'), 4), 'indent', 'kotlin'
+            )
+        return violations
+
 class SwiftLinter(LanguageLinter):
     """Swift SwiftLint 린터 (AI 기반)"""
 
+    # force cast (as!)
+    FORCE_CAST = re.compile(r'\bas!')
+
     def get_language_name(self) -> str:
         return "swift"
 
@@ -181,20 +409,45 @@ class SwiftLinter(LanguageLinter):
 SwiftLint는 Swift 코드 스타일 린터입니다.
 
 주요 규칙:
-- line_length: 최대 라인 길이 (기본 120자)
 - function_parameter_count: 함수 매개변수 개수 제한
-- force_cast: force cast (as!) 사용 금지
 - implicitly_unwrapped_optional: 암시적 옵셔널 언래핑 주의
 - identifier_name: 변수/함수명 규칙
 - type_name: 타입명 규칙
 
 disabled_rules에 포함된 규칙은 검사하지 않습니다.
 opt_in_rules에 포함된 규칙만 추가로 검사합니다.
+line_length, force_cast, indentation_width는 로컬 검사기가 처리하므로 보고하지 마세요.
 """
 
+    def check_local_rules(self, file_content: str, file_path: str, config_content: str) -> List[Dict]:
+        settings = parse_swiftlint_config(config_content)
+        disabled = settings['disabled_rules']
+        lines = file_content.split('\n')
+        masked_lines = mask_code(file_content, 'swift')
+        violations = []
+
+        if 'line_length' not in disabled:
+            violations += check_max_line_length(lines, settings['line_length'], 'line_length', 'swift')
+        if 'force_cast' not in disabled:
+            violations += check_pattern(
+                masked_lines, self.FORCE_CAST, 'force_cast', 'swift',
+                "force cast(as!) 사용", "as? 와 guard let/if let 사용"
+            )
+        # indentation_width는 opt-in 규칙
+        if 'indentation_width' in settings['opt_in_rules']:
+            violations += check_indentation(
+                lines, masked_lines, 'space', settings['indentation_width'], 'indentation_width', 'swift'
+            )
+        return violations
+
 class JavaScriptLinter(LanguageLinter):
     """JavaScript ESLint 린터 (AI 기반)"""
 
+    # console 호출과 느슨한 비교 연산자 (==, !=)
+    CONSOLE_CALL = re.compile(r'\bconsole\.\w+\s*\(')
+    LOOSE_EQUALITY = re.compile(r'(?<![=!<>])[=!]=(?!=)')
+    NULL_COMPARISON = re.compile(r'[=!]=\s*null\b|\bnull\s*[=!]=')
+
     def get_language_name(self) -> str:
         return "javascript"
 
@@ -204,6 +457,10 @@ class JavaScriptLinter(LanguageLinter):
     def get_config_files(self) -> List[str]:
         return [".eslintrc.json", ".eslintrc.js", "eslint.config.js", "package.json"]
 
+    def accepts_config(self, config_file: str, config_content: str) -> bool:
+        # eslintConfig가 없는 package.json은 건너뛰고 상위 디렉터리 탐색을 계속함
+        return config_file != "package.json" or has_eslint_config(config_content)
+
     def get_linter_description(self) -> str:
         return """
 ESLint는 JavaScript/TypeScript 코드 린터입니다.
@@ -211,29 +468,83 @@ ESLint는 JavaScript/TypeScript 코드 린터입니다.
 주요 규칙:
 - no-unused-vars: 사용하지 않는 변수
 - prefer-const: const 사용 권장
-- no-console: console.log 사용 금지
-- eqeqeq: 엄격한 비교 연산자 (===, !==)
-- indent: 들여쓰기 규칙
 - quotes: 따옴표 스타일
 - semi: 세미콜론 사용
 
 rules에서 "off" 또는 0으로 설정된 규칙은 검사하지 않습니다.
 extends 설정도 고려해주세요.
+no-console, eqeqeq, indent, max-len은 로컬 검사기가 처리하므로 보고하지 마세요.
 """
 
+    def check_local_rules(self, file_content: str, file_path: str, config_content: str) -> List[Dict]:
+        rules = parse_eslint_rules(config_content)
+        lines = file_content.split('\n')
+        masked_lines = mask_code(file_content, 'javascript')
+        violations = []
+
+        # no-console, eqeqeq는 명시적으로 끄지 않으면 검사
+        console_enabled, _ = eslint_rule_setting(rules, 'no-console')
+        if console_enabled is not False:
+            violations += check_pattern(
+                masked_lines, self.CONSOLE_CALL, 'no-console', 'javascript',
+                "console 호출이 남아 있음", "디버그 로그를 제거하거나 로거 사용"
+            )
+
+        eqeqeq_enabled, eqeqeq_options = eslint_rule_setting(rules, 'eqeqeq')
+        if eqeqeq_enabled is not False:
+            allow_null = 'smart' in eqeqeq_options or any(
+                isinstance(option, dict) and option.get('null') == 'ignore' for option in eqeqeq_options
+            )
+            for violation in check_pattern(
+                masked_lines, self.LOOSE_EQUALITY, 'eqeqeq', 'javascript',
+                "느슨한 비교 연산자(==, !=) 사용", "=== 또는 !== 사용"
+            ):
+                if allow_null and self.NULL_COMPARISON.search(masked_lines[violation['line'] - 1]):
+                    continue
+                violations.append(violation)
+
+        # indent, max-len은 설정 파일에 있을 때만 검사
+        indent_enabled, indent_options = eslint_rule_setting(rules, 'indent')
+        if indent_enabled:
+            indent = indent_options[0] if indent_options else 4
+            if indent == 'tab':
+                violations += check_indentation(lines, masked_lines, 'tab', 0, 'indent', 'javascript')
+            else:
+                violations += check_indentation(lines, masked_lines, 'space', parse_int(indent, 4), 'indent', 'javascript')
+
+        max_len_enabled, max_len_options = eslint_rule_setting(rules, 'max-len')
+        if max_len_enabled:
+            option = max_len_options[0] if max_len_options else 80
+            limit = option.get('code', 80) if isinstance(option, dict) else option
+            violations += check_max_line_length(lines, parse_int(limit, 80), 'max-len', 'javascript')
+
+        return violations
+
 class UniversalCodeAnalyzer:
     """AI 기반 범용 코드 분석기"""
 
-    def __init__(self, repo, pr):
+    # 배치 린트 요청 하나에 담을 코드 토큰 수와 파일 수 상한
+    BATCH_TOKEN_BUDGET = int(os.environ.get('AI_LINT_BATCH_TOKENS', '3000'))
+    BATCH_MAX_FILES = int(os.environ.get('AI_LINT_BATCH_MAX_FILES', '10'))
+
+    def __init__(self, repo, pr, source_provider: Optional[SourceProvider] = None, openai_client=None):
         self.repo = repo
         self.pr = pr
-        self.openai_client = openai.OpenAI(api_key=os.environ['OPENAI_API_KEY'])
+        # PR head 기준으로 설정 파일을 읽음 (로컬 체크아웃 우선)
+        self.source = source_provider or SourceProvider(repo, pr.head.sha)
+
+        # 실행 중 설정 파일 조회 캐시: 경로 → 내용(없으면 None), (언어, 디렉터리) → 적용할 설정
+        self._config_files: Dict[str, Optional[str]] = {}
+        self._resolved_configs: Dict[Tuple[str, str], str] = {}
+        self._config_lock = threading.Lock()
+        self.openai_client = openai_client or get_openai_client()
+        self.cache = get_analysis_cache()
 
         # AI 기반 린터들 초기화
         self.linters = {
-            'kotlin': KotlinLinter(self.openai_client),
-            'swift': SwiftLinter(self.openai_client),
-            'javascript': JavaScriptLinter(self.openai_client)
+            'kotlin': KotlinLinter(self.openai_client, self.cache),
+            'swift': SwiftLinter(self.openai_client, self.cache),
+            'javascript': JavaScriptLinter(self.openai_client, self.cache)
         }
 
     def detect_language(self, file_path: str) -> Optional[str]:
@@ -244,25 +555,59 @@ class UniversalCodeAnalyzer:
                     return lang_name
         return None
 
-    def get_linter_config_content(self, language: str) -> str:
-        """언어별 린터 설정 파일 내용 가져오기"""
+    def get_linter_config_content(self, language: str, file_path: Optional[str] = None) -> str:
+        """언어별 린터 설정 파일 내용 가져오기 (파일에서 가장 가까운 상위 디렉터리의 설정 우선)"""
         if language not in self.linters:
             return ""
 
-        linter = self.linters[language]
+        directory = os.path.dirname(file_path) if file_path else ""
+
+        # 병렬 린트 작업이 동시에 호출하므로 잠금 안에서 조회/기록
+        with self._config_lock:
+            return self._resolve_config(language, directory)
+
+    def _resolve_config(self, language: str, directory: str) -> str:
+        """디렉터리에 적용할 설정 (root가 아닌 설정은 상위 디렉터리 설정 뒤에 이어 붙임)"""
+        key = (language, directory)
+        if key in self._resolved_configs:
+            return self._resolved_configs[key]
+
+        found = self._find_config_in_directory(language, directory)
+        if found is not None and (found[1] or not directory):
+            resolved = found[0]
+        elif directory:
+            parent = self._resolve_config(language, os.path.dirname(directory))
+            if found is None:
+                resolved = parent
+            elif parent == NO_CONFIG_MESSAGE:
+                resolved = found[0]
+            else:
+                # 뒤에 오는 하위 설정의 섹션이 상위 설정을 덮어씀
+                resolved = parent + "\n\n" + found[0]
+        else:
+            print(f"⚠️ {language} 설정 파일 없음 - 기본 규칙 사용")
+            resolved = NO_CONFIG_MESSAGE
+
+        self._resolved_configs[key] = resolved
+        return resolved
 
-        # 설정 파일 우선순위대로 시도
+    def _find_config_in_directory(self, language: str, directory: str) -> Optional[Tuple[str, bool]]:
+        """한 디렉터리에서 설정 파일을 우선순위대로 탐색 → (내용, 탐색을 멈출지), 없으면 None"""
+        linter = self.linters[language]
         for config_file in linter.get_config_files():
-            try:
-                content = self.repo.get_contents(config_file)
-                config_content = content.decoded_content.decode('utf-8')
-                print(f"✅ {language} 설정 파일 발견: {config_file}")
-                return config_content
-            except:
+            config_path = os.path.join(directory, config_file) if directory else config_file
+            config_content = self._read_config_file(config_path)
+            if config_content is None or not linter.accepts_config(config_file, config_content):
                 continue
+            print(f"✅ {language} 설정 파일 발견: {config_path}")
+            return config_content, linter.is_root_config(config_file, config_content)
+        return None
 
-        print(f"⚠️ {language} 설정 파일 없음 - 기본 규칙 사용")
-        return "# 설정 파일이 없습니다. 기본 규칙을 사용합니다."
+    def _read_config_file(self, config_path: str) -> Optional[str]:
+        """설정 파일 조회 (존재하지 않는 경우도 캐시해 같은 경로를 다시 묻지 않음)"""
+        if config_path not in self._config_files:
+            self._config_files[config_path] = self.source.read_file(config_path)
+        return self._config_files[config_path]
 
     def analyze_file(self, file_path: str, file_content: str) -> List[Dict]:
         """AI 기반 파일 분석"""
@@ -271,9 +616,73 @@ class UniversalCodeAnalyzer:
             return []
 
         linter = self.linters[language]
-        config_content = self.get_linter_config_content(language)
+        config_content = self.get_linter_config_content(language, file_path)
+
+        # 기계적 규칙은 로컬에서 검사하고, AI에는 의미 기반 규칙만 맡김
+        violations = linter.check_local_rules(file_content, file_path, config_content)
+        seen = {(violation['line'], violation['rule']) for violation in violations}
+        for violation in linter.analyze_with_ai(file_content, file_path, config_content):
+            if (violation.get('line'), violation.get('rule')) not in seen:
+                violations.append(violation)
 
-        return linter.analyze_with_ai(file_content, file_path, config_content)
+        return sorted(violations, key=lambda v: v['line'])
+
+    def file_lint_tokens(self, file_content: str) -> int:
+        """줄번호를 붙인 파일 코드의 토큰 수 추정"""
+        return sum(estimate_tokens(line) + 3 for line in file_content.split('\n'))
+
+    def plan_lint_batches(self, files: List[Tuple[str, str]]) -> List[List[Tuple[str, str]]]:
+        """린트 대상 파일을 요청 단위로 묶기 - 작은 파일은 언어와 설정이 같은 것끼리 토큰 예산까지 채움"""
+        batches = []
+        groups: Dict[Tuple[str, str], List[Tuple[int, str, str]]] = {}
+
+        for file_path, file_content in files:
+            language = self.detect_language(file_path)
+            if not language:
+                continue
+            tokens = self.file_lint_tokens(file_content)
+            # 윈도우 하나를 넘는 파일은 기존처럼 파일 단위 윈도우 분석
+            if tokens > min(self.linters[language].WINDOW_TOKEN_BUDGET, self.BATCH_TOKEN_BUDGET):
+                batches.append([(file_path, file_content)])
+                continue
+            config_content = self.get_linter_config_content(language, file_path)
+            groups.setdefault((language, config_content), []).append((tokens, file_path, file_content))
+
+        # First-fit decreasing: 큰 파일부터 남은 예산이 맞는 첫 배치에 넣음
+        for members in groups.values():
+            bins = []  # [[남은 토큰, 파일 목록]]
+            for tokens, file_path, file_content in sorted(members, key=lambda m: (-m[0], m[1])):
+                for current in bins:
+                    if current[0] >= tokens and len(current[1]) < self.BATCH_MAX_FILES:
+                        current[0] -= tokens
+                        current[1].append((file_path, file_content))
+                        break
+                else:
+                    bins.append([self.BATCH_TOKEN_BUDGET - tokens, [(file_path, file_content)]])
+            batches.extend(sorted(files_in_bin) for _, files_in_bin in bins)
+
+        return batches
+
+    def analyze_files(self, files: List[Tuple[str, str]]) -> Dict[str, List[Dict]]:
+        """plan_lint_batches로 묶은 파일들을 분석해 파일 경로별 위반 목록 반환"""
+        if len(files) == 1:
+            file_path, file_content = files[0]
+            return {file_path: self.analyze_file(file_path, file_content)}
+
+        language = self.detect_language(files[0][0])
+        linter = self.linters[language]
+        config_content = self.get_linter_config_content(language, files[0][0])
+        ai_results = linter.analyze_batch_with_ai(files, config_content)
+
+        results = {}
+        for file_path, file_content in files:
+            violations = linter.check_local_rules(file_content, file_path, config_content)
+            seen = {(violation['line'], violation['rule']) for violation in violations}
+            for violation in ai_results.get(file_path, []):
+                if (violation.get('line'), violation.get('rule')) not in seen:
+                    violations.append(violation)
+            results[file_path] = sorted(violations, key=lambda v: v['line'])
+        return results
 
     def get_supported_extensions(self) -> Set[str]:
         """지원하는 모든 파일 확장자"""
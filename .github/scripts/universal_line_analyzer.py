@@ -1,248 +1,353 @@
 # .github/scripts/universal_line_analyzer.py
 import os
 import re
-import openai
-from github import Github
-from typing import List, Dict
+from functools import partial
+from typing import List, Dict, Optional, Set, Tuple
 from universal_code_analyzer import UniversalCodeAnalyzer
+from concurrent_runner import ConcurrentRunner
+from pr_snapshot import PRSnapshot, PatchLineMap
+from analysis_cache import get_analysis_cache
+from source_provider import SourceProvider
+from comment_markers import content_hash, parse_marker, with_marker
+from file_filter import FileFilter
+from structure_context import get_structure_index
+from findings_aggregator import FindingsAggregator
+from prompt_templates import PromptTemplate, PROMPT_USAGE
+from structured_output import findings_response_format, request_findings, PARSE_STATS
+from rate_limit import call_github, fetch_all, post_github, scan_github, print_rate_limit_summary
+from run_report import RUN_REPORT
+from runtime import get_github_client, get_openai_client
+
+# 라인별 리뷰/상태 코멘트 본문에 남기는 마지막 검토 head SHA 숨김 마커
+REVIEWED_HEAD_MARKER = "<!-- ai-review:head={sha} -->"
+REVIEWED_HEAD_PATTERN = re.compile(r'<!-- ai-review:head=([0-9a-f]{7,40}) -->')
+# 리뷰 제출마다 붙이는 배치 식별 마커 (응답을 받지 못한 제출이 실제로 생성됐는지 확인용)
+REVIEW_BATCH_MARKER = "<!-- ai-review:batch={batch_id} -->"
+
+# 변경 청크 분석 프롬프트 (지침/응답 형식은 고정 접두부, 파일과 코드는 가변 접미부)
+LINE_CHUNK_PROMPT = PromptTemplate(
+    name='line_chunk',
+    static_prefix="""
+JSON으로만 응답하는 코드 분석 전문가입니다. 변경된 라인만 집중 분석하세요.
+
+사용자가 보내는 코드 컨텍스트에서 >>> 표시된 라인이 새로 추가되거나 수정된 코드입니다.
+컨텍스트는 변경 라인을 감싸는 함수/클래스 범위이며, ⋮ 표시는 생략된 라인입니다.
+
+다음 관점에서 분석해주세요:
+1. **네이밍**: 변수명, 함수명이 명확하고 일관적인가?
+2. **로직 오류**: 조건문, 반복문에서 예상과 다른 동작 가능성
+3. **널 안전성**: null 체크 누락, 옵셔널 처리 미흡
+4. **메모리 관리**: 리소스 해제, 강한 참조 순환
+5. **성능**: 비효율적인 연산, 불필요한 객체 생성
+6. **에러 처리**: 예외 상황 대응 부족
+
+다음 JSON 형식으로만 응답:
+{{
+  "findings": [
+    {{
+      "line": >>> 표시된 라인 중 문제가 있는 라인 번호,
+      "priority": "P2"|"P3",
+      "category": "네이밍|로직|널안전성|메모리|성능|에러처리",
+      "message": "문제점을 50자 이내로",
+      "suggestion": "개선 방안을 한 줄로"
+    }}
+  ]
+}}
+
+문제가 없으면 빈 배열("findings": [])을 반환하세요.
+실제 문제가 있을 때만 포함하고, 변경된 라인과 직접 관련된 이슈만 지적하세요.
+"line"은 반드시 >>> 표시된 라인 번호 중 하나여야 합니다.
+""",
+    variable_suffix="""
+파일: {file_path} (언어: {language})
+변경된 라인: {target_desc}
+
+코드 컨텍스트:
+```
+{context}
+```
+
+>>> 표시된 라인({target_desc})이 새로 추가되거나 수정된 코드입니다.
+"""
+)
+
+# 변경 청크 분석 응답 스키마
+LINE_CHUNK_RESPONSE_FORMAT = findings_response_format('line_chunk_findings', {
+    'line': {'type': 'integer'},
+    'priority': {'type': 'string', 'enum': ['P2', 'P3']},
+    'category': {'type': 'string'},
+    'message': {'type': 'string'},
+    'suggestion': {'type': 'string'}
+})
 
 class UniversalLineAnalyzer:
-    def __init__(self):
-        self.openai_client = openai.OpenAI(api_key=os.environ['OPENAI_API_KEY'])
-        self.github_client = Github(os.environ['GITHUB_TOKEN'])
+    MODEL = "gpt-4o-mini"
+    # 변경 라인 주변에 포함할 컨텍스트 라인 수
+    CONTEXT_RADIUS = 3
+    # hunk 모드에서 한 청크에 담을 최대 라인 수 (응답 잘림 방지)
+    MAX_CHUNK_LINES = 80
+    # 리뷰 하나에 담을 코멘트 수와 코멘트 본문 바이트 상한
+    REVIEW_BATCH_COMMENTS = int(os.environ.get('AI_REVIEW_BATCH_COMMENTS', '30'))
+    REVIEW_BATCH_BYTES = int(os.environ.get('AI_REVIEW_BATCH_BYTES', '60000'))
+    # 감싸는 함수/클래스 컨텍스트의 토큰 상한
+    CONTEXT_TOKEN_BUDGET = int(os.environ.get('AI_CONTEXT_TOKENS', '1200'))
+
+    def __init__(self, openai_client=None, github_client=None):
+        # 클라이언트를 주입하면(오프라인 실행, 벤치마크) 환경 변수의 키 없이도 동작
+        # 주입하지 않으면 프로세스 공유 클라이언트 사용 (SDK import와 생성은 첫 호출 때)
+        self.openai_client = openai_client or get_openai_client()
+        self.github_client = github_client or get_github_client()
         self.repo_name = os.environ['REPO_NAME']
         self.pr_number = int(os.environ['PR_NUMBER'])
 
-        self.repo = self.github_client.get_repo(self.repo_name)
-        self.pr = self.repo.get_pull(self.pr_number)
+        self.repo = call_github(self.github_client.get_repo, self.repo_name)
+        self.pr = call_github(self.repo.get_pull, self.pr_number)
 
-        # 범용 코드 분석기 초기화
-        self.universal_analyzer = UniversalCodeAnalyzer(self.repo, self.pr)
+        # 실행 전체가 공유하는 PR 스냅샷 (파일 목록은 한 번만 조회)
+        self.snapshot = PRSnapshot(self.pr)
 
-    def parse_diff_for_changed_lines(self, patch: str) -> Dict[int, int]:
-        """diff patch를 파싱하여 실제 변경된 라인 번호와 diff position 매핑"""
-        if not patch:
-            return {}
+        # head 커밋의 파일 본문 조회 (로컬 체크아웃 우선, 없으면 contents API)
+        self.source = SourceProvider(self.repo, self.snapshot.head_sha)
 
-        line_mapping = {}  # {실제_파일_라인: diff_position}
-        current_file_line = 0
-        diff_position = 0
+        # 청크 분석 모드: hunk(인접 변경 라인을 묶어 한 번에 분석) 또는 line(라인별 개별 분석)
+        self.chunk_mode = os.environ.get('LINE_ANALYSIS_MODE', 'hunk')
+        # 컨텍스트 범위: structure(감싸는 함수/클래스) 또는 window(변경 라인 ±CONTEXT_RADIUS)
+        self.context_mode = os.environ.get('AI_CONTEXT_MODE', 'structure')
+        # 변경 파일 전체에 AI 린트 분석도 함께 수행할지 여부 (호출 수와 P3 코멘트가 늘어나므로 기본은 끔)
+        self.lint_enabled = os.environ.get('ENABLE_AI_LINT', 'false').lower() == 'true'
 
-        lines = patch.split('\n')
+        # 프롬프트 입력 해시 기반 분석 결과 캐시 (재푸시 시 변경 없는 청크는 재호출하지 않음)
+        self.cache = get_analysis_cache()
 
-        for line in lines:
-            if line.startswith('@@'):
-                # @@ -old_start,old_count +new_start,new_count @@ 형식 파싱
-                match = re.search(r'\+(\d+)', line)
-                if match:
-                    current_file_line = int(match.group(1)) - 1
-            elif line.startswith('+'):
-                # 추가된 라인
-                current_file_line += 1
-                line_mapping[current_file_line] = diff_position
-            elif line.startswith(' '):
-                # 변경되지 않은 라인 (컨텍스트)
-                current_file_line += 1
-                line_mapping[current_file_line] = diff_position
-            # '-'로 시작하는 라인은 삭제된 라인이므로 current_file_line 증가하지 않음
-
-            diff_position += 1
-
-        return line_mapping
-
-    def get_changed_lines_only(self, file_path: str, patch: str) -> List[int]:
-        """실제로 변경된 라인 번호만 추출 (+ 라인)"""
-        if not patch:
-            return []
+        # 모든 파일의 AI 호출을 제한된 병렬도로 동시에 실행
+        self.runner = ConcurrentRunner()
 
-        changed_lines = []
-        current_file_line = 0
+        # 증분 리뷰: 마지막 검토 SHA 이후 새로 추가된 라인 {파일: 라인 집합} (None이면 전체 분석)
+        self.full_review = os.environ.get('FULL_REVIEW', 'false').lower() == 'true'
+        self.incremental_lines: Optional[Dict[str, Set[int]]] = None
+        # 마지막 검토 head SHA를 기록하는 상태 코멘트 (조회 전에는 False)
+        self.status_comment = False
 
-        lines = patch.split('\n')
+        # 범용 코드 분석기 초기화
+        self.universal_analyzer = UniversalCodeAnalyzer(self.repo, self.pr, self.source, self.openai_client)
 
-        for line in lines:
-            if line.startswith('@@'):
-                # @@ -old_start,old_count +new_start,new_count @@ 형식 파싱
-                match = re.search(r'\+(\d+)', line)
-                if match:
-                    current_file_line = int(match.group(1)) - 1
-            elif line.startswith('+'):
-                # 추가된 라인만 분석 대상
-                current_file_line += 1
-                changed_lines.append(current_file_line)
-            elif line.startswith(' '):
-                # 컨텍스트 라인
-                current_file_line += 1
-            # '-' 라인은 무시
-
-        return changed_lines
+    def parse_diff_for_changed_lines(self, file_path: str, patch: Optional[str] = None) -> Dict[int, int]:
+        """diff patch를 파싱하여 실제 변경된 라인 번호와 diff position 매핑 (스냅샷에 캐시)"""
+        return self.snapshot.get_line_map(file_path, patch).positions
 
-    def analyze_file_for_issues(self, file_path: str, file_content: str, patch: str) -> List[Dict]:
-        """파일 분석 - 변경된 라인만 대상으로"""
+    def get_changed_lines_only(self, file_path: str, patch: Optional[str] = None) -> List[int]:
+        """실제로 변경된 라인 번호만 추출 (+ 라인)"""
+        return self.snapshot.get_line_map(file_path, patch).changed_lines
+
+    def prepare_file_chunks(self, file_path: str, file_content: str, patch: str) -> Tuple[Optional[str], List[int], List[Dict]]:
+        """파일의 언어, 변경 라인, 분석 청크 준비 (AI 호출 없음)"""
 
         language = self.universal_analyzer.detect_language(file_path)
         if not language:
             print(f"  ⚠️ 지원하지 않는 파일 형식: {file_path}")
-            return []
+            return None, [], []
 
         # 실제 변경된 라인만 가져오기
         changed_lines = self.get_changed_lines_only(file_path, patch)
+        if self.incremental_lines is not None:
+            # 이전 리뷰 이후 푸시에서 추가된 라인만 남김
+            new_lines = self.incremental_lines.get(file_path, set())
+            changed_lines = [line for line in changed_lines if line in new_lines]
         if not changed_lines:
             print(f"  ⚠️ 변경된 라인이 없음: {file_path}")
-            return []
+            return language, [], []
 
         print(f"  📝 {file_path}: {len(changed_lines)}개 라인 변경됨")
 
         # 변경된 라인 주변의 컨텍스트 추출
         file_lines = file_content.split('\n')
-        analysis_chunks = []
+        if self.context_mode == 'structure':
+            structure = get_structure_index(file_path, file_content, language)
+            analysis_chunks = self.build_structure_chunks(changed_lines, file_lines, structure)
+        else:
+            analysis_chunks = self.build_analysis_chunks(changed_lines, file_lines)
+
+        if self.chunk_mode == 'hunk':
+            print(f"  🧩 {len(analysis_chunks)}개 청크로 묶어 분석")
+
+        return language, changed_lines, analysis_chunks
+
+    def analyze_file_for_issues(self, file_path: str, file_content: str, patch: str) -> List[Dict]:
+        """파일 분석 - 변경된 라인만 대상으로"""
+
+        language, _, analysis_chunks = self.prepare_file_chunks(file_path, file_content, patch)
+        if not analysis_chunks:
+            return []
+
+        # AI 분석 실행 (청크 단위 병렬)
+        tasks = [partial(self.analyze_chunk_with_ai, file_path, chunk, language) for chunk in analysis_chunks]
+        all_issues = []
+        for issues in self.runner.run_all(tasks, default=[]):
+            all_issues.extend(issues)
+
+        return all_issues
 
+    def build_analysis_chunks(self, changed_lines: List[int], file_lines: List[str]) -> List[Dict]:
+        """변경 라인별 ±컨텍스트 윈도우 생성 (hunk 모드에서는 겹치거나 인접한 윈도우를 병합)"""
+        windows = []
         for line_num in changed_lines:
-            # 변경된 라인 주변 ±3라인 컨텍스트 포함
-            start_line = max(1, line_num - 3)
-            end_line = min(len(file_lines), line_num + 3)
+            start_line = max(1, line_num - self.CONTEXT_RADIUS)
+            end_line = min(len(file_lines), line_num + self.CONTEXT_RADIUS)
+
+            if (self.chunk_mode == 'hunk' and windows
+                    and start_line <= windows[-1]['end_line'] + 1
+                    and end_line - windows[-1]['start_line'] < self.MAX_CHUNK_LINES):
+                # 이전 윈도우와 겹치거나 맞닿으면 하나의 청크로 병합
+                windows[-1]['end_line'] = max(windows[-1]['end_line'], end_line)
+                windows[-1]['target_lines'].append(line_num)
+            else:
+                windows.append({
+                    'start_line': start_line,
+                    'end_line': end_line,
+                    'target_lines': [line_num]
+                })
 
+        analysis_chunks = []
+        for window in windows:
+            target_lines = set(window['target_lines'])
             chunk_lines = []
-            for i in range(start_line - 1, end_line):  # 0-based index
+            for i in range(window['start_line'] - 1, window['end_line']):  # 0-based index
                 if i < len(file_lines):
-                    prefix = ">>>" if (i + 1) == line_num else "   "  # 변경 라인 표시
+                    prefix = ">>>" if (i + 1) in target_lines else "   "  # 변경 라인 표시
                     chunk_lines.append(f"{prefix} {i + 1:3d}: {file_lines[i]}")
 
             analysis_chunks.append({
-                'target_line': line_num,
+                'target_line': window['target_lines'][0],
+                'target_lines': window['target_lines'],
                 'context': '\n'.join(chunk_lines)
             })
 
-        # AI 분석 실행
-        all_issues = []
-        for chunk in analysis_chunks:
-            issues = self.analyze_chunk_with_ai(file_path, chunk, language)
-            all_issues.extend(issues)
+        return analysis_chunks
 
-        return all_issues
+    def build_structure_chunks(self, changed_lines: List[int], file_lines: List[str], structure) -> List[Dict]:
+        """변경 라인을 감싸는 함수/클래스 범위로 청크 생성 (hunk 모드에서는 같은 함수의 변경 라인을 한 청크로)"""
+        groups = []
+        for line_num in changed_lines:
+            block = structure.enclosing(line_num, line_num)
+            key = (block['start'], block['end']) if block else None
+            if (self.chunk_mode == 'hunk' and groups and groups[-1]['key'] == key
+                    and line_num - groups[-1]['target_lines'][0] < self.MAX_CHUNK_LINES
+                    # 함수 밖의 라인은 ±컨텍스트가 맞닿을 때만 묶음
+                    and (key is not None or line_num - groups[-1]['target_lines'][-1] <= 2 * self.CONTEXT_RADIUS + 1)):
+                groups[-1]['target_lines'].append(line_num)
+            else:
+                groups.append({'key': key, 'target_lines': [line_num]})
 
-    def analyze_chunk_with_ai(self, file_path: str, chunk: Dict, language: str) -> List[Dict]:
-        """AI 기반 코드 청크 분석"""
+        analysis_chunks = []
+        for group in groups:
+            target_lines = set(group['target_lines'])
+            chunk_lines = []
+            previous = None
+            for line_num in structure.context_lines(group['target_lines'], self.CONTEXT_TOKEN_BUDGET, self.CONTEXT_RADIUS):
+                if previous is not None and line_num > previous + 1:
+                    chunk_lines.append("    ⋮")
+                prefix = ">>>" if line_num in target_lines else "   "  # 변경 라인 표시
+                chunk_lines.append(f"{prefix} {line_num:3d}: {file_lines[line_num - 1]}")
+                previous = line_num
 
-        analysis_prompt = f"""
-파일: {file_path} (언어: {language})
-변경된 라인: {chunk['target_line']}
+            analysis_chunks.append({
+                'target_line': group['target_lines'][0],
+                'target_lines': group['target_lines'],
+                'context': '\n'.join(chunk_lines)
+            })
 
-코드 컨텍스트:
-```
-{chunk['context']}
-```
+        return analysis_chunks
 
->>> 표시된 라인({chunk['target_line']})이 새로 추가되거나 수정된 코드입니다.
+    def format_line_ranges(self, line_numbers: List[int]) -> str:
+        """라인 번호 목록을 '3-5, 9' 형태의 범위 문자열로 변환"""
+        ranges = []
+        for line_num in sorted(line_numbers):
+            if ranges and line_num == ranges[-1][1] + 1:
+                ranges[-1][1] = line_num
+            else:
+                ranges.append([line_num, line_num])
+        return ', '.join(str(a) if a == b else f"{a}-{b}" for a, b in ranges)
 
-다음 관점에서 분석해주세요:
-1. **네이밍**: 변수명, 함수명이 명확하고 일관적인가?
-2. **로직 오류**: 조건문, 반복문에서 예상과 다른 동작 가능성
-3. **널 안전성**: null 체크 누락, 옵셔널 처리 미흡
-4. **메모리 관리**: 리소스 해제, 강한 참조 순환
-5. **성능**: 비효율적인 연산, 불필요한 객체 생성
-6. **에러 처리**: 예외 상황 대응 부족
+    def analyze_chunk_with_ai(self, file_path: str, chunk: Dict, language: str) -> List[Dict]:
+        """AI 기반 코드 청크 분석"""
 
-JSON 형식으로만 응답 (마크다운 코드블록 없이):
-[
-  {{
-    "line": {chunk['target_line']},
-    "priority": "P2"|"P3",
-    "category": "네이밍|로직|널안전성|메모리|성능|에러처리",
-    "message": "문제점을 50자 이내로",
-    "suggestion": "개선 방안을 한 줄로"
-  }}
-]
-
-문제가 없으면 빈 배열 []을 반환하세요.
-실제 문제가 있을 때만 포함하고, 변경된 라인과 직접 관련된 이슈만 지적하세요.
-"""
+        target_lines = chunk.get('target_lines', [chunk['target_line']])
+        target_desc = self.format_line_ranges(target_lines)
+
+        messages = LINE_CHUNK_PROMPT.build_messages(
+            file_path=file_path,
+            language=language,
+            target_desc=target_desc,
+            context=chunk['context']
+        )
+        max_tokens = min(2000, 800 + 50 * (len(target_lines) - 1))
+
+        # 동일한 프롬프트 입력의 이전 분석 결과가 있으면 재사용
+        cache_key = self.cache.make_key('line_chunk', model=self.MODEL, messages=messages, max_tokens=max_tokens)
+        cached_issues = self.cache.get(cache_key)
+        if cached_issues is not None:
+            return cached_issues
 
         try:
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": f"순수 JSON만 응답하는 {language} 코드 분석 전문가입니다. 변경된 라인만 집중 분석하세요."},
-                    {"role": "user", "content": analysis_prompt}
-                ],
-                max_tokens=800,
+            issues, complete, response = request_findings(
+                self.openai_client,
+                'line_chunk',
+                LINE_CHUNK_RESPONSE_FORMAT,
+                model=self.MODEL,
+                messages=messages,
+                max_tokens=max_tokens,
                 temperature=0.1
             )
+            LINE_CHUNK_PROMPT.record_usage(response)
 
-            response_text = response.choices[0].message.content.strip()
-            response_text = self.clean_json_response(response_text)
-
-            import json
-            try:
-                issues = json.loads(response_text)
-                return issues if isinstance(issues, list) else []
-            except json.JSONDecodeError as e:
-                print(f"AI 분석 JSON 파싱 실패: {response_text[:200]}...")
-                return []
+            issues = self.filter_issues_to_targets(issues, target_lines)
+            # 잘린 응답에서 복구한 일부 결과는 캐시하지 않음 (다음 실행에서 전체 결과를 다시 받음)
+            if complete:
+                self.cache.set(cache_key, issues)
+            return issues
 
         except Exception as e:
             print(f"AI 분석 실패: {e}")
             return []
 
-    def clean_json_response(self, response_text: str) -> str:
-        """AI 응답에서 순수 JSON만 추출"""
-        # 마크다운 코드 블록 제거
-        if "```json" in response_text:
-            start = response_text.find("```json") + 7
-            end = response_text.find("```", start)
-            if end != -1:
-                response_text = response_text[start:end].strip()
-            else:
-                response_text = response_text[start:].strip()
-        elif "```" in response_text:
-            start = response_text.find("```") + 3
-            end = response_text.find("```", start)
-            if end != -1:
-                response_text = response_text[start:end].strip()
-
-        # 앞뒤 불필요한 텍스트 제거
-        response_text = response_text.strip()
-
-        # JSON 배열이 시작하는 지점 찾기
-        start_bracket = response_text.find('[')
-        if start_bracket != -1:
-            response_text = response_text[start_bracket:]
-
-        # JSON 배열이 끝나는 지점 찾기 (마지막 ]까지)
-        end_bracket = response_text.rfind(']')
-        if end_bracket != -1:
-            response_text = response_text[:end_bracket + 1]
-
-        return response_text
+    def filter_issues_to_targets(self, issues: List, target_lines) -> List[Dict]:
+        """변경 라인에 정확히 매핑되는 이슈만 남김"""
+        valid_lines = set(target_lines)
+        filtered = []
+        for issue in issues:
+            if not isinstance(issue, dict):
+                continue
+            try:
+                issue['line'] = int(issue.get('line'))
+            except (TypeError, ValueError):
+                continue
+            if issue['line'] in valid_lines:
+                filtered.append(issue)
+        return filtered
 
-    def create_review_comments(self, all_issues: Dict[str, List[Dict]]):
-        """GitHub Review API로 라인별 코멘트 생성 (정확한 라인 매핑)"""
+    def create_review_comments(self, all_issues: Dict[str, List[Dict]]) -> bool:
+        """GitHub Review API로 라인별 코멘트 생성 (크기 제한 배치로 나눠 제출, 실패한 배치는 이분 탐색으로 문제 코멘트 분리)
+        모든 지적을 라인 코멘트나 대체 코멘트로 게시했으면 True"""
 
         if not any(all_issues.values()):
             print("발견된 이슈가 없습니다.")
-            return
+            return True
 
-        comments = []
-        total_comments = 0
+        entries = []  # [{'comment': Review API 코멘트, 'file_path', 'issue'}]
 
         for file_path, issues in all_issues.items():
             if not issues:
                 continue
 
-            # 해당 파일의 diff 정보 가져오기
-            pr_file = None
-            for file in self.pr.get_files():
-                if file.filename == file_path:
-                    pr_file = file
-                    break
+            # 해당 파일의 diff 정보 가져오기 (스냅샷 인덱스 조회)
+            pr_file = self.snapshot.get_file(file_path)
 
             if not pr_file or not pr_file.patch:
                 print(f"⚠️ {file_path}: diff 정보 없음, 코멘트 건너뛰기")
                 continue
 
-            # diff 라인 매핑 생성
-            line_mapping = self.parse_diff_for_changed_lines(pr_file.patch)
-            language = self.universal_analyzer.detect_language(file_path)
+            # diff 라인 매핑 (스냅샷에 이미 파싱된 결과 재사용)
+            line_mapping = self.parse_diff_for_changed_lines(file_path)
 
             for issue in issues:
                 file_line = issue['line']
@@ -253,43 +358,262 @@ JSON 형식으로만 응답 (마크다운 코드블록 없이):
                     continue
 
                 diff_position = line_mapping[file_line]
-
-                # 우선순위별 이모지
-                priority_emoji = {'P2': '🟡', 'P3': '🔵'}
-
-                comment_body = f"{priority_emoji.get(issue['priority'], '📝')} **[{issue['priority']}] AI 분석**\n\n"
-                comment_body += f"**{issue['category']}**: {issue['message']}\n"
-
-                if issue.get('suggestion'):
-                    comment_body += f"\n**💡 개선 제안:**\n```{language}\n{issue['suggestion']}\n```"
+                comment_body = self.format_issue_comment(file_path, issue)
 
                 # GitHub Review API 코멘트 형식 (position 기반)
-                comments.append({
-                    'path': file_path,
-                    'body': comment_body,
-                    'position': diff_position  # diff 내 위치 사용
+                entries.append({
+                    'comment': {
+                        'path': file_path,
+                        'body': with_marker(comment_body, 'line', file=file_path, line=file_line),
+                        'position': diff_position  # diff 내 위치 사용
+                    },
+                    'file_path': file_path,
+                    'issue': issue
                 })
-                total_comments += 1
 
-        if not comments:
-            print("⚠️ 생성할 수 있는 코멘트가 없습니다.")
-            return
+        # 스냅샷 diff 기준으로 position이 유효한 코멘트만 제출 (하나라도 틀리면 리뷰 전체가 422로 실패)
+        valid_entries = []
+        for entry in entries:
+            if self.is_valid_position(entry['comment']):
+                valid_entries.append(entry)
+            else:
+                print(f"⚠️ {entry['file_path']}:{entry['issue']['line']} - diff position 오류, 코멘트 건너뛰기")
 
-        # GitHub Review 생성
+        if not valid_entries:
+            print("⚠️ 생성할 수 있는 코멘트가 없습니다.")
+            return True
+
+        batches = self.split_review_batches(valid_entries)
+        print(f"📤 {len(valid_entries)}개 코멘트를 {len(batches)}개 리뷰로 나눠 제출합니다")
+
+        posted_count = 0
+        failed_entries = []
+        for index, batch in enumerate(batches, 1):
+            posted, failed = self.submit_review_batch(batch, self.build_review_body(index, len(batches)))
+            posted_count += posted
+            failed_entries.extend(failed)
+
+        if posted_count:
+            print(f"✅ 총 {posted_count}개 라인별 코멘트가 정확한 위치에 생성되었습니다")
+
+        if failed_entries:
+            print(f"🔧 라인 코멘트로 게시하지 못한 {len(failed_entries)}개 지적은 일반 코멘트로 게시합니다...")
+            failed_issues = {}
+            for entry in failed_entries:
+                failed_issues.setdefault(entry['file_path'], []).append(entry['issue'])
+            return self.create_fallback_comment(failed_issues)
+        return True
+
+    def is_valid_position(self, comment: Dict) -> bool:
+        """코멘트 position이 스냅샷 diff의 추가/컨텍스트 라인을 가리키는지"""
+        position = comment.get('position')
+        if not isinstance(position, int) or position < 1:
+            return False
+        return position in self.snapshot.get_line_map(comment['path']).positions.values()
+
+    def split_review_batches(self, entries: List[Dict]) -> List[List[Dict]]:
+        """코멘트 수와 본문 크기 상한을 넘지 않도록 순서대로 배치 구성"""
+        batches = []
+        current, current_bytes = [], 0
+        for entry in entries:
+            body_bytes = len(entry['comment']['body'].encode('utf-8'))
+            if current and (len(current) >= self.REVIEW_BATCH_COMMENTS
+                            or current_bytes + body_bytes > self.REVIEW_BATCH_BYTES):
+                batches.append(current)
+                current, current_bytes = [], 0
+            current.append(entry)
+            current_bytes += body_bytes
+        if current:
+            batches.append(current)
+        return batches
+
+    def submit_review_batch(self, entries: List[Dict], body: str) -> Tuple[int, List[Dict]]:
+        """리뷰 하나 제출 (게시한 코멘트 수, 실패한 항목) - 검증 오류(422)면 반으로 나눠 다시 제출"""
+        comments = [entry['comment'] for entry in entries]
+        batch_id = content_hash(''.join(f"{c['path']}:{c['position']}:{c['body']}" for c in comments))
         try:
-            review = self.pr.create_review(
+            review = post_github(
+                self.pr.create_review,
+                body=body + "\n" + REVIEW_BATCH_MARKER.format(batch_id=batch_id),
                 event="COMMENT",
                 comments=comments
             )
+            print(f"  ✅ {len(entries)}개 코멘트 리뷰 생성: {review.html_url}")
+            return len(entries), []
+        except Exception as e:
+            status = getattr(e, 'status', None)
+            if status != 422 and self.find_submitted_review(batch_id):
+                # 5xx/시간 초과여도 서버에서 이미 생성됐을 수 있음 (다시 게시하면 중복)
+                print(f"  ✅ 응답 오류({e})에도 {len(entries)}개 코멘트 리뷰가 생성되어 있음")
+                return len(entries), []
+            if status != 422 or len(entries) == 1:
+                # 검증 오류가 아니면(서버 오류, 회로 차단 등) 나눠도 성공할 가능성이 낮음
+                print(f"  ❌ 리뷰 생성 실패 ({len(entries)}개 코멘트): {e}")
+                return 0, entries
+
+            print(f"  ⚠️ {len(entries)}개 코멘트 리뷰가 거부되어 나눠서 다시 제출합니다: {e}")
+            middle = len(entries) // 2
+            posted_first, failed_first = self.submit_review_batch(entries[:middle], body)
+            posted_second, failed_second = self.submit_review_batch(entries[middle:], body)
+            return posted_first + posted_second, failed_first + failed_second
+
+    def find_submitted_review(self, batch_id: str) -> bool:
+        """배치 마커가 붙은 리뷰가 이미 있는지"""
+        marker = REVIEW_BATCH_MARKER.format(batch_id=batch_id)
+        try:
+            return any(marker in (review.body or "") for review in fetch_all(self.pr.get_reviews))
+        except Exception as e:
+            print(f"  ⚠️ 리뷰 생성 여부 확인 실패: {e}")
+            return False
+
+    def format_issue_comment(self, file_path: str, issue: Dict) -> str:
+        """지적 하나의 라인 코멘트 본문 (숨김 마커 제외)"""
+        language = self.universal_analyzer.detect_language(file_path)
+
+        # 우선순위별 이모지
+        priority_emoji = {'P2': '🟡', 'P3': '🔵'}
+
+        comment_body = f"{priority_emoji.get(issue['priority'], '📝')} **[{issue['priority']}] AI 분석**\n\n"
+        comment_body += f"**{issue['category']}**: {issue['message']}\n"
+
+        if issue.get('suggestion'):
+            comment_body += f"\n**💡 개선 제안:**\n```{language}\n{issue['suggestion']}\n```"
+        return comment_body
+
+    def aggregate_findings(self, all_issues: Dict[str, List[Dict]]) -> Dict[str, List[Dict]]:
+        """겹치는 청크에서 중복된 지적 병합, 이미 게시된 봇 코멘트와 같은 지적 제거, 개수 제한"""
+        try:
+            existing = FindingsAggregator.parse_existing_comments(fetch_all(self.pr.get_review_comments))
+        except Exception as e:
+            print(f"⚠️ 기존 리뷰 코멘트 조회 실패, 중복 확인 없이 진행: {e}")
+            existing = []
+
+        aggregator = FindingsAggregator(existing, render=self.format_issue_comment)
+        aggregated = aggregator.aggregate(all_issues)
+        aggregator.print_summary()
+        return aggregated
+
+    def build_review_body(self, batch_index: int = 1, batch_count: int = 1) -> str:
+        """리뷰 본문 (다음 실행의 증분 리뷰 기준이 되는 head SHA 마커 포함)"""
+        head_sha = self.snapshot.head_sha
+        body = f"🤖 **AI 라인별 분석** (`{head_sha[:7]}` 기준)"
+        if batch_count > 1:
+            body += f" [{batch_index}/{batch_count}]"
+        return body + "\n" + REVIEWED_HEAD_MARKER.format(sha=head_sha)
+
+    def review_status_key(self) -> str:
+        """PR별 라인 분석 상태 코멘트 ID 저장 키"""
+        return self.cache.make_key('line_status_comment', repo=self.repo_name, pr=self.pr_number)
+
+    @staticmethod
+    def is_review_status_comment(comment) -> bool:
+        """봇이 작성한 라인 분석 상태 코멘트인지"""
+        if comment.user.login != 'github-actions[bot]':
+            return False
+        return (parse_marker(comment.body) or {}).get('k') == 'line_status'
+
+    def find_review_status_comment(self):
+        """라인 분석 상태 코멘트 찾기 - 저장된 ID로 한 번에 조회하고, 없으면 코멘트 목록에서 마커 검색 (실행당 한 번)"""
+        if self.status_comment is not False:
+            return self.status_comment
+        self.status_comment = None
+
+        comment_id = self.cache.get(self.review_status_key())
+        if comment_id:
+            try:
+                comment = call_github(self.pr.get_issue_comment, comment_id)
+                if self.is_review_status_comment(comment):
+                    self.status_comment = comment
+                    return comment
+            except Exception as e:
+                print(f"⚠️ 저장된 상태 코멘트({comment_id}) 조회 실패, 목록에서 검색: {e}")
 
-            print(f"✅ 총 {total_comments}개 라인별 코멘트가 정확한 위치에 생성되었습니다: {review.html_url}")
+        try:
+            # 찾으면 남은 페이지는 요청하지 않도록 페이지 단위로 지연 순회
+            for comment in scan_github(self.pr.get_issue_comments):
+                if self.is_review_status_comment(comment):
+                    self.status_comment = comment
+                    break
+        except Exception as e:
+            print(f"⚠️ 상태 코멘트 검색 중 오류: {e}")
+        return self.status_comment
 
+    def record_reviewed_head(self, summary: str):
+        """검토를 마친 head SHA를 상태 코멘트에 기록 (지적이 없던 실행도 다음 증분 리뷰의 기준이 됨)"""
+        head_sha = self.snapshot.head_sha
+        body = (f"🤖 **AI 라인별 분석**: `{head_sha[:7]}`까지 검토 완료 ({summary})\n"
+                + REVIEWED_HEAD_MARKER.format(sha=head_sha))
+        content = with_marker(body, 'line_status')
+
+        existing = self.find_review_status_comment()
+        try:
+            if existing is None:
+                comment = post_github(self.pr.create_issue_comment, content)
+            else:
+                comment = existing
+                call_github(comment.edit, content)
         except Exception as e:
-            print(f"❌ 라인별 리뷰 생성 실패: {e}")
-            print("🔧 대체 방법으로 일반 코멘트 생성...")
-            self.create_fallback_comment(all_issues)
+            print(f"⚠️ 검토한 head 기록 실패, 다음 실행은 이전 기준부터 분석합니다: {e}")
+            return
+
+        self.status_comment = comment
+        self.cache.set(self.review_status_key(), comment.id)
+        print(f"📌 검토한 head {head_sha[:7]} 기록 완료")
 
-    def create_fallback_comment(self, all_issues: Dict[str, List[Dict]]):
+    def find_last_reviewed_sha(self) -> Optional[str]:
+        """상태 코멘트(없으면 이전 라인별 리뷰 본문)의 숨김 마커에서 마지막으로 검토한 head SHA 찾기"""
+        status_comment = self.find_review_status_comment()
+        if status_comment is not None:
+            match = REVIEWED_HEAD_PATTERN.search(status_comment.body or "")
+            if match:
+                return match.group(1)
+
+        # 상태 코멘트 도입 이전에 리뷰한 PR은 리뷰 본문의 마커 사용
+        last_sha = None
+        try:
+            for review in fetch_all(self.pr.get_reviews):
+                match = REVIEWED_HEAD_PATTERN.search(review.body or "")
+                if match:
+                    last_sha = match.group(1)
+        except Exception as e:
+            print(f"⚠️ 이전 리뷰 조회 실패, 전체 분석으로 진행: {e}")
+            return None
+        return last_sha
+
+    def get_incremental_lines(self, base_sha: str) -> Optional[Dict[str, Set[int]]]:
+        """마지막 검토 SHA부터 현재 head까지 추가된 라인 (force-push 등으로 비교할 수 없으면 None)"""
+        patches = self.source.get_compare_patches(base_sha)
+        if patches is None:
+            print("⚠️ 이전 검토 커밋과 비교할 수 없어 전체 분석으로 진행")
+            return None
+
+        return {
+            filename: set(PatchLineMap(patch).changed_lines)
+            for filename, patch in patches.items()
+        }
+
+    def resolve_review_scope(self) -> bool:
+        """증분/전체 분석 범위 결정 (새로 분석할 내용이 없으면 False)"""
+        if self.full_review:
+            print("🔁 전체 리뷰 모드 (FULL_REVIEW)")
+            return True
+
+        last_sha = self.find_last_reviewed_sha()
+        if not last_sha:
+            print("🆕 이전 라인별 리뷰 없음, 전체 diff 분석")
+            return True
+
+        if self.snapshot.head_sha.startswith(last_sha):
+            print(f"✅ head {last_sha[:7]}는 이미 검토되었습니다.")
+            return False
+
+        self.incremental_lines = self.get_incremental_lines(last_sha)
+        if self.incremental_lines is not None:
+            print(f"🔀 증분 리뷰: {last_sha[:7]}..{self.snapshot.head_sha[:7]} 사이 "
+                  f"{len(self.incremental_lines)}개 파일 변경분만 분석")
+        return True
+
+    def create_fallback_comment(self, all_issues: Dict[str, List[Dict]]) -> bool:
         """Review API 실패 시 일반 코멘트로 대체"""
         comment_body = "🤖 **AI 코드 분석 결과**\n\n"
 
@@ -303,24 +627,43 @@ JSON 형식으로만 응답 (마크다운 코드블록 없이):
                     comment_body += f"- **Line {issue['line']}** {priority_emoji.get(issue['priority'], '📝')} [{issue['priority']}] {issue['category']}: {issue['message']}\n"
 
         try:
-            self.pr.create_issue_comment(comment_body)
+            post_github(self.pr.create_issue_comment, with_marker(comment_body, 'fallback'))
             print("✅ 대체 코멘트가 생성되었습니다.")
+            return True
         except Exception as e:
             print(f"❌ 대체 코멘트 생성도 실패: {e}")
+            return False
 
     def run_universal_analysis(self):
         """범용 분석 전체 프로세스 실행"""
         print("🔍 범용 코드 품질 검수를 시작합니다...")
 
+        # 마지막으로 검토한 커밋 이후 변경분만 분석할지 결정
+        RUN_REPORT.begin_stage('resolve_scope')
+        if not self.resolve_review_scope():
+            self.cache.close()
+            self.source.close()
+            return
+
         # 지원하는 파일 확장자
         supported_extensions = self.universal_analyzer.get_supported_extensions()
 
-        # PR의 변경된 파일들 가져오기
-        files = self.pr.get_files()
+        # 생성/벤더/락/대용량 파일 사전 필터 (내용 조회와 AI 호출 전에 적용)
+        file_filter = FileFilter(self.source)
+
+        # PR의 변경된 파일들 (스냅샷에서 가져오기)
+        files = self.snapshot.files
         all_issues = {}
         analyzed_count = 0
         skipped_count = 0
 
+        # 1단계: 파일 내용을 모으고 모든 파일의 AI 호출 작업을 한 목록으로 구성
+        RUN_REPORT.begin_stage('collect_files')
+        tasks = []
+        task_owners = []  # 작업 순서와 같은 순서의 (파일 경로, 린트 작업 여부)
+        changed_lines_by_file = {}
+        lint_files = []  # 린트 대상 (파일 경로, 내용)
+
         for file in files:
             # 삭제된 파일 건너뛰기
             if file.status == 'removed':
@@ -332,42 +675,112 @@ JSON 형식으로만 응답 (마크다운 코드블록 없이):
                 skipped_count += 1
                 continue
 
-            print(f"📝 분석 중: {file.filename}")
+            # 증분 리뷰에서 이번 푸시로 바뀌지 않은 파일 건너뛰기
+            if self.incremental_lines is not None and file.filename not in self.incremental_lines:
+                skipped_count += 1
+                continue
+
+            if file_filter.should_skip(file):
+                skipped_count += 1
+                continue
+
+            print(f"📝 분석 준비 중: {file.filename}")
             analyzed_count += 1
 
             try:
                 # 현재 파일 내용 가져오기
-                content = self.repo.get_contents(file.filename, ref=self.pr.head.sha)
-                file_content = content.decoded_content.decode('utf-8')
+                file_content = self.source.read_file(file.filename)
+                if file_content is None:
+                    print(f"  ❌ 파일 내용을 읽을 수 없음: {file.filename}")
+                    continue
+
+                reason = file_filter.check_content(file.filename, file_content)
+                if reason:
+                    file_filter.skip(file.filename, reason)
+                    analyzed_count -= 1
+                    skipped_count += 1
+                    continue
 
                 # 변경된 라인만 분석
-                issues = self.analyze_file_for_issues(
+                language, changed_lines, chunks = self.prepare_file_chunks(
                     file.filename,
                     file_content,
                     file.patch or ""
                 )
+                if not chunks:
+                    continue
+
+                changed_lines_by_file[file.filename] = set(changed_lines)
+                for chunk in chunks:
+                    tasks.append(partial(self.analyze_chunk_with_ai, file.filename, chunk, language))
+                    task_owners.append((file.filename, False))
 
-                if issues:
-                    all_issues[file.filename] = issues
-                    print(f"  ⚠️ {len(issues)}개 이슈 발견")
-                else:
-                    print(f"  ✅ 이슈 없음")
+                if self.lint_enabled:
+                    lint_files.append((file.filename, file_content))
 
             except Exception as e:
-                print(f"  ❌ 분석 실패: {e}")
+                print(f"  ❌ 분석 준비 실패: {e}")
                 continue
 
+        # 작은 파일은 언어와 설정이 같은 것끼리 묶어 한 번의 린트 요청으로 분석
+        lint_batches = self.universal_analyzer.plan_lint_batches(lint_files)
+        if lint_batches:
+            print(f"🧺 {len(lint_files)}개 파일을 {len(lint_batches)}개 린트 요청으로 묶었습니다")
+        for batch in lint_batches:
+            tasks.append(partial(self.universal_analyzer.analyze_files, batch))
+            task_owners.append((None, True))
+
+        # 2단계: 모든 파일의 AI 호출을 동시에 실행하고 입력 순서대로 결과 수집
+        RUN_REPORT.begin_stage('analyze')
+        print(f"🚀 {len(tasks)}개 AI 분석 요청을 최대 {self.runner.max_workers}개씩 동시에 실행합니다...")
+        results = self.runner.run_all(tasks, default=[])
+
+        for (file_path, is_lint), issues in zip(task_owners, results):
+            if is_lint:
+                # 린트 결과는 파일 경로별 목록이며, 이번 PR에서 변경된 라인에 대한 것만 유지
+                for lint_path, violations in (issues or {}).items():
+                    violations = self.filter_issues_to_targets(violations, changed_lines_by_file[lint_path])
+                    if violations:
+                        all_issues.setdefault(lint_path, []).extend(violations)
+            elif issues:
+                all_issues.setdefault(file_path, []).extend(issues)
+
+        for file_path in changed_lines_by_file:
+            issue_count = len(all_issues.get(file_path, []))
+            if issue_count:
+                print(f"  ⚠️ {file_path}: {issue_count}개 이슈 발견")
+            else:
+                print(f"  ✅ {file_path}: 이슈 없음")
+
         # 결과 요약
+        file_filter.print_summary()
         print(f"\n📊 분석 완료: {analyzed_count}개 파일 분석, {skipped_count}개 파일 건너뛰기")
 
         # 라인별 코멘트 생성
+        RUN_REPORT.begin_stage('post_review')
+        posted = True
         if all_issues:
             total_issues = sum(len(issues) for issues in all_issues.values())
             print(f"📈 총 {total_issues}개 이슈 발견")
-            self.create_review_comments(all_issues)
+            all_issues = self.aggregate_findings(all_issues)
+            posted = self.create_review_comments(all_issues)
         else:
             print("✅ 모든 분석 대상 파일이 품질 기준을 통과했습니다!")
 
+        # 게시하지 못한 지적이 있으면 기준을 옮기지 않아 다음 실행에서 다시 분석
+        if posted:
+            new_count = sum(len(issues) for issues in all_issues.values())
+            self.record_reviewed_head(f"새 지적 {new_count}개" if new_count else "새 지적 없음")
+
+        PROMPT_USAGE.print_summary()
+        PARSE_STATS.print_summary()
+        print_rate_limit_summary()
+        self.cache.close()
+        self.source.close()
+
 if __name__ == "__main__":
-    analyzer = UniversalLineAnalyzer()
-    analyzer.run_universal_analysis()
+    try:
+        analyzer = UniversalLineAnalyzer()
+        analyzer.run_universal_analysis()
+    finally:
+        RUN_REPORT.write('universal_line_analyzer')